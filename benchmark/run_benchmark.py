@@ -0,0 +1,343 @@
+"""
+YouTube Trending Pipeline Benchmark
+-----------------------------------
+
+Runs every pipeline stage against local stand-ins at several data volumes and
+reports wall time, rows/s, bytes/s and peak RSS per stage, to catch
+performance regressions and to size hardware before adding regions or
+increasing the pull frequency. No API quota or warehouse credits are used.
+
+Workflow (for every scale, in a fresh scratch folder):
+1. Start the synthetic `videos.list` stub (`youtube_api_stub.py`) in its own
+   process, serving `regions × 200 × scale` videos (1× ≈ today's volume: every
+   region's full `mostPopular` chart, 4 pages of 50).
+2. Write a `config.cfg` for the scratch folder: the repo's settings, pointed at
+   the stub (`[API] api_url`), without the request rate cap, on the local
+   DuckDB warehouse (`[WAREHOUSE] backend = duckdb`).
+3. Run each stage in a separate child process, so its peak RSS is its own:
+   - ingest:  `download_yt_data.fetch_all` against the stub
+   - flatten: `flatten_day` of the configured engine (arrow or spark)
+   - upload:  `upload_files.pending_regions` (content hashing) plus a DuckDB
+              stand-in for PUT + COPY INTO (copy to a stage folder, bulk insert)
+   - dbt:     `dbt run --target local` in-process (as `run_pipeline.py` does)
+   - report:  `create_report.build_report` with the section cache disabled
+4. Print one table per scale and write all results to `data/benchmark/`.
+
+Metrics:
+- rows: video rows of the day (requested from the stub for ingest, Parquet rows after).
+- bytes: input volume of the stage (raw files written for ingest, raw files for
+  flatten, Parquet files for upload and dbt, the DuckDB file for report).
+- peak RSS: maximum resident set size of the stage's process.
+
+Usage Notes:
+- python3 benchmark/run_benchmark.py                         # scales 1, 10, 100
+- python3 benchmark/run_benchmark.py --scales 1,5 --stages ingest,flatten
+- python3 benchmark/run_benchmark.py --regions 300           # sizing with more regions
+- Run from the repository root. Scratch folders are deleted unless `--keep` is given.
+- Linux / macOS only (peak RSS comes from `resource.getrusage`).
+
+Author: Shreyash Singh
+"""
+
+import os
+import sys
+import json
+import time
+import glob
+import shutil
+import socket
+import argparse
+import tempfile
+import resource
+import subprocess
+import configparser
+import multiprocessing
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_SCRIPT = os.path.join(ROOT, 'benchmark', 'youtube_api_stub.py')
+
+STAGES = ['ingest', 'flatten', 'upload', 'dbt', 'report']
+VIDEOS_PER_REGION = 200   # Full `mostPopular` chart per region today (4 pages of 50)
+RESULTS_ROOT = 'data/benchmark'
+
+def folder_bytes(pattern):
+    """
+    Total size of the files matching a glob pattern.
+
+    Args:
+        pattern (str): Recursive glob pattern.
+
+    Returns:
+        int: Size in bytes.
+    """
+    return sum(os.path.getsize(p) for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+
+def parquet_rows(folder):
+    """
+    Number of rows in the Parquet files of a folder (from the footers only).
+
+    Args:
+        folder (str): Processed folder of one date.
+
+    Returns:
+        int: Row count.
+    """
+    import pyarrow.parquet as pq
+    return sum(pq.ParquetFile(p).metadata.num_rows
+               for p in glob.glob(os.path.join(folder, '**', '*.parquet'), recursive=True))
+
+def peak_rss_mb():
+    """
+    Peak resident set size of the calling process.
+
+    Returns:
+        float: Peak RSS in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+# ------------------------------------------------------------------------------
+# Stages (each runs in its own child process, inside the scratch folder)
+# ------------------------------------------------------------------------------
+def bench_ingest(run_date, settings):
+    """Fetch every region from the stub (raw files written)."""
+    import download_yt_data
+    failed = download_yt_data.fetch_all(settings['regions'])
+    if failed:
+        raise RuntimeError(f"Stub fetch failed for {len(failed)} regions: {', '.join(failed[:5])}")
+    rows = len(settings['regions']) * settings['videos_per_region']
+    return rows, folder_bytes(f'data/raw/{run_date}/*')
+
+def bench_flatten(run_date, settings):
+    """Flatten the day with the configured engine (raw files read)."""
+    if settings['engine'] == 'arrow':
+        import flatten_youtube_arrow
+        flatten_youtube_arrow.flatten_day(run_date, force=True)
+    else:
+        import flatten_youtube_json
+        from pyspark.sql import SparkSession
+        spark = SparkSession.builder.appName("YouTubeTrendingBenchmark").getOrCreate()
+        try:
+            flatten_youtube_json.flatten_day(spark, run_date, force=True)
+        finally:
+            spark.stop()
+    return parquet_rows(f'data/processed/{run_date}'), folder_bytes(f'data/raw/{run_date}/*')
+
+def bench_upload(run_date, settings):
+    """Hash, stage and bulk-load the day into a local DuckDB table (Parquet files read)."""
+    import duckdb
+    import upload_files
+
+    # Same change detection as the real upload (hashes every Parquet file)
+    pending, hashes, manifest = upload_files.pending_regions(run_date, force=True)
+
+    # Stand-in for PUT: copy the files into a local "table stage"
+    stage_root = os.path.join('data', 'stage', run_date)
+    for region, files in pending.items():
+        stage_path = os.path.join(stage_root, f'country={region}')
+        os.makedirs(stage_path, exist_ok=True)
+        for path in files:
+            shutil.copy(path, stage_path)
+
+    # Stand-in for DELETE + COPY INTO: one bulk insert of every staged file
+    conn = duckdb.connect(os.path.join('data', 'stage', 'raw.duckdb'))
+    try:
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE {upload_files.TABLE_NAME} AS
+            SELECT *, DATE '{run_date.replace('_', '-')}' AS load_date
+            FROM read_parquet('{stage_root}/*/*.parquet', hive_partitioning = true, union_by_name = true)
+        """)
+        rows = conn.execute(f"SELECT COUNT(*) FROM {upload_files.TABLE_NAME}").fetchone()[0]
+    finally:
+        conn.close()
+    return rows, sum(os.path.getsize(p) for files in pending.values() for p in files)
+
+def bench_dbt(run_date, settings):
+    """Build the dbt models on the local DuckDB target (Parquet files read)."""
+    import run_pipeline
+    run_pipeline.Pipeline(run_date, backend='duckdb').stage_dbt({})
+    return parquet_rows(f'data/processed/{run_date}'), folder_bytes(f'data/processed/{run_date}/**/*.parquet')
+
+def bench_report(run_date, settings):
+    """Build the PDF report without the section cache (DuckDB file read)."""
+    import create_report
+    from common import warehouse
+    pdf_file = create_report.build_report(conn=warehouse.connect_duckdb(), refresh=True)
+    os.remove(pdf_file)
+    return parquet_rows(f'data/processed/{run_date}'), os.path.getsize(warehouse.DUCKDB_PATH)
+
+def run_stage(stage, workdir, run_date, settings, results):
+    """
+    Child process entry point: run one stage in the scratch folder and measure it.
+
+    Args:
+        stage (str): Stage name.
+        workdir (str): Scratch folder (holds `config.cfg` and `data/`).
+        run_date (str): Date in YYYY_MM_DD format.
+        settings (dict): Benchmark settings (regions, videos_per_region, engine).
+        results (multiprocessing.Queue): Receives the measurement dict.
+    """
+    # Stage modules read `config.cfg` and `data/` relative to the working directory
+    os.chdir(workdir)
+    for folder in ('', 'ingesion', 'spark_job', 'report'):
+        sys.path.insert(0, os.path.join(ROOT, folder))
+
+    # Keep the stages' own progress output out of the benchmark table
+    log_file = open(os.path.join(workdir, f'{stage}.log'), 'w')
+    sys.stdout = sys.stderr = log_file
+
+    try:
+        start = time.perf_counter()
+        rows, nbytes = globals()[f'bench_{stage}'](run_date, settings)
+        seconds = time.perf_counter() - start
+        results.put({'stage': stage, 'seconds': seconds, 'rows': rows, 'bytes': nbytes,
+                     'peak_rss_mb': peak_rss_mb()})
+    except Exception as e:
+        results.put({'stage': stage, 'error': f'{type(e).__name__}: {e}'})
+    finally:
+        log_file.close()
+
+# ------------------------------------------------------------------------------
+# Harness
+# ------------------------------------------------------------------------------
+def start_stub(regions, videos_per_region):
+    """
+    Start the API stub in its own process on a free port.
+
+    Args:
+        regions (int): Number of region codes served.
+        videos_per_region (int): Videos per region.
+
+    Returns:
+        tuple: (subprocess.Popen, endpoint URL)
+    """
+    stub = subprocess.Popen(
+        [sys.executable, STUB_SCRIPT, '--port', '0', '--regions', str(regions),
+         '--videos-per-region', str(videos_per_region)],
+        stdout=subprocess.PIPE, text=True
+    )
+    url = stub.stdout.readline().strip()  # The stub announces its URL once listening
+    if not url:
+        stub.kill()
+        raise RuntimeError("API stub failed to start")
+    return stub, url
+
+def write_config(workdir, api_url, engine):
+    """
+    Write the scratch folder's `config.cfg`: the repo's settings plus the
+    benchmark overrides (stub URL, no rate cap, local DuckDB warehouse).
+
+    Args:
+        workdir (str): Scratch folder.
+        api_url (str): Stub endpoint.
+        engine (str): Flatten engine.
+    """
+    config = configparser.ConfigParser()
+    config.read(os.path.join(ROOT, 'config.cfg'))
+    overrides = {
+        'API': {'api_key': 'benchmark', 'api_url': api_url},
+        'INGEST': {'requests_per_second': '0'},
+        'FLATTEN': {'engine': engine},
+        'WAREHOUSE': {'backend': 'duckdb', 'duckdb_path': 'data/warehouse/yt_dbt.duckdb'},
+        'PIPELINE': {'dbt_project_dir': os.path.join(ROOT, 'yt_dbt'),
+                     'dbt_profiles_dir': os.path.join(ROOT, 'yt_dbt', '.dbt')}
+    }
+    for section, values in overrides.items():
+        if not config.has_section(section):
+            config.add_section(section)
+        for key, value in values.items():
+            config.set(section, key, value)
+    with open(os.path.join(workdir, 'config.cfg'), 'w') as f:
+        config.write(f)
+
+def run_scale(scale, regions, stages, engine, keep):
+    """
+    Benchmark every selected stage at one scale.
+
+    Args:
+        scale (float): Volume multiplier (videos per region = 200 × scale).
+        regions (int): Number of regions.
+        stages (list): Stages to run, in pipeline order.
+        engine (str): Flatten engine.
+        keep (bool): Keep the scratch folder.
+
+    Returns:
+        list: One measurement dict per stage.
+    """
+    from youtube_api_stub import region_codes
+
+    videos_per_region = max(1, int(VIDEOS_PER_REGION * scale))
+    workdir = tempfile.mkdtemp(prefix=f'yt_bench_{scale:g}x_')
+    run_date = datetime.today().strftime('%Y_%m_%d')  # The fetcher always writes today's folder
+    settings = {'regions': region_codes(regions), 'videos_per_region': videos_per_region, 'engine': engine}
+    context = multiprocessing.get_context('spawn')  # Fresh interpreter: per-stage peak RSS
+
+    stub, api_url = start_stub(regions, videos_per_region)
+    measurements = []
+    try:
+        write_config(workdir, api_url, engine)
+        for stage in stages:
+            results = context.Queue()
+            process = context.Process(target=run_stage, args=(stage, workdir, run_date, settings, results))
+            process.start()
+            result = results.get()
+            process.join()
+            result.update(scale=scale, regions=regions, videos_per_region=videos_per_region, engine=engine)
+            measurements.append(result)
+            print_row(result)
+            if 'error' in result:
+                print(f"    stage log: {os.path.join(workdir, stage + '.log')}")
+                keep = True
+                break  # Later stages need this one's output
+    finally:
+        stub.terminate()
+        stub.wait()
+        if keep:
+            print(f"  scratch folder kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return measurements
+
+def print_row(result):
+    """
+    Print one line of the results table.
+
+    Args:
+        result (dict): Measurement of one stage.
+    """
+    if 'error' in result:
+        print(f"  {result['stage']:<8} FAILED  {result['error']}")
+        return
+    seconds = max(result['seconds'], 1e-9)
+    print(f"  {result['stage']:<8} {result['seconds']:9.2f}s {result['rows']:>11,} rows "
+          f"{result['rows'] / seconds:>12,.0f} rows/s {result['bytes'] / seconds / 2**20:>9.1f} MiB/s "
+          f"{result['peak_rss_mb']:>8.0f} MiB peak RSS")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages against local stand-ins.")
+    parser.add_argument("--scales", default="1,10,100",
+                        help="comma-separated volume multipliers (1 = today's volume)")
+    parser.add_argument("--regions", type=int, default=101, help="number of regions fetched")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run")
+    parser.add_argument("--engine", choices=["arrow", "spark"], default="arrow", help="flatten engine")
+    parser.add_argument("--output", help="results file (default data/benchmark/<timestamp>.json)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch folders")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(ROOT, 'benchmark'))
+    stages = [stage for stage in STAGES if stage in args.stages.split(",")]
+    started_at = datetime.now()
+    all_measurements = []
+    for scale in (float(s) for s in args.scales.split(",")):
+        print(f"Scale {scale:g}x: {args.regions} regions × {max(1, int(VIDEOS_PER_REGION * scale))} videos")
+        all_measurements += run_scale(scale, args.regions, stages, args.engine, args.keep)
+
+    output = args.output or os.path.join(RESULTS_ROOT, f"{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'started_at': started_at.isoformat(timespec='seconds'),
+                   'host': socket.gethostname(), 'cpus': os.cpu_count(),
+                   'results': all_measurements}, f, indent=2)
+    print(f"Results saved to {output}")
@@ -0,0 +1,322 @@
+"""
+Synthetic YouTube Data API Stub
+-------------------------------
+
+Local stand-in for the `videos.list` endpoint (`chart=mostPopular`) of the
+YouTube Data API v3, so the pipeline can be exercised and benchmarked at any
+volume without spending API quota.
+
+Behaviour:
+1. Serves `GET /youtube/v3/videos` with the same envelope as the real API
+   (`kind`, `etag`, `nextPageToken`, `pageInfo`, `items`).
+2. Every region returns `videos_per_region` videos, paginated by `maxResults`
+   (capped at 50, like the API) through an opaque `pageToken`.
+3. Videos are generated deterministically from the region and rank, so reruns
+   return identical bytes:
+   - realistic `snippet` (title, description, thumbnails, tags, languages),
+     `contentDetails` (ISO 8601 duration, region restrictions) and
+     `statistics` (counts as strings, some hidden),
+   - a share of the videos trends in several regions at once (same id and
+     payload), like the real chart.
+4. `id=a,b,...` (up to 50 ids, no `chart`) returns one resource per id with the
+   requested parts; only `statistics` is generated, deterministically per id.
+5. Unknown regions and missing parameters get the API's 400 error shape.
+6. A request whose `If-None-Match` matches the page's etag gets `304 Not Modified`
+   (the content never changes, so every repeated conditional request does).
+
+Usage Notes:
+- python3 benchmark/youtube_api_stub.py --port 8089 --videos-per-region 200
+- Point the fetcher at it with `api_url = http://127.0.0.1:8089/youtube/v3/videos`
+  under `[API]` in `config.cfg` (`benchmark/run_benchmark.py` does this itself).
+- Standard library only.
+
+Author: Shreyash Singh
+"""
+
+import sys
+import json
+import random
+import hashlib
+import argparse
+import itertools
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+API_PATH = "/youtube/v3/videos"
+PAGE_SIZE = 50                  # Hard cap on results per page enforced by the API
+SHARED_VIDEO_SHARE = 0.4        # Share of chart positions filled by videos trending in many regions
+RESTRICTED_SHARE = 0.1          # Share of videos with a region restriction
+
+# Regions fetched by `download_yt_data.py` today (ISO 3166-1 alpha-2), also used for restrictions
+COUNTRY_CODES = [
+    'AE', 'AR', 'AT', 'AU', 'AZ', 'BA', 'BD', 'BE', 'BG', 'BH', 'BO', 'BR', 'BY',
+    'CA', 'CH', 'CL', 'CO', 'CR', 'CY', 'CZ', 'DE', 'DK', 'DO', 'EC', 'EE', 'EG',
+    'ES', 'FI', 'FR', 'GB', 'GE', 'GH', 'GR', 'GT', 'HK', 'HN', 'HR', 'HU', 'ID',
+    'IE', 'IL', 'IN', 'IQ', 'IS', 'IT', 'JM', 'JO', 'JP', 'KE', 'KR', 'KW', 'KZ',
+    'LB', 'LK', 'LT', 'LU', 'LV', 'MA', 'ME', 'MK', 'MX', 'MY', 'NG', 'NI', 'NL',
+    'NO', 'NP', 'NZ', 'OM', 'PA', 'PE', 'PH', 'PK', 'PL', 'PR', 'PT', 'PY', 'QA',
+    'RO', 'RS', 'RU', 'SA', 'SE', 'SG', 'SI', 'SK', 'SV', 'TH', 'TN', 'TR', 'TW',
+    'TZ', 'UA', 'UG', 'US', 'UY', 'VE', 'VN', 'YE', 'ZA', 'ZW'
+]
+
+# Vocabulary for titles, descriptions and tags
+WORDS = [
+    'official', 'video', 'music', 'live', 'trailer', 'highlights', 'episode',
+    'reaction', 'challenge', 'vlog', 'review', 'unboxing', 'gameplay', 'news',
+    'football', 'cricket', 'comedy', 'sketch', 'podcast', 'interview', 'remix',
+    'tutorial', 'recipe', 'travel', 'shorts', 'minecraft', 'fortnite', 'season',
+    'finale', 'concert', 'cover', 'lyrics', 'teaser', 'behind', 'scenes', 'best',
+    'moments', 'top', 'world', 'cup', 'election', 'update', 'launch', 'iphone'
+]
+LANGUAGES = ['en', 'es', 'pt', 'hi', 'ja', 'ko', 'de', 'fr', 'ru', 'tr', 'ar', 'id', None]
+CATEGORY_IDS = ['1', '2', '10', '15', '17', '19', '20', '22', '23', '24', '25', '26', '27', '28']
+ID_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+
+def region_codes(count):
+    """
+    Return `count` region codes: the real country codes first, then synthetic
+    two-letter codes (for sizing runs with more regions than exist today).
+
+    Args:
+        count (int): Number of region codes.
+
+    Returns:
+        list: Region codes.
+    """
+    synthetic = (''.join(p) for p in itertools.product('ABCDEFGHIJKLMNOPQRSTUVWXYZ', repeat=2))
+    codes = list(COUNTRY_CODES)
+    codes += [code for code in synthetic if code not in COUNTRY_CODES]
+    if count > len(codes):
+        raise ValueError(f"At most {len(codes)} two-letter regions are available")
+    return codes[:count]
+
+def sentence(rng, low, high):
+    """
+    Build a random sentence from the vocabulary.
+
+    Args:
+        rng (random.Random): Seeded generator.
+        low (int): Minimum number of words.
+        high (int): Maximum number of words.
+
+    Returns:
+        str: Sentence.
+    """
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+def make_video(key, published_before):
+    """
+    Generate one `youtube#video` resource, deterministically from its key.
+
+    Args:
+        key (str): Seed of the video (shared by every region it trends in).
+        published_before (datetime): Upper bound of `publishedAt`.
+
+    Returns:
+        dict: Video resource with snippet, contentDetails and statistics.
+    """
+    rng = random.Random(key)
+    video_id = ''.join(rng.choice(ID_ALPHABET) for _ in range(11))
+    channel_id = 'UC' + ''.join(rng.choice(ID_ALPHABET) for _ in range(22))
+    title = sentence(rng, 3, 12)
+    description = ' '.join(sentence(rng, 5, 20) + '.' for _ in range(rng.randint(0, 6)))
+    language = rng.choice(LANGUAGES)
+    published_at = published_before - timedelta(seconds=rng.randint(600, 14 * 86400))
+
+    snippet = {
+        'publishedAt': published_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'channelId': channel_id,
+        'title': title,
+        'description': description,
+        'thumbnails': {
+            name: {'url': f'https://i.ytimg.com/vi/{video_id}/{name}.jpg', 'width': width, 'height': height}
+            for name, width, height in (('default', 120, 90), ('medium', 320, 180), ('high', 480, 360))
+        },
+        'channelTitle': sentence(rng, 1, 3),
+        'categoryId': rng.choice(CATEGORY_IDS),
+        'liveBroadcastContent': 'none',
+        'localized': {'title': title, 'description': description}
+    }
+    if rng.random() < 0.8:
+        snippet['tags'] = sorted({rng.choice(WORDS) for _ in range(rng.randint(1, 15))})
+    if language:
+        snippet['defaultLanguage'] = language
+        snippet['defaultAudioLanguage'] = language
+
+    hours, minutes, seconds = rng.choice([0, 0, 0, 1]), rng.randint(0, 59), rng.randint(0, 59)
+    content_details = {
+        'duration': 'PT' + (f'{hours}H' if hours else '') + f'{minutes}M{seconds}S',
+        'dimension': '2d',
+        'definition': rng.choice(['hd', 'hd', 'sd']),
+        'caption': rng.choice(['true', 'false']),
+        'licensedContent': rng.random() < 0.6,
+        'contentRating': {},
+        'projection': 'rectangular'
+    }
+    if rng.random() < RESTRICTED_SHARE:
+        content_details['regionRestriction'] = {'blocked': sorted(rng.sample(COUNTRY_CODES, rng.randint(1, 12)))}
+
+    views = int(rng.paretovariate(1.2) * 20000)
+    statistics = {'viewCount': str(views), 'favoriteCount': '0'}
+    if rng.random() < 0.95:
+        statistics['likeCount'] = str(int(views * rng.uniform(0.005, 0.08)))
+    if rng.random() < 0.9:
+        statistics['commentCount'] = str(int(views * rng.uniform(0.0005, 0.01)))
+
+    return {
+        'kind': 'youtube#video',
+        'etag': hashlib.sha1(key.encode('utf-8')).hexdigest()[:27],
+        'id': video_id,
+        'snippet': snippet,
+        'contentDetails': content_details,
+        'statistics': statistics
+    }
+
+class VideosHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the stub; settings live on the server object
+    (`regions`, `videos_per_region`, `published_before`).
+    """
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass  # Silence per-request logging (it would dominate a benchmark)
+
+    def send_json(self, status, body):
+        """
+        Send a JSON response.
+
+        Args:
+            status (int): HTTP status code.
+            body (dict): Response payload.
+        """
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_error_json(self, status, reason, message):
+        """
+        Send an error in the API's error format.
+
+        Args:
+            status (int): HTTP status code.
+            reason (str): Error reason (e.g. 'invalidParameter').
+            message (str): Human readable message.
+        """
+        self.send_json(status, {'error': {
+            'code': status, 'message': message,
+            'errors': [{'message': message, 'domain': 'youtube.parameter', 'reason': reason}]
+        }})
+
+    def send_statistics(self, video_ids):
+        """
+        Answer a `videos.list?id=...` lookup with the statistics of each id.
+
+        Args:
+            video_ids (list): Requested video ids.
+        """
+        if len(video_ids) > PAGE_SIZE:
+            return self.send_error_json(400, 'invalidParameter', f'At most {PAGE_SIZE} ids per request.')
+        items = []
+        for video_id in video_ids:
+            rng = random.Random(f'statistics:{video_id}')
+            views = int(rng.paretovariate(1.2) * 20000)
+            items.append({
+                'kind': 'youtube#video',
+                'etag': hashlib.sha1(video_id.encode('utf-8')).hexdigest()[:27],
+                'id': video_id,
+                'statistics': {'viewCount': str(views), 'likeCount': str(int(views * rng.uniform(0.005, 0.08))),
+                               'favoriteCount': '0', 'commentCount': str(int(views * rng.uniform(0.0005, 0.01)))}
+            })
+        self.send_json(200, {
+            'kind': 'youtube#videoListResponse',
+            'etag': hashlib.sha1(','.join(video_ids).encode('utf-8')).hexdigest()[:27],
+            'items': items,
+            'pageInfo': {'totalResults': len(items), 'resultsPerPage': len(items)}
+        })
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if url.path != API_PATH:
+            return self.send_error_json(404, 'notFound', f'Unknown path {url.path}')
+        if not params.get('key'):
+            return self.send_error_json(403, 'forbidden', 'The request is missing a valid API key.')
+        if params.get('id'):
+            return self.send_statistics(params['id'].split(','))
+        if params.get('chart') != 'mostPopular':
+            return self.send_error_json(400, 'invalidParameter', 'Only chart=mostPopular is supported.')
+        region = params.get('regionCode', 'US')
+        if region not in self.server.regions:
+            return self.send_error_json(400, 'invalidRegionCode', f'Region {region} is not supported.')
+
+        page_size = max(1, min(int(params.get('maxResults', 5)), PAGE_SIZE))
+        start = int(params['pageToken'][2:]) if params.get('pageToken') else 0
+        total = self.server.videos_per_region
+        end = min(start + page_size, total)
+        etag = hashlib.sha1(f'{region}:{start}:{total}'.encode('utf-8')).hexdigest()[:27]
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        items = []
+        for rank in range(start, end):
+            # Popular videos trend in several regions at once (same id and payload)
+            rng = random.Random(f'{region}:{rank}')
+            key = f'shared:{rank}' if rng.random() < SHARED_VIDEO_SHARE else f'{region}:{rank}'
+            items.append(make_video(key, self.server.published_before))
+
+        body = {
+            'kind': 'youtube#videoListResponse',
+            'etag': etag,
+            'items': items,
+            'pageInfo': {'totalResults': total, 'resultsPerPage': page_size}
+        }
+        if end < total:
+            body['nextPageToken'] = f'CD{end}'  # Opaque to clients, an offset here
+        self.send_json(200, body)
+
+def make_server(port=0, regions=None, videos_per_region=200, host='127.0.0.1'):
+    """
+    Create (but do not start) the stub server.
+
+    Args:
+        port (int): Port to listen on (0 picks a free one).
+        regions (list, optional): Accepted region codes (all real codes if omitted).
+        videos_per_region (int): Videos returned per region, across all pages.
+        host (str): Interface to bind.
+
+    Returns:
+        ThreadingHTTPServer: Server; call `serve_forever()` to start it.
+    """
+    server = ThreadingHTTPServer((host, port), VideosHandler)
+    server.daemon_threads = True
+    server.regions = set(regions or region_codes(len(COUNTRY_CODES)))
+    server.videos_per_region = videos_per_region
+    server.published_before = datetime.utcnow().replace(microsecond=0)
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve a synthetic YouTube videos.list endpoint.")
+    parser.add_argument("--port", type=int, default=8089, help="port to listen on (0 = any free port)")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--regions", type=int, default=len(COUNTRY_CODES),
+                        help="number of accepted region codes (synthetic codes beyond the real ones)")
+    parser.add_argument("--videos-per-region", type=int, default=200,
+                        help="videos returned per region across all pages")
+    args = parser.parse_args()
+
+    server = make_server(args.port, region_codes(args.regions), args.videos_per_region, args.host)
+    # First line announces the URL (read by run_benchmark.py when started with --port 0)
+    print(f"http://{args.host}:{server.server_port}{API_PATH}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,5 @@
+"""
+Shared helpers used by more than one pipeline stage (ingestion, flatten,
+upload and report). Stage scripts put the project root on `sys.path` so this
+package can be imported when they are run directly as scripts.
+"""
@@ -0,0 +1,148 @@
+"""
+Tag & Blocking Aggregates
+-------------------------
+Small pre-aggregated tables computed by the flatten engines while they
+flatten a day. The popular-tags and restriction marts read a few thousand
+counts from them, instead of exploding every `tags` / `blocked_countries`
+array of the history in the warehouse.
+
+Datasets (under `aggregates_root` in the `[FLATTEN]` section, default `data/aggregates`):
+- `tag_counts/YYYY_MM_DD/country=XX/`: one row per tag of the region's trending
+  list (`tag`, `tag_count` = number of occurrences, `load_ts`).
+- `blocked_counts/YYYY_MM_DD/country=XX/`: one row per country blocking at least
+  one of the region's videos (`blocked_country`, `video_count` = distinct videos,
+  `load_ts`), plus a total row with a null `blocked_country` holding the number
+  of the region's videos blocked anywhere.
+- `blocking_counts/YYYY_MM_DD/`: global, one row per blocking country with the
+  number of distinct videos it blocks across every region of the day.
+
+Counting rules (the same in both engines, and as in the former dbt explode):
+- Tags and country codes are trimmed of spaces; null and empty values are dropped.
+- A tag counts once per occurrence; a video counts once per blocking country.
+
+Usage Notes:
+- Counts are exact: a day holds a few thousand videos and tens of thousands
+  of distinct tags, so plain counters stay small (no approximate sketch needed).
+- The per-region datasets are staged and committed with the region's rows,
+  so they always match the published partitions.
+- The global table needs every region of the day, so whole-day flattens rebuild
+  it from the published day (`video_id` and `blocked_countries` only); a single
+  streamed region removes it until the day's catch-up flatten.
+- Days flattened before the aggregates existed: `flatten_youtube_arrow.py --aggregates-only`.
+
+Author: Shreyash Singh
+"""
+
+import os
+import configparser
+from collections import Counter
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+AGGREGATES_ROOT = config.get("FLATTEN", "aggregates_root", fallback="data/aggregates")
+
+# Dataset names under the aggregates root
+TAG_COUNTS = "tag_counts"
+BLOCKED_COUNTS = "blocked_counts"
+BLOCKING_COUNTS = "blocking_counts"
+
+# Per-region datasets (country is the partition column) and their columns
+REGION_AGGREGATES = (TAG_COUNTS, BLOCKED_COUNTS)
+TAG_COUNT_COLUMNS = ["tag", "tag_count", "load_ts"]
+BLOCKED_COUNT_COLUMNS = ["blocked_country", "video_count", "load_ts"]
+BLOCKING_COUNT_COLUMNS = ["blocked_country", "video_count"]
+
+def aggregate_dir(name, run_date, aggregates_root=AGGREGATES_ROOT):
+    """
+    Folder of one aggregate dataset for a day.
+
+    Args:
+        name (str): TAG_COUNTS, BLOCKED_COUNTS or BLOCKING_COUNTS.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        aggregates_root (str): Root of the aggregate datasets.
+
+    Returns:
+        str: e.g. `data/aggregates/tag_counts/2025_08_28`.
+    """
+    return os.path.join(aggregates_root, name, run_date)
+
+def clean_values(values):
+    """
+    Trim a tag or country list the way SQL `trim()` does, dropping blanks.
+
+    Args:
+        values (list or None): Raw list from a flattened row.
+
+    Returns:
+        list: Trimmed non-empty values.
+    """
+    cleaned = (value.strip(' ') for value in values or () if value is not None)
+    return [value for value in cleaned if value]
+
+class RegionCounters:
+    """
+    Tag and blocked-country counters of one region, fed row by row.
+    """
+
+    def __init__(self):
+        self.tags = Counter()
+        self.blocked = {}             # Blocking country → ids of the region's videos it blocks
+        self.blocked_videos = set()   # Ids of the region's videos blocked anywhere
+        self.load_ts = None
+
+    def add(self, row):
+        """
+        Count one flattened row.
+
+        Args:
+            row (dict): Row with `video_id`, `tags`, `blocked_countries` and `load_ts`.
+        """
+        self.tags.update(clean_values(row['tags']))
+        for country in clean_values(row['blocked_countries']):
+            self.blocked.setdefault(country, set()).add(row['video_id'])
+            self.blocked_videos.add(row['video_id'])
+        if self.load_ts is None or (row['load_ts'] is not None and row['load_ts'] > self.load_ts):
+            self.load_ts = row['load_ts']
+
+    def tag_rows(self):
+        """
+        Rows of the region's `tag_counts` partition.
+
+        Returns:
+            list: Dicts keyed by `TAG_COUNT_COLUMNS`, most frequent tags first.
+        """
+        return [{'tag': tag, 'tag_count': count, 'load_ts': self.load_ts}
+                for tag, count in sorted(self.tags.items(), key=lambda item: (-item[1], item[0]))]
+
+    def blocked_rows(self):
+        """
+        Rows of the region's `blocked_counts` partition, total row included.
+
+        Returns:
+            list: Dicts keyed by `BLOCKED_COUNT_COLUMNS` (empty if no video is blocked).
+        """
+        if not self.blocked_videos:
+            return []
+        rows = [{'blocked_country': None, 'video_count': len(self.blocked_videos), 'load_ts': self.load_ts}]
+        rows += [{'blocked_country': country, 'video_count': len(video_ids), 'load_ts': self.load_ts}
+                 for country, video_ids in sorted(self.blocked.items())]
+        return rows
+
+def blocking_rows(videos):
+    """
+    Count the distinct videos each country blocks across the day.
+
+    Args:
+        videos (iterable): (video_id, blocked_countries) pairs of every region
+            (a video trending in several regions may appear several times).
+
+    Returns:
+        list: Dicts keyed by `BLOCKING_COUNT_COLUMNS`, sorted by country.
+    """
+    blocked = {}
+    for video_id, countries in videos:
+        for country in clean_values(countries):
+            blocked.setdefault(country, set()).add(video_id)
+    return [{'blocked_country': country, 'video_count': len(video_ids)}
+            for country, video_ids in sorted(blocked.items())]
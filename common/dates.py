@@ -0,0 +1,105 @@
+"""
+Run Dates
+---------
+Run-date selection shared by the stage scripts, so a stage can reprocess a past
+day or backfill a range of days instead of always working on today's folders.
+
+- A run date is the `YYYY_MM_DD` folder name used under `data/raw/`,
+  `data/processed/` and `data/manifest/`.
+- `--date` selects one day; `--start` / `--end` select an inclusive range
+  (`--end` defaults to today). Both `2025_08_28` and `2025-08-28` are accepted.
+- Without any of them the scripts keep processing today, as before.
+
+Usage Notes:
+- add_date_arguments(parser) adds the options, selected_dates(args) resolves
+  them into the list of run dates.
+
+Author: Shreyash Singh
+"""
+
+from datetime import datetime, timedelta
+
+# Folder name format of a run date
+RUN_DATE_FORMAT = '%Y_%m_%d'
+
+def today():
+    """
+    Today's run date.
+
+    Returns:
+        str: Today's date in YYYY_MM_DD format.
+    """
+    return datetime.today().strftime(RUN_DATE_FORMAT)
+
+def run_date(text):
+    """
+    Parse a run date given on the command line (argparse `type=`).
+
+    Args:
+        text (str): Date as YYYY_MM_DD or YYYY-MM-DD.
+
+    Returns:
+        str: The date in YYYY_MM_DD format.
+    """
+    return datetime.strptime(text.replace('-', '_'), RUN_DATE_FORMAT).strftime(RUN_DATE_FORMAT)
+
+def iso_date(run_date):
+    """
+    Format a run date as an ISO date (the form dbt vars and SQL date casts expect).
+
+    Args:
+        run_date (str): Date in YYYY_MM_DD format.
+
+    Returns:
+        str: The date in YYYY-MM-DD format.
+    """
+    return datetime.strptime(run_date, RUN_DATE_FORMAT).strftime('%Y-%m-%d')
+
+def date_range(start, end):
+    """
+    List the run dates from `start` to `end`, both included.
+
+    Args:
+        start (str): First date in YYYY_MM_DD format.
+        end (str): Last date in YYYY_MM_DD format.
+
+    Returns:
+        list: Run dates in YYYY_MM_DD format, oldest first.
+    """
+    first = datetime.strptime(start, RUN_DATE_FORMAT)
+    last = datetime.strptime(end, RUN_DATE_FORMAT)
+    if last < first:
+        raise ValueError(f"End date {end} is before start date {start}")
+    return [(first + timedelta(days=offset)).strftime(RUN_DATE_FORMAT)
+            for offset in range((last - first).days + 1)]
+
+def add_date_arguments(parser):
+    """
+    Add the `--date` / `--start` / `--end` options to a script's parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser of the stage script.
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--date", type=run_date,
+                       help="process this day (YYYY_MM_DD) instead of today")
+    group.add_argument("--start", type=run_date,
+                       help="backfill from this day (YYYY_MM_DD) up to --end")
+    parser.add_argument("--end", type=run_date,
+                        help="last day of the backfill range (default: today)")
+
+def selected_dates(args):
+    """
+    Resolve the parsed date options into run dates.
+
+    Args:
+        args (argparse.Namespace): Arguments parsed with `add_date_arguments`.
+
+    Returns:
+        list: Run dates in YYYY_MM_DD format (today when no option is given).
+    """
+    if args.start:
+        return date_range(args.start, args.end or today())
+    if args.end:
+        raise ValueError("--end requires --start")
+    return [args.date or today()]
@@ -0,0 +1,84 @@
+"""
+Processed Output Layout
+-----------------------
+Where the flatten engines write a day, shared by flatten, upload, the pipeline
+runner and dbt (through the `YT_*` environment variables).
+
+Layouts (`layout` in the `[FLATTEN]` section of `config.cfg`):
+- `wide` (default): one row per (video, region) with every attribute, in
+  `data/processed/YYYY_MM_DD/country=XX/`.
+- `normalized`: a globally trending video appears in dozens of region files,
+  so its descriptive attributes are written once per day instead of once per region:
+  - facts:  `data/trending/YYYY_MM_DD/country=XX/`: narrow rows (`FACT_COLUMNS`),
+            still one partition per region, so the manifest, the streamed
+            flatten and the per-region upload work unchanged.
+  - videos: `data/videos/YYYY_MM_DD/`: one row per video_id (`VIDEO_COLUMNS`)
+            with a `content_hash` of its attributes, merged as regions are
+            flattened (the latest fetch of a video wins).
+
+Usage Notes:
+- `trending_root` / `videos_root` in `[FLATTEN]` move the normalized outputs.
+- Both engines compute `content_hash` over `VIDEO_COLUMNS[1:]` the same way:
+  values rendered as text (lists joined with `LIST_SEPARATOR`, timestamps as
+  epoch seconds, missing values as ''), joined with `HASH_SEPARATOR`, SHA-256.
+
+Author: Shreyash Singh
+"""
+
+import os
+import configparser
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+LAYOUTS = ('wide', 'normalized')
+
+LAYOUT = config.get("FLATTEN", "layout", fallback="wide")
+PROCESSED_ROOT = "data/processed"
+TRENDING_ROOT = config.get("FLATTEN", "trending_root", fallback="data/trending")
+VIDEOS_ROOT = config.get("FLATTEN", "videos_root", fallback="data/videos")
+
+# Narrow per-region fact (country is the partition column)
+FACT_COLUMNS = [
+    "video_id", "view_count", "like_count", "favorite_count", "comment_count",
+    "trending_rank", "load_ts"
+]
+
+# Per-day video dimension (followed by `content_hash` and `load_ts`)
+VIDEO_COLUMNS = [
+    "video_id", "published_at", "channel_id", "title", "description",
+    "channel_title", "category_id", "live_broadcast_content", "default_language",
+    "default_audio_language", "tags", "duration_seconds", "dimension", "definition",
+    "caption", "licensed_content", "blocked_countries"
+]
+
+# Separators of the canonical text the content hash is computed over
+HASH_SEPARATOR = "\x1f"
+LIST_SEPARATOR = "\x1e"
+
+def output_root(layout=LAYOUT):
+    """
+    Root folder of the per-region datasets for a layout.
+
+    Args:
+        layout (str): 'wide' or 'normalized'.
+
+    Returns:
+        str: `data/processed` (wide rows) or the trending fact root (normalized).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {LAYOUTS}")
+    return TRENDING_ROOT if layout == 'normalized' else PROCESSED_ROOT
+
+def videos_dir(run_date, videos_root=VIDEOS_ROOT):
+    """
+    Folder of a day's video dimension.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        videos_root (str): Root of the video dimension datasets.
+
+    Returns:
+        str: e.g. `data/videos/2025_08_28`.
+    """
+    return os.path.join(videos_root, run_date)
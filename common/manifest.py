@@ -0,0 +1,181 @@
+"""
+Per-Date Content-Hash Manifest
+------------------------------
+Records, for every region of a run date, the content hash of its raw landing
+file and of the processed Parquet partition produced from it, plus which
+processed hash was last uploaded to Snowflake.
+
+The flatten and upload stages consult it to only touch regions whose inputs
+changed, so a rerun after a partial failure (or an hourly refresh where most
+regions did not move) skips the regions that are already up to date.
+
+Layout:
+    data/manifest/YYYY_MM_DD.json
+    {
+      "run_date": "2025_08_28",
+      "regions": {
+        "US": {
+          "raw_file": "data/raw/2025_08_28/US_trending_2025_08_28.jsonl.gz",
+          "raw_hash": "<sha256>",
+          "processed_hash": "<sha256>",
+          "flattened_at": "2025-08-28T06:01:02",
+          "uploaded_hash": "<sha256>",
+          "uploaded_at": "2025-08-28T06:02:10"
+        }
+      }
+    }
+
+Author: Shreyash Singh
+"""
+
+import hashlib
+import json
+import os
+import glob
+from datetime import datetime
+
+MANIFEST_ROOT = 'data/manifest'
+
+# Read files in 1 MiB chunks when hashing so memory stays flat
+CHUNK_SIZE = 1 << 20
+
+def file_hash(path, digest=None):
+    """
+    Compute the SHA-256 of a file's bytes.
+
+    Args:
+        path (str): File to hash.
+        digest (hashlib object, optional): Running digest to update instead of a new one.
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = digest or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def files_hash(paths):
+    """
+    Compute one hash over the bytes of several files (in sorted path order).
+
+    Args:
+        paths (list): Files to hash.
+
+    Returns:
+        str or None: Hex digest, or None if the list is empty.
+    """
+    if not paths:
+        return None
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        file_hash(path, digest)
+    return digest.hexdigest()
+
+def partition_hash(partition_dir):
+    """
+    Compute one hash over all Parquet files of a processed partition.
+
+    Args:
+        partition_dir (str): Directory such as `data/processed/2025_08_28/country=US`.
+
+    Returns:
+        str or None: Hex digest, or None if the partition has no Parquet files.
+    """
+    return files_hash(glob.glob(os.path.join(partition_dir, '*.parquet')))
+
+class Manifest:
+    """
+    Content-hash manifest for a single run date.
+    """
+
+    def __init__(self, run_date, root=MANIFEST_ROOT):
+        """
+        Load the manifest for a date (an empty one if it does not exist yet).
+
+        Args:
+            run_date (str): Date folder name in YYYY_MM_DD format.
+            root (str): Folder holding the manifest files.
+        """
+        self.run_date = run_date
+        self.path = os.path.join(root, f'{run_date}.json')
+        self.regions = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.regions = json.load(f).get('regions', {})
+
+    def entry(self, region):
+        """Return the (mutable) manifest record of a region."""
+        return self.regions.setdefault(region, {})
+
+    def raw_changed(self, region, raw_hash, partition_dir):
+        """
+        Check whether a region must be flattened again.
+
+        Args:
+            region (str): Region code.
+            raw_hash (str): Hash of the current raw landing file.
+            partition_dir (str): Processed partition the region is written to.
+
+        Returns:
+            bool: True if the raw file differs from the one last flattened,
+            or the processed partition was removed or modified since.
+        """
+        entry = self.regions.get(region, {})
+        return (
+            entry.get('raw_hash') != raw_hash
+            or partition_hash(partition_dir) != entry.get('processed_hash')
+        )
+
+    def record_flatten(self, region, raw_file, raw_hash, processed_hash):
+        """
+        Record that a region's raw file was flattened into a processed partition.
+
+        Args:
+            region (str): Region code.
+            raw_file (str): Raw landing file that was read.
+            raw_hash (str): Hash of that raw file.
+            processed_hash (str): Hash of the Parquet partition written from it
+                (None when the region had no videos).
+        """
+        self.entry(region).update({
+            'raw_file': raw_file,
+            'raw_hash': raw_hash,
+            'processed_hash': processed_hash,
+            'flattened_at': datetime.now().isoformat(timespec='seconds')
+        })
+
+    def upload_pending(self, region, processed_hash):
+        """
+        Check whether a region's processed partition still has to be uploaded.
+
+        Args:
+            region (str): Region code.
+            processed_hash (str): Hash of the current processed partition.
+
+        Returns:
+            bool: True if this exact partition content was not uploaded yet.
+        """
+        return self.regions.get(region, {}).get('uploaded_hash') != processed_hash
+
+    def record_upload(self, region, processed_hash):
+        """
+        Record that a region's processed partition was uploaded.
+
+        Args:
+            region (str): Region code.
+            processed_hash (str): Hash of the partition that was uploaded.
+        """
+        self.entry(region).update({
+            'uploaded_hash': processed_hash,
+            'uploaded_at': datetime.now().isoformat(timespec='seconds')
+        })
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'run_date': self.run_date, 'regions': self.regions}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
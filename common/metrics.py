@@ -0,0 +1,243 @@
+"""
+Pipeline Metrics
+----------------
+Structured metrics shared by every stage (ingest, flatten, upload, report and
+`run_pipeline.py`), so a slow daily run can be traced to the API, the flatten
+job or the warehouse.
+
+Outputs:
+- JSON lines: one record per event in `logs/metrics_YYYY_MM_DD.jsonl`, e.g.
+      {"ts": "2025-08-29T06:00:01.532", "pid": 812, "stage": "ingest",
+       "event": "fetch", "region": "US", "seconds": 0.84, "requests": 4,
+       "retries": 0, "quota_units": 4, "items": 200}
+- Prometheus (optional): the same events aggregated in memory and exposed in
+  the text format on `http://<host>:<prometheus_port>/metrics`, and/or written
+  to `prometheus_textfile` on exit (for the node_exporter textfile collector):
+      yt_ingest_fetch_seconds_sum{region="US"} 0.84
+      yt_ingest_fetch_seconds_count{region="US"} 1
+      yt_ingest_fetch_quota_units_total{region="US"} 4
+      yt_ingest_etag_cache_hit_rate 0.92
+
+Conventions:
+- `seconds` becomes a summary (`_seconds_sum` / `_seconds_count`).
+- Ratios and sizes (fields named `rate`, `ratio`, `size` or ending in `_rate`,
+  `_ratio`, `_size`) become gauges holding the last value (`_<field>`): summing
+  them across events would mean nothing.
+- Other numeric fields become counters (`_<field>_total`).
+- String fields become labels (keep them low-cardinality: region, section, ...).
+
+Usage Notes:
+- Settings come from the optional `[METRICS]` section of `config.cfg`
+  (`enabled`, `log_root`, `prometheus_port`, `prometheus_textfile`).
+- Thread-safe; the Prometheus endpoint starts on the first recorded event.
+- Standard library only.
+
+Author: Shreyash Singh
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import threading
+import configparser
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+ENABLED = config.getboolean("METRICS", "enabled", fallback=True)
+LOG_ROOT = config.get("METRICS", "log_root", fallback="logs")
+PROMETHEUS_PORT = config.getint("METRICS", "prometheus_port", fallback=0)        # 0 = no endpoint
+PROMETHEUS_TEXTFILE = config.get("METRICS", "prometheus_textfile", fallback="")  # Empty = not written
+
+PREFIX = "yt"
+
+# Fields exported as gauges (last value) instead of summed counters
+GAUGE_FIELD = r'(^|_)(rate|ratio|size)$'
+
+_lock = threading.Lock()
+_series = {}        # (metric name, sorted label items) → value
+_server = None
+
+def _metric_name(*parts):
+    """
+    Build a valid Prometheus metric name from its parts.
+
+    Returns:
+        str: Name such as `yt_ingest_fetch_seconds`.
+    """
+    return re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join(str(p) for p in parts if p))
+
+def _label_value(value):
+    """
+    Escape a label value for the text exposition format (backslash, quote, newline).
+
+    Returns:
+        str: Value safe to put between double quotes.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _aggregate(stage, event, fields):
+    """
+    Fold one event into the in-memory Prometheus series (caller holds the lock).
+
+    Args:
+        stage (str): Pipeline stage.
+        event (str): Event name.
+        fields (dict): Event fields.
+    """
+    labels = tuple(sorted((k, v) for k, v in fields.items() if isinstance(v, str)))
+    for key, value in fields.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key == 'seconds':
+            for suffix, amount in (('seconds_sum', value), ('seconds_count', 1)):
+                series = (_metric_name(PREFIX, stage, event, suffix), labels)
+                _series[series] = _series.get(series, 0) + amount
+        elif re.search(GAUGE_FIELD, key):
+            _series[(_metric_name(PREFIX, stage, event, key), labels)] = value
+        else:
+            series = (_metric_name(PREFIX, stage, event, key, 'total'), labels)
+            _series[series] = _series.get(series, 0) + value
+
+def record(stage, event, **fields):
+    """
+    Record one event: append it to the JSON-lines log and update the Prometheus series.
+
+    Args:
+        stage (str): Pipeline stage ('ingest', 'flatten', 'upload', 'report', 'pipeline', ...).
+        event (str): What happened ('fetch', 'raw_write', 'copy', 'query', ...).
+        **fields: Measurements (`seconds`, `bytes`, `rows`, ...) and labels (`region`, ...).
+    """
+    if not ENABLED:
+        return
+    line = json.dumps({
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'pid': os.getpid(),
+        'stage': stage,
+        'event': event,
+        **fields
+    }, default=str)
+    path = os.path.join(LOG_ROOT, f"metrics_{datetime.today().strftime('%Y_%m_%d')}.jsonl")
+
+    with _lock:
+        os.makedirs(LOG_ROOT, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+        _aggregate(stage, event, fields)
+        if PROMETHEUS_PORT and _server is None:
+            _start_server(PROMETHEUS_PORT)
+
+def dir_bytes(path):
+    """
+    Total size of the files below a folder (or of a single file).
+
+    Args:
+        path (str): Folder or file.
+
+    Returns:
+        int: Size in bytes (0 if missing).
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(folder, name))
+               for folder, _, names in os.walk(path) for name in names)
+
+@contextmanager
+def timer(stage, event, **fields):
+    """
+    Time a block and record it as one event with a `seconds` field.
+
+    The yielded dict can be filled with more fields (e.g. `rows`) inside the block.
+    Nothing is recorded if the block raises.
+
+    Args:
+        stage (str): Pipeline stage.
+        event (str): Event name.
+        **fields: Extra fields recorded with the timing.
+
+    Yields:
+        dict: Fields of the event, recorded when the block exits.
+    """
+    start = time.perf_counter()
+    yield fields
+    record(stage, event, seconds=round(time.perf_counter() - start, 6), **fields)
+
+def prometheus_text():
+    """
+    Render the aggregated series in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text.
+    """
+    with _lock:
+        items = sorted(_series.items())
+    lines = []
+    typed = set()
+    for (name, labels), value in items:
+        # `x_seconds_sum` / `x_seconds_count` are the two series of summary `x_seconds`
+        family, kind = re.sub(r'_(sum|count)$', '', name), 'summary'
+        if family == name:
+            kind = 'counter' if name.endswith('_total') else 'gauge' if re.search(GAUGE_FIELD, name) else 'untyped'
+        if family not in typed:
+            lines.append(f'# TYPE {family} {kind}')
+            typed.add(family)
+        value_text = str(int(value)) if float(value).is_integer() else repr(float(value))
+        label_text = ','.join(f'{k}="{_label_value(v)}"' for k, v in labels)
+        lines.append(f'{name}{{{label_text}}} {value_text}' if label_text else f'{name} {value_text}')
+    return '\n'.join(lines) + '\n'
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves `prometheus_text()` on `/metrics`."""
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the pipeline output
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        payload = prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+def _start_server(port):
+    """
+    Start the Prometheus endpoint in a daemon thread (caller holds the lock).
+
+    Args:
+        port (int): Port to listen on.
+    """
+    global _server
+    try:
+        _server = ThreadingHTTPServer(('0.0.0.0', port), _MetricsHandler)
+    except OSError as e:
+        print(f"Prometheus endpoint disabled, port {port} unavailable: {e}")
+        _server = False  # Do not retry on every event
+        return
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    print(f"Prometheus metrics on http://0.0.0.0:{port}/metrics")
+
+def write_textfile(path=PROMETHEUS_TEXTFILE):
+    """
+    Write the aggregated series to a file atomically (temp file + rename).
+
+    Args:
+        path (str): Target file; nothing is written if empty.
+    """
+    if not path or not _series:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+atexit.register(write_textfile)
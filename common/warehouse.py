@@ -0,0 +1,166 @@
+"""
+Warehouse Connections
+---------------------
+Opens a connection to the warehouse holding the dbt marts, so the report (and
+any other reader) works against either backend:
+
+- `snowflake`: the production warehouse, RSA key-pair authentication.
+- `duckdb`: a local DuckDB file built by `dbt run --target local` straight from
+  the Parquet files in `data/processed/` (no network, no warehouse to resume).
+
+The backend is chosen with `backend` in the `[WAREHOUSE]` section of `config.cfg`.
+
+Usage Notes:
+- Build the local warehouse first:
+      cd yt_dbt && dbt run --target local --select path:models/staging+ --profiles-dir .dbt
+- Dependencies: snowflake-connector-python + cryptography (snowflake backend),
+  duckdb (duckdb backend); each is only imported when its backend is used.
+
+Author: Shreyash Singh
+"""
+
+import configparser
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+BACKENDS = ('snowflake', 'duckdb')
+
+# Warehouse backend and the DuckDB file written by the `local` dbt target
+BACKEND = config.get("WAREHOUSE", "backend", fallback="snowflake")
+DUCKDB_PATH = config.get("WAREHOUSE", "duckdb_path", fallback="data/warehouse/yt_dbt.duckdb")
+
+# Schema the dbt models are built in (same name on both backends)
+SCHEMA = config.get("SNOWFLAKE", "schema", fallback="youtube")
+
+def load_private_key(path=".ssh/snowflake_rsa_key.p8"):
+    """
+    Load the RSA private key used for Snowflake authentication.
+
+    Args:
+        path (str): PEM file with the unencrypted private key.
+
+    Returns:
+        PrivateKey: Loaded key object.
+    """
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import serialization
+
+    with open(path, "rb") as key_file:
+        return serialization.load_pem_private_key(
+            key_file.read(),
+            password=None,                 # No passphrase for this key
+            backend=default_backend()
+        )
+
+def connect_snowflake(private_key=None, **options):
+    """
+    Connect to Snowflake using key-based authentication.
+
+    Args:
+        private_key (PrivateKey, optional): Loaded RSA key (read from `.ssh/` if omitted).
+        **options: Extra connector options (e.g. `insecure_mode=True`).
+
+    Returns:
+        SnowflakeConnection: Open connection.
+    """
+    import snowflake.connector
+
+    return snowflake.connector.connect(
+        user= config.get("SNOWFLAKE", "user"),                    # Your Snowflake username
+        account= config.get("SNOWFLAKE", "account"),              # Snowflake account identifier
+        private_key=private_key or load_private_key(),            # Loaded RSA private key
+        role= config.get("SNOWFLAKE", "role"),                    # Role with access
+        warehouse= config.get("SNOWFLAKE", "warehouse"),          # Compute warehouse
+        database= config.get("SNOWFLAKE", "database"),            # Target database
+        schema= config.get("SNOWFLAKE", "schema"),                # Target schema
+        **options
+    )
+
+def connect_duckdb(path=DUCKDB_PATH):
+    """
+    Open the local DuckDB warehouse read-only, with the dbt schema as default.
+
+    Args:
+        path (str): DuckDB file written by the `local` dbt target.
+
+    Returns:
+        duckdb.DuckDBPyConnection: Open connection.
+    """
+    import duckdb
+
+    conn = duckdb.connect(path, read_only=True)
+    conn.execute(f"USE {SCHEMA}")  # Marts are queried unqualified, as on Snowflake
+    return conn
+
+def connect(backend=BACKEND):
+    """
+    Connect to the configured warehouse backend.
+
+    Args:
+        backend (str): 'snowflake' or 'duckdb'.
+
+    Returns:
+        Connection: Open connection for `read_sql`.
+    """
+    if backend == 'duckdb':
+        return connect_duckdb()
+    if backend == 'snowflake':
+        return connect_snowflake()
+    raise ValueError(f"Unknown warehouse backend '{backend}', expected one of {BACKENDS}")
+
+def read_sql(query, conn):
+    """
+    Run a query and return the result as a Pandas DataFrame.
+
+    Safe to call from several threads on one shared connection: Snowflake
+    connections can be shared between threads (each call gets its own cursor),
+    and for DuckDB each call opens its own cursor on the shared database.
+
+    Args:
+        query (str): SQL to execute.
+        conn (Connection): Connection returned by `connect`.
+
+    Returns:
+        pandas.DataFrame: Query result.
+    """
+    if hasattr(conn, "df"):
+        # DuckDB: a cursor per call (the default schema is per cursor), native Arrow → Pandas
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"USE {SCHEMA}")
+            return cursor.execute(query).df()
+        finally:
+            cursor.close()
+    import pandas as pd
+    return pd.read_sql(query, conn)
+
+def table_fingerprints(tables, conn):
+    """
+    Fingerprint the content of several tables in a single round trip.
+
+    The fingerprint is an order-independent hash of every row plus the row
+    count, so it only changes when the data changes (not when dbt merely
+    recreates a table with the same rows).
+
+    Args:
+        tables (list): Table names in the default schema.
+        conn (Connection): Connection returned by `connect`.
+
+    Returns:
+        dict: Lower-case table name → fingerprint string.
+    """
+    if not tables:
+        return {}
+    if hasattr(conn, "df"):
+        row_hash = "SUM(HASH(t))::VARCHAR"   # DuckDB: a table alias hashes as the whole row
+    else:
+        row_hash = "HASH_AGG(*)::VARCHAR"    # Snowflake: order-independent aggregate hash
+    query = "\nUNION ALL\n".join(
+        f"SELECT '{name.lower()}' AS table_name, COALESCE({row_hash}, '0') || ':' || COUNT(*) AS fingerprint "
+        f"FROM {name} t"
+        for name in tables
+    )
+    df = read_sql(query, conn)
+    df.columns = [c.lower() for c in df.columns]  # Snowflake returns upper-case column names
+    return dict(zip(df["table_name"], df["fingerprint"]))
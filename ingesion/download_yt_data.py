@@ -2,37 +2,93 @@
 YouTube Trending Data Fetcher
 -----------------------------
 
-This script fetches trending YouTube videos for multiple countries/regions 
+This script fetches trending YouTube videos for multiple countries/regions
 using the YouTube Data API v3 and stores the raw API responses as JSON files.
 
 Workflow:
 1. Define a list of region codes (ISO 3166-1 alpha-2 country codes).
-2. For each region:
+2. Fetch all regions concurrently through a bounded thread pool that shares a
+   single keep-alive `requests.Session` (connection pool).
+3. For each region:
    - Call the YouTube Data API `videos.list` endpoint with `chart=mostPopular`.
    - Request video details including `snippet`, `statistics`, and `contentDetails`.
-   - Save the response as a JSON file inside `data/raw/YYYY_MM_DD/`.
-3. The output files are named as `<REGION>_trending_<YYYY_MM_DD>.json`.
+   - Follow `nextPageToken` until every page (max 50 results each) is fetched.
+   - Send the page's last `etag` as `If-None-Match`; on `304 Not Modified` reuse
+     the payload cached on disk instead of downloading and parsing it again.
+   - Save the merged response inside `data/raw/YYYY_MM_DD/` (skipped when every
+     page was unchanged and today's raw file already holds that content).
+4. The output files are named as `<REGION>_trending_<YYYY_MM_DD>.json`
+   (pretty-printed response) or `<REGION>_trending_<YYYY_MM_DD>.jsonl[.gz|.zst]`
+   (newline-delimited JSON, one video per line), depending on `raw_format`.
 
 Usage Notes:
 - Requires a valid YouTube Data API key, stored in `config.cfg` under `[API]`.
+- Concurrency, request rate, timeout and retry settings are read from the
+  optional `[INGEST]` section of `config.cfg` (defaults are used if missing).
+- Transient failures (HTTP 429/5xx, connection errors) are retried with exponential
+  backoff (or the server's `Retry-After`); retries go through the same global rate
+  limiter as first attempts.
+- `raw_format = ndjson` writes one compact JSON record per video, carrying the
+  response envelope (`region`, `kind`, `etag`, `pageInfo`) next to the `item`.
+  `compression` may be `none`, `gzip` or `zstd` (zstd requires the optional
+  `zstandard` package).
 - Creates a new dated folder each day inside `data/raw/`.
+- The conditional-request cache (`etag_cache`, `cache_root` in `[INGEST]`, default
+  `data/fetch_cache/`) keeps, per region and page, the last etag, the next page
+  token and a gzip copy of the payload. The cache hit rate of the run is printed
+  and recorded in the metrics log. Delete the folder to force full downloads.
+- Per-region API latency, retries, quota units and raw file bytes are written to
+  `logs/metrics_YYYY_MM_DD.jsonl` (see `common/metrics.py`).
 - Useful as a data ingestion layer for building a YouTube trending analysis pipeline.
 
 Author: Shreyash Singh
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
+import gzip
+import hashlib
+import io
 from datetime import datetime
 import os
+import sys
+import threading
+import time
 import configparser
 
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import metrics
+
 # Load API key from config.cfg
 config = configparser.ConfigParser()
 config.read("config.cfg")
 
 # Read API_KEY from [API] section
-API_KEY = config.get("API", "API_KEY")   
+API_KEY = config.get("API", "API_KEY")
+
+# Fetch engine settings from the optional [INGEST] section
+MAX_WORKERS = config.getint("INGEST", "max_workers", fallback=8)                 # Parallel region fetches
+REQUESTS_PER_SECOND = config.getfloat("INGEST", "requests_per_second", fallback=10.0)  # Global rate cap (0 = unlimited)
+REQUEST_TIMEOUT = config.getfloat("INGEST", "timeout", fallback=30.0)             # Seconds per HTTP request
+MAX_RETRIES = config.getint("INGEST", "max_retries", fallback=5)                  # Retries on 429/5xx
+BACKOFF_FACTOR = config.getfloat("INGEST", "backoff_factor", fallback=1.0)        # Exponential backoff base (seconds)
+RAW_FORMAT = config.get("INGEST", "raw_format", fallback="json")                  # json | ndjson
+RAW_COMPRESSION = config.get("INGEST", "compression", fallback="none")            # none | gzip | zstd
+ETAG_CACHE = config.getboolean("INGEST", "etag_cache", fallback=True)            # Conditional (If-None-Match) requests
+CACHE_ROOT = config.get("INGEST", "cache_root", fallback="data/fetch_cache")     # Cached etags and page payloads
+
+# `videos.list` endpoint (overridable, e.g. to point the benchmark at the local stub)
+API_URL = config.get("API", "api_url", fallback="https://www.googleapis.com/youtube/v3/videos")
+PAGE_SIZE = 50  # Hard cap on results per page enforced by the API
+QUOTA_UNITS_PER_REQUEST = 1  # videos.list costs 1 quota unit per call (retried calls included)
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Throttled or transient server errors
+
+# File name suffix for each supported raw compression codec
+RAW_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
 
 # List of region codes (ISO 3166-1 alpha-2 country codes)
 # Each code represents a country/region from which trending YouTube videos will be fetched
@@ -48,48 +104,504 @@ REGIONS = [
     'UY', 'VE', 'VN', 'YE', 'ZW'
 ]
 
-def fetch_trending(region_code):
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces out requests to stay under a global
+    requests-per-second cap, shared by all worker threads.
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate (float): Maximum requests per second. 0 or less disables the limit.
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        """Block the calling thread until it is allowed to send the next request."""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)       # Earliest time this request may go out
+            self.next_slot = slot + self.interval # Reserve the following slot
+        time.sleep(max(0.0, slot - now))
+
+class FetchCache:
+    """
+    On-disk cache of the last response of every (region, page) request, used to
+    send conditional requests (`If-None-Match`) and reuse unchanged payloads.
+
+    Layout (one index per region, so worker threads never share a file):
+    - `<cache_root>/<REGION>.json`: page token → etag, next page token, item
+      count and payload path, plus the raw file last written from them.
+    - `<cache_root>/<REGION>/<hash>.json.gz`: the page payloads.
+    """
+
+    def __init__(self, root=CACHE_ROOT):
+        """
+        Args:
+            root (str): Cache folder.
+        """
+        self.root = root
+        self.lock = threading.Lock()
+        self.requests = 0  # Page requests sent with a cached etag or without
+        self.hits = 0      # ... answered with 304 Not Modified
+
+    def entry(self, region):
+        """
+        Load a region's cache index.
+
+        Args:
+            region (str): Region code.
+
+        Returns:
+            dict: `{'raw_file': ..., 'pages': {page_token: {...}}}` (empty if not cached).
+        """
+        path = os.path.join(self.root, f'{region}.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def count(self, hit):
+        """Count one page request (thread-safe)."""
+        with self.lock:
+            self.requests += 1
+            self.hits += bool(hit)
+
+    @property
+    def hit_rate(self):
+        """Share of page requests answered from the cache (0.0 when nothing was sent)."""
+        return self.hits / self.requests if self.requests else 0.0
+
+    def load_page(self, record):
+        """
+        Read a cached page payload.
+
+        Args:
+            record (dict): Page record whose `payload` points into the cache.
+
+        Returns:
+            dict: The page as returned by the API.
+        """
+        with gzip.open(record['payload'], 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def unchanged(self, region, pages, raw_file):
+        """
+        Tell whether a fetch can reuse the region's last raw file as-is.
+
+        Args:
+            region (str): Region code.
+            pages (list): Page records returned by `fetch_pages`.
+            raw_file (str): Raw file this run would write.
+
+        Returns:
+            bool: True if every page was not modified and `raw_file` was written from them.
+        """
+        if any(record['page'] is not None for record in pages):
+            return False
+        return self.entry(region).get('raw_file') == raw_file and os.path.exists(raw_file)
+
+    def store(self, region, pages, raw_file):
+        """
+        Save the fresh page payloads and the region's index, then drop payloads
+        no longer referenced.
+
+        Args:
+            region (str): Region code.
+            pages (list): Page records returned by `fetch_pages`.
+            raw_file (str): Raw file written from these pages.
+        """
+        region_dir = os.path.join(self.root, region)
+        os.makedirs(region_dir, exist_ok=True)
+        index = {'raw_file': raw_file, 'pages': {}}
+        for record in pages:
+            if record['page'] is not None:
+                name = hashlib.sha1(f"{record['token']}:{record['etag']}".encode('utf-8')).hexdigest()[:16]
+                record['payload'] = os.path.join(region_dir, f'{name}.json.gz')
+                with gzip.open(record['payload'], 'wt', encoding='utf-8') as f:
+                    json.dump(record['page'], f, ensure_ascii=False, separators=(',', ':'))
+            index['pages'][record['token']] = {
+                'etag': record['etag'], 'next': record['next'],
+                'items': record['items'], 'payload': record['payload']
+            }
+
+        # Replace the index atomically, so an interrupted run leaves the previous one intact
+        path = os.path.join(self.root, f'{region}.json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        os.replace(f'{path}.tmp', path)
+
+        referenced = {page['payload'] for page in index['pages'].values()}
+        for name in os.listdir(region_dir):
+            if os.path.join(region_dir, name) not in referenced:
+                os.remove(os.path.join(region_dir, name))
+
+def create_session(pool_size=MAX_WORKERS):
     """
-    Fetch trending YouTube videos for a given region.
-    
+    Create a `requests.Session` with a keep-alive connection pool.
+
+    Throttling and server errors are retried by `send_request`, not by the
+    adapter, so every attempt goes through the shared rate limiter.
+
+    Args:
+        pool_size (int): Number of pooled connections (should match worker count).
+
+    Returns:
+        requests.Session: Session to be shared by all fetch threads.
+    """
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def retry_delay(response, attempt):
+    """
+    Seconds to wait before retrying a throttled or failed request.
+
+    Args:
+        response (requests.Response or None): Failed response (None on a connection error).
+        attempt (int): Number of retries already made (0 for the first retry).
+
+    Returns:
+        float: `Retry-After` when the server sent one in seconds, else exponential backoff.
+    """
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.strip().isdigit():
+        return float(retry_after)
+    return BACKOFF_FACTOR * (2 ** attempt)  # Sleeps 1s, 2s, 4s, ... between attempts
+
+def send_request(session, params, headers=None, rate_limiter=None, max_retries=MAX_RETRIES):
+    """
+    Send a `videos.list` GET, retrying throttling (429), server errors (5xx)
+    and connection errors with backoff. Every attempt, retries included, waits
+    for the shared rate limiter, so a 429 storm never exceeds the configured
+    requests-per-second cap.
+
+    Args:
+        session (requests.Session): Shared pooled session.
+        params (dict): Query parameters.
+        headers (dict, optional): Request headers (e.g., `If-None-Match`).
+        rate_limiter (RateLimiter, optional): Shared requests-per-second limiter.
+        max_retries (int): Retries after the first attempt.
+
+    Returns:
+        tuple: (response, retries, seconds) with the last response (its status is
+        not checked), the number of retried attempts and the time spent in requests.
+    """
+    seconds = 0.0
+    for attempt in range(max_retries + 1):
+        if rate_limiter:
+            rate_limiter.wait()
+        request_start = time.perf_counter()
+        try:
+            response = session.get(API_URL, params=params, headers=headers or {}, timeout=REQUEST_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            seconds += time.perf_counter() - request_start
+            if attempt == max_retries:
+                raise
+            time.sleep(retry_delay(None, attempt))
+            continue
+        seconds += time.perf_counter() - request_start
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response, attempt, seconds
+        time.sleep(retry_delay(response, attempt))
+
+def fetch_pages(region_code, session=None, rate_limiter=None, cache=None):
+    """
+    Fetch every page of a region's trending chart, conditionally when cached.
+
     Args:
         region_code (str): Country/region code (e.g., 'US', 'IN').
-    
+        session (requests.Session, optional): Shared pooled session.
+        rate_limiter (RateLimiter, optional): Shared requests-per-second limiter.
+        cache (FetchCache, optional): Conditional-request cache (None = always download).
+
     Returns:
-        dict: JSON response from YouTube Data API containing trending videos.
+        list: One record per page: `token` (the page token, '' for the first page),
+        `etag`, `next` (next page token), `items` (video count), `page` (the
+        downloaded page, or None when not modified) and `payload` (cached copy).
     """
-    url = "https://www.googleapis.com/youtube/v3/videos"
+    session = session or create_session(pool_size=1)
     params = {
         'part': 'snippet,statistics,contentDetails',  # Include video details
         'chart': 'mostPopular',                      # Fetch trending/most popular videos
-        'maxResults': 200,                           # Max number of videos per API call
+        'maxResults': PAGE_SIZE,                     # Max number of videos per API call
         'regionCode': region_code,                   # Region to fetch data for
         'key': API_KEY                               # API key for authentication
     }
-    response = requests.get(url, params=params)  # Send GET request to API
-    return response.json()  # Return JSON response
+    cached_pages = cache.entry(region_code).get('pages', {}) if cache else {}
+
+    pages = []
+    requests_sent, retries, api_seconds, hits = 0, 0, 0.0, 0
+    while True:
+        token = params.get('pageToken', '')
+        cached = cached_pages.get(token)
+        if cached and not os.path.exists(cached.get('payload') or ''):
+            cached = None  # Payload lost (crash during store, partial cleanup): refetch it in full
+        # Conditional request: the API answers 304 (no body) if the page did not change
+        headers = {'If-None-Match': cached['etag']} if cached and cached.get('etag') else {}
+        # Send GET request to API (429/5xx retried, each attempt rate limited)
+        response, retried, seconds = send_request(session, params, headers, rate_limiter)
+        api_seconds += seconds
+        requests_sent += 1
+        retries += retried
+
+        if response.status_code == 304 and cached:
+            # Not modified: keep the cached payload, nothing to parse
+            hits += 1
+            pages.append({'token': token, 'etag': cached['etag'], 'next': cached['next'],
+                          'items': cached['items'], 'page': None, 'payload': cached['payload']})
+        else:
+            response.raise_for_status()  # Fail loudly once retries are exhausted
+            page = response.json()
+            pages.append({'token': token, 'etag': page.get('etag'), 'next': page.get('nextPageToken'),
+                          'items': len(page.get('items', [])), 'page': page, 'payload': None})
+        if cache:
+            cache.count(response.status_code == 304 and cached)
+
+        next_token = pages[-1]['next']
+        if not next_token:
+            break
+        params['pageToken'] = next_token
+
+    metrics.record('ingest', 'fetch', region=region_code, seconds=round(api_seconds, 6),
+                   requests=requests_sent, retries=retries, not_modified=hits,
+                   quota_units=(requests_sent + retries) * QUOTA_UNITS_PER_REQUEST,
+                   items=sum(record['items'] for record in pages))
+    return pages
+
+def merge_pages(pages, cache=None):
+    """
+    Merge page records into a single response.
+
+    Args:
+        pages (list): Page records returned by `fetch_pages`.
+        cache (FetchCache, optional): Cache holding the payloads of not-modified pages.
+
+    Returns:
+        dict: The first page's envelope (kind, etag, pageInfo) with the `items`
+        of every page merged into a single list.
+    """
+    result = None
+    for record in pages:
+        page = record['page'] if record['page'] is not None else cache.load_page(record)
+        if result is None:
+            result = dict(page, items=list(page.get('items', [])))  # First page keeps the envelope
+        else:
+            result['items'].extend(page.get('items', []))  # Later pages only contribute items
+    result.pop('nextPageToken', None)  # All pages merged, token no longer meaningful
+    return result
+
+def fetch_trending(region_code, session=None, rate_limiter=None, cache=None):
+    """
+    Fetch trending YouTube videos for a given region, following pagination.
+
+    Args:
+        region_code (str): Country/region code (e.g., 'US', 'IN').
+        session (requests.Session, optional): Shared pooled session.
+        rate_limiter (RateLimiter, optional): Shared requests-per-second limiter.
+        cache (FetchCache, optional): Conditional-request cache.
+
+    Returns:
+        dict: JSON response from YouTube Data API containing trending videos,
+        with the `items` of every page merged into a single list.
+    """
+    return merge_pages(fetch_pages(region_code, session, rate_limiter, cache), cache)
+
+def raw_file_path(region, raw_format=RAW_FORMAT, compression=RAW_COMPRESSION):
+    """
+    Build today's raw landing file path of a region.
+
+    Args:
+        region (str): Region code used for naming the file.
+        raw_format (str): 'json' or 'ndjson'.
+        compression (str): One of 'none', 'gzip' or 'zstd' (ndjson only).
+
+    Returns:
+        str: e.g. `data/raw/2025_08_21/US_trending_2025_08_21.jsonl.gz`.
+    """
+    today = datetime.today().strftime('%Y_%m_%d')  # Get today's date (YYYY_MM_DD format)
+    if raw_format == 'ndjson':
+        return f'data/raw/{today}/{region}_trending_{today}.jsonl{RAW_EXTENSIONS[compression]}'
+    return f'data/raw/{today}/{region}_trending_{today}.json'
 
 def save_json(data, region):
     """
     Save API response data as a JSON file in a date-based folder.
-    
+
     Args:
         data (dict): API response data to save.
         region (str): Region code used for naming the file.
+
+    Returns:
+        str: Path of the written file.
     """
-    today = datetime.today().strftime('%Y_%m_%d')  # Get today's date (YYYY_MM_DD format)
-    
+    path = raw_file_path(region, 'json')
+
     # Create folder for today's date if it doesn't exist (e.g., data/raw/2025_08_21/)
-    os.makedirs(f'data/raw/{today}', exist_ok=True)
-    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
     # Save response JSON into region-specific file
-    with open(f'data/raw/{today}/{region}_trending_{today}.json', 'w') as f:
+    with open(path, 'w') as f:
         json.dump(data, f, indent=2)  # Pretty-print with indentation
+    return path
+
+def open_raw_file(path, compression='none'):
+    """
+    Open a raw landing file for text writing with the requested compression.
+
+    Args:
+        path (str): Destination file path (including compression suffix).
+        compression (str): One of 'none', 'gzip' or 'zstd'.
+
+    Returns:
+        file object: Writable text stream.
+    """
+    if compression == 'gzip':
+        # mtime=0 keeps the gzip header stable, so identical content hashes identically
+        return io.TextIOWrapper(gzip.GzipFile(path, 'wb', mtime=0), encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard  # Optional dependency, only needed for zstd output
+        except ImportError:
+            raise RuntimeError("compression = zstd requires the 'zstandard' package")
+        return zstandard.open(path, 'w', encoding='utf-8')
+    if compression == 'none':
+        return open(path, 'w', encoding='utf-8')
+    raise ValueError(f"Unsupported raw compression: {compression}")
+
+def save_ndjson(data, region, compression=RAW_COMPRESSION):
+    """
+    Save API response data as newline-delimited JSON (one video per line).
+
+    Every line carries the response envelope (region, kind, etag, pageInfo)
+    next to the video `item`, so files can be read line by line and split
+    across Spark tasks without multiline parsing.
+
+    Args:
+        data (dict): API response data to save.
+        region (str): Region code used for naming the file.
+        compression (str): One of 'none', 'gzip' or 'zstd'.
+
+    Returns:
+        str: Path of the written file.
+    """
+    path = raw_file_path(region, 'ndjson', compression)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    envelope = {
+        'region': region,
+        'kind': data.get('kind'),
+        'etag': data.get('etag'),
+        'pageInfo': data.get('pageInfo')
+    }
+    with open_raw_file(path, compression) as f:
+        for item in data.get('items', []):
+            f.write(json.dumps({**envelope, 'item': item}, ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+    return path
+
+def save_raw(data, region):
+    """
+    Persist a region's response using the configured raw landing format.
+
+    Args:
+        data (dict): API response data to save.
+        region (str): Region code used for naming the file.
+
+    Returns:
+        str: Path of the written file.
+    """
+    if RAW_FORMAT == 'ndjson':
+        return save_ndjson(data, region)
+    return save_json(data, region)
+
+def fetch_and_save(region, session, rate_limiter, cache=None):
+    """
+    Fetch all pages for one region and persist them (runs inside a worker thread).
+
+    Args:
+        region (str): Region code to fetch.
+        session (requests.Session): Shared pooled session.
+        rate_limiter (RateLimiter): Shared requests-per-second limiter.
+        cache (FetchCache, optional): Conditional-request cache.
+
+    Returns:
+        tuple: (number of videos saved, path of the raw file)
+    """
+    pages = fetch_pages(region, session=session, rate_limiter=rate_limiter, cache=cache)
+    path = raw_file_path(region)
+    if cache and cache.unchanged(region, pages, path):
+        # Nothing changed since this raw file was written: no duplicate write
+        metrics.record('ingest', 'raw_write', region=region, skipped=True)
+        return sum(record['items'] for record in pages), path
+
+    data = merge_pages(pages, cache)
+    with metrics.timer('ingest', 'raw_write', region=region) as fields:
+        path = save_raw(data, region)
+        fields['bytes'] = os.path.getsize(path)
+    if cache:
+        cache.store(region, pages, path)
+    return len(data.get('items', [])), path
+
+def fetch_all(regions=REGIONS, max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+              on_saved=None, etag_cache=ETAG_CACHE):
+    """
+    Fetch and save trending data for all regions concurrently.
+
+    Args:
+        regions (list): Region codes to fetch.
+        max_workers (int): Maximum number of regions fetched in parallel.
+        requests_per_second (float): Global request rate cap (0 = unlimited).
+        on_saved (callable, optional): Called as `on_saved(region, path)` in the
+            calling thread as soon as each region's raw file is written, so later
+            stages can start on it while other regions are still being fetched.
+        etag_cache (bool): Send conditional requests and reuse unchanged cached pages.
+
+    Returns:
+        list: Region codes that failed after all retries.
+    """
+    session = create_session(pool_size=max_workers)
+    rate_limiter = RateLimiter(requests_per_second)
+    cache = FetchCache() if etag_cache else None
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_and_save, region, session, rate_limiter, cache): region
+            for region in regions
+        }
+        for future in as_completed(futures):
+            region = futures[future]
+            try:
+                count, path = future.result()
+                print(f"Fetched region: {region} ({count} videos)")  # Log finished region
+            except Exception as e:
+                print(f"Failed region: {region} ({e})")
+                metrics.record('ingest', 'fetch_failed', region=region, error=type(e).__name__)
+                failed.append(region)
+                continue
+            if on_saved:
+                on_saved(region, path)
+
+    session.close()
+    if cache:
+        print(f"ETag cache: {cache.hits}/{cache.requests} pages not modified ({cache.hit_rate:.0%} hit rate)")
+        metrics.record('ingest', 'etag_cache', requests=cache.requests, hits=cache.hits,
+                       hit_rate=round(cache.hit_rate, 4))
+    return failed
 
 if __name__ == '__main__':
     # Main execution block
-    # Loop through all regions and fetch trending videos
-    for region in REGIONS:
-        print(f"Fetching for region: {region}")  # Log current region
-        data = fetch_trending(region)            # Fetch trending videos
-        save_json(data, region)                  # Save results to JSON
+    # Fetch all regions concurrently and report any that could not be fetched
+    start = time.monotonic()
+    failed = fetch_all()
+    print(f"Fetched {len(REGIONS) - len(failed)}/{len(REGIONS)} regions in {time.monotonic() - start:.1f}s")
+    if failed:
+        raise SystemExit(f"Failed to fetch regions: {', '.join(sorted(failed))}")
@@ -0,0 +1,192 @@
+"""
+YouTube Video Statistics Tracker
+--------------------------------
+
+Keeps following the view / like / comment counts of videos after they drop off
+the trending charts. The chart pulls of `download_yt_data.py` only capture a
+video while it trends; this script polls just the `statistics` of every video
+seen recently, 50 ids per `videos.list` call.
+
+Workflow:
+1. Collect the deduplicated video ids seen in any region over the last
+   `window_days` processed days (only the `video_id` column of the Parquet
+   datasets is read).
+2. Split them into batches of 50 (the API's cap on `id=`) and fetch them
+   concurrently with `videos.list?part=statistics&id=...` on the shared
+   session / rate limiter of `download_yt_data.py`.
+3. Write one snapshot per run to
+   `data/raw_statistics/YYYY_MM_DD/statistics_HHMMSS.jsonl.gz`: one line per
+   video, `{"polled_at": ..., "item": {"id": ..., "statistics": {...}}}`.
+   Snapshots are only ever added, never rewritten, so the folder is an
+   append-only time series (`flatten_statistics.py` turns each one into Parquet,
+   `upload_files.py --statistics` appends it to `RAW_YOUTUBE_STATISTICS`).
+
+Usage Notes:
+- python3 ingesion/track_statistics.py                  # poll now, ids of the last 7 days
+- python3 ingesion/track_statistics.py --window-days 3
+- Settings are read from the optional `[TRACK]` section of `config.cfg`.
+- Quota: one unit per 50 videos, whatever the number of regions they trended in
+  (a chart pull costs one unit per 50 videos per region, with every part).
+- Videos deleted or made private since are simply missing from the snapshot.
+
+Author: Shreyash Singh
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import argparse
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone, timedelta
+
+import pyarrow.dataset as ds
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.dates import RUN_DATE_FORMAT, today
+from common.layout import LAYOUT, output_root
+from common import metrics
+from download_yt_data import (
+    API_KEY, MAX_WORKERS, REQUESTS_PER_SECOND, PAGE_SIZE,
+    QUOTA_UNITS_PER_REQUEST, RateLimiter, create_session, send_request
+)
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+# Tracker settings from the optional [TRACK] section
+WINDOW_DAYS = config.getint("TRACK", "window_days", fallback=7)                          # Processed days whose videos are tracked
+RAW_STATISTICS_ROOT = config.get("TRACK", "raw_root", fallback="data/raw_statistics")    # Snapshot landing folder
+
+BATCH_SIZE = PAGE_SIZE  # videos.list accepts at most 50 ids per call
+
+def tracked_video_ids(run_date, window_days=WINDOW_DAYS, processed_root=None):
+    """
+    Collect the distinct video ids seen in any region over the recent processed days.
+
+    Args:
+        run_date (str): Last day of the window, in YYYY_MM_DD format.
+        window_days (int): Number of days in the window (run_date included).
+        processed_root (str, optional): Root of the per-region datasets (default: the layout's).
+
+    Returns:
+        list: Sorted distinct video ids.
+    """
+    processed_root = processed_root or output_root(LAYOUT)
+    last = datetime.strptime(run_date, RUN_DATE_FORMAT)
+    video_ids = set()
+    for offset in range(window_days):
+        day_dir = os.path.join(processed_root, (last - timedelta(days=offset)).strftime(RUN_DATE_FORMAT))
+        files = glob.glob(os.path.join(day_dir, "**", "*.parquet"), recursive=True)
+        if not files:
+            continue
+        # Column projection: only video_id is read from the Parquet files
+        table = ds.dataset(files, format="parquet").to_table(columns=["video_id"])
+        video_ids.update(value for value in table.column("video_id").to_pylist() if value)
+    return sorted(video_ids)
+
+def fetch_statistics(video_ids, session, rate_limiter=None):
+    """
+    Fetch the statistics of up to 50 videos in one `videos.list` call.
+
+    Args:
+        video_ids (list): At most `BATCH_SIZE` video ids.
+        session (requests.Session): Shared pooled session.
+        rate_limiter (RateLimiter, optional): Shared requests-per-second limiter.
+
+    Returns:
+        list: `youtube#video` resources holding `id` and `statistics`.
+    """
+    params = {
+        'part': 'statistics',         # Only the counters: smallest response
+        'id': ','.join(video_ids),    # Up to 50 comma-separated ids
+        'maxResults': BATCH_SIZE,
+        'key': API_KEY
+    }
+    response, retries, seconds = send_request(session, params, rate_limiter=rate_limiter)
+    response.raise_for_status()
+    items = response.json().get('items', [])
+    metrics.record('track', 'fetch', seconds=round(seconds, 6), ids=len(video_ids), items=len(items),
+                   retries=retries, quota_units=(1 + retries) * QUOTA_UNITS_PER_REQUEST)
+    return items
+
+def save_snapshot(items, polled_at, run_date, raw_root=RAW_STATISTICS_ROOT):
+    """
+    Write one polling run as a new gzip NDJSON snapshot (never overwrites).
+
+    Args:
+        items (list): Video resources with `id` and `statistics`.
+        polled_at (datetime): Poll time (UTC).
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        raw_root (str): Snapshot landing folder.
+
+    Returns:
+        str: Path of the snapshot.
+    """
+    day_dir = os.path.join(raw_root, run_date)
+    os.makedirs(day_dir, exist_ok=True)
+    path = os.path.join(day_dir, f"statistics_{polled_at.strftime('%H%M%S')}.jsonl.gz")
+    polled_text = polled_at.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    # Written under a temporary name, then renamed: readers only ever see complete snapshots
+    tmp_path = os.path.join(day_dir, f"_{os.path.basename(path)}.tmp")
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for item in items:
+            record = {'polled_at': polled_text, 'item': {'id': item.get('id'), 'statistics': item.get('statistics')}}
+            f.write(json.dumps(record, separators=(',', ':')))
+            f.write('\n')
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        raise FileExistsError(f"Snapshot {path} already exists")
+    os.rename(tmp_path, path)
+    return path
+
+def track_all(run_date=None, window_days=WINDOW_DAYS, max_workers=MAX_WORKERS,
+              requests_per_second=REQUESTS_PER_SECOND):
+    """
+    Refresh the statistics of every recently seen video and save a snapshot.
+
+    Args:
+        run_date (str, optional): Last processed day of the window (default: today).
+        window_days (int): Number of processed days whose videos are tracked.
+        max_workers (int): Maximum number of batches fetched in parallel.
+        requests_per_second (float): Global request rate cap (0 = unlimited).
+
+    Returns:
+        str or None: Snapshot path, or None if there was no video to track.
+    """
+    run_date = run_date or today()
+    video_ids = tracked_video_ids(run_date, window_days)
+    if not video_ids:
+        print(f"No processed videos in the last {window_days} days, nothing to track.")
+        return None
+    batches = [video_ids[start:start + BATCH_SIZE] for start in range(0, len(video_ids), BATCH_SIZE)]
+
+    polled_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    session = create_session(pool_size=max_workers)
+    rate_limiter = RateLimiter(requests_per_second)
+    try:
+        with metrics.timer('track', 'poll', videos=len(video_ids), requests=len(batches)) as fields:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(lambda batch: fetch_statistics(batch, session, rate_limiter), batches))
+            items = [item for batch_items in results for item in batch_items]
+            fields['items'] = len(items)
+    finally:
+        session.close()
+
+    path = save_snapshot(items, polled_at, run_date)
+    print(f"Tracked {len(items)}/{len(video_ids)} videos with {len(batches)} requests "
+          f"({len(batches) * QUOTA_UNITS_PER_REQUEST} quota units), saved to {path}")
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Refresh the statistics of recently trending videos.")
+    parser.add_argument("--window-days", type=int, default=WINDOW_DAYS,
+                        help="number of processed days whose videos are tracked")
+    args = parser.parse_args()
+
+    track_all(window_days=args.window_days)
@@ -2,93 +2,573 @@
 YouTube Trending Data → Snowflake Uploader
 ------------------------------------------
 
-This script automates the process of uploading processed YouTube trending data 
+This script automates the process of uploading processed YouTube trending data
 into a Snowflake table. The workflow is:
 
 1. Load RSA private key from file (.ssh/snowflake_rsa_key.p8) for Snowflake authentication.
-2. Identify all Parquet files generated for today's date inside `data/processed/YYYY_MM_DD/`.
-3. Read all Parquet files into Pandas DataFrames and merge them into a single DataFrame.
+2. Identify all Parquet files generated for today's date inside `data/processed/YYYY_MM_DD/`
+   (either a `country=XX/` partitioned dataset or one file per region).
+3. Consult the per-date manifest (`data/manifest/YYYY_MM_DD.json`) and keep only the
+   countries whose Parquet content changed since they were last uploaded.
 4. Establish a secure connection to Snowflake using key-based authentication.
-5. Upload the DataFrame into the `YT_DB.RAW.RAW_YOUTUBE_DATA` table.
-   - Existing data is **overwritten** (not appended).
-6. Print the number of rows successfully inserted.
-7. Close the Snowflake connection.
+5. Stage the existing Parquet files as-is with parallel PUTs into the table stage
+   (`@%RAW_YOUTUBE_DATA/YYYY_MM_DD/country=XX/`); no Pandas round trip, so memory
+   stays flat regardless of how many days or regions are loaded.
+6. In one transaction, delete the rows of those (load date, country) partitions
+   and load all staged files with a single `COPY INTO`.
+   - Other dates and countries are never touched (the table is not truncated).
+7. Record the uploaded partition hashes in the manifest and print the number of rows loaded.
+8. Close the Snowflake connection.
+
+Normalized layout (`layout = normalized` in `[FLATTEN]`, see `common/layout.py`):
+the per-region facts in `data/trending/YYYY_MM_DD/country=XX/` are loaded the same
+way into `RAW_YOUTUBE_TRENDING`, and the day's video dimension `data/videos/YYYY_MM_DD/`
+replaces that day's rows of `RAW_YOUTUBE_VIDEOS` in the same transaction whenever
+it changed (tracked in the manifest under the `videos` key).
+
+Tag / blocking aggregates (`common/aggregates.py`): the per-region tag and
+blocked-country counts written next to the rows are staged and replaced with
+their region in the same transaction (`RAW_YOUTUBE_TAG_COUNTS`,
+`RAW_YOUTUBE_BLOCKED_COUNTS`), and the day's global blocking counts replace that
+day's rows of `RAW_YOUTUBE_BLOCKING_COUNTS` whenever a region is uploaded.
+
+Video statistics time series (`--statistics`): the Parquet snapshots written by
+`spark_job/flatten_statistics.py` are PUT without overwriting and appended to
+`RAW_YOUTUBE_STATISTICS` by a COPY without `FORCE`, so Snowflake's load metadata
+loads every snapshot exactly once, however often the upload runs.
 
 Usage Notes:
 - Ensure Parquet files are generated before running this script.
+- Pass `--force` to re-upload every country of the day.
+- Pass `--date YYYY_MM_DD` for another day, or `--start`/`--end` to upload a backfilled
+  range (one connection, each day loaded in its own transaction; days without
+  processed data are skipped).
+- PUT concurrency is read from the optional `[UPLOAD]` section of `config.cfg`.
+- PUT bytes/time per country and COPY time/rows go to `logs/metrics_YYYY_MM_DD.jsonl`.
 - Requires RSA key-based authentication to be properly configured in Snowflake.
-- Dependencies: pandas, pyarrow, snowflake-connector-python, cryptography.
+- Dependencies: snowflake-connector-python, cryptography.
 
 Author: Shreyash Singh
 """
 
 import os
-import pandas as pd
-from snowflake.connector.pandas_tools import write_pandas
-import snowflake.connector
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from datetime import datetime
+import sys
+import glob
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 import configparser
 
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.dates import add_date_arguments, selected_dates
+from common.manifest import Manifest, files_hash
+from common.layout import LAYOUT, FACT_COLUMNS, VIDEO_COLUMNS, output_root, videos_dir
+from common.aggregates import (
+    TAG_COUNTS, BLOCKED_COUNTS, BLOCKING_COUNTS, TAG_COUNT_COLUMNS, BLOCKED_COUNT_COLUMNS,
+    BLOCKING_COUNT_COLUMNS, aggregate_dir
+)
+from common.warehouse import connect_snowflake
+from common import metrics
+
 config = configparser.ConfigParser()
 config.read("config.cfg")
 
-# Get today's date (used for folder paths, formatted as YYYY_MM_DD)
-today = datetime.today().strftime('%Y_%m_%d')
+# Files are PUT into each table's own stage (`@%TABLE`), no extra DDL needed
+TABLE_NAME = "RAW_YOUTUBE_DATA"
 
-# Load private key for Snowflake authentication
-with open(".ssh/snowflake_rsa_key.p8", "rb") as key_file:
-    private_key = serialization.load_pem_private_key(
-        key_file.read(),
-        password=None,                 # No passphrase for this key
-        backend=default_backend()
-    )
+# Normalized layout: narrow per-region facts and the per-day video dimension
+FACT_TABLE = "RAW_YOUTUBE_TRENDING"
+VIDEO_TABLE = "RAW_YOUTUBE_VIDEOS"
+VIDEOS_KEY = "videos"  # Manifest entry of the video dimension upload
+
+# Per-region tag / blocked-country counts (load_ts is converted separately) ...
+AGGREGATE_TABLES = {
+    TAG_COUNTS: ("RAW_YOUTUBE_TAG_COUNTS", [name for name in TAG_COUNT_COLUMNS if name != "load_ts"]),
+    BLOCKED_COUNTS: ("RAW_YOUTUBE_BLOCKED_COUNTS", [name for name in BLOCKED_COUNT_COLUMNS if name != "load_ts"])
+}
+# ... and the day's global blocking counts
+BLOCKING_TABLE = "RAW_YOUTUBE_BLOCKING_COUNTS"
 
-# Placeholder empty DataFrame (not used yet but may help with initialization/debugging)
-empty_df = pd.DataFrame()
+# Append-only video statistics time series (`track_statistics.py`)
+STATISTICS_TABLE = "RAW_YOUTUBE_STATISTICS"
+STATISTICS_ROOT = config.get("TRACK", "statistics_root", fallback="data/statistics")
+STATISTICS_COLUMNS = ["video_id", "view_count", "like_count", "favorite_count", "comment_count"]
 
-# Locate all Parquet files from today's processed folder
-parquet_folder = f'data/processed/{today}/'
-parquet_files = [
-    os.path.join(parquet_folder, f)
-    for f in os.listdir(parquet_folder)
-    if f.endswith(".parquet")          # Pick only Parquet files
+# Number of countries staged concurrently, and Snowflake's per-PUT upload threads
+PUT_WORKERS = config.getint("UPLOAD", "put_workers", fallback=8)
+PUT_PARALLEL = config.getint("UPLOAD", "put_parallel", fallback=4)
+
+# Columns loaded from the Parquet files, in table order
+PARQUET_COLUMNS = [
+    "video_id", "published_at", "channel_id", "title", "description",
+    "channel_title", "category_id", "live_broadcast_content", "default_language",
+    "default_audio_language", "tags", "duration_seconds", "dimension", "definition",
+    "caption", "licensed_content", "view_count", "like_count", "favorite_count",
+    "comment_count", "blocked_countries"
 ]
 
-# If no Parquet files found, stop the script
-if not parquet_files:
-    raise Exception("No Parquet files found in the directory.")
-
-# Read each Parquet file into a DataFrame, then merge all into one DataFrame
-df_list = [pd.read_parquet(pq_file, engine="pyarrow") for pq_file in parquet_files]
-full_df = pd.concat(df_list, ignore_index=True)  # Combine all into one DF
-
-# Connect to Snowflake using key-based authentication
-conn = snowflake.connector.connect(
-    user= config.get("SNOWFLAKE", "user"),                    # Your Snowflake username
-    account= config.get("SNOWFLAKE", "account"),              # Snowflake account identifier
-    private_key=private_key,                                  # Loaded RSA private key
-    role= config.get("SNOWFLAKE", "role"),                    # Role with access
-    warehouse= config.get("SNOWFLAKE", "warehouse"),          # Compute warehouse
-    database= config.get("SNOWFLAKE", "database"),            # Target database
-    schema= config.get("SNOWFLAKE", "schema"),                # Target schema
-    insecure_mode=True
-)
+# Columns loaded from the normalized Parquet files (load_ts is converted separately)
+FACT_PARQUET_COLUMNS = [name for name in FACT_COLUMNS if name != "load_ts"]
+VIDEO_PARQUET_COLUMNS = VIDEO_COLUMNS + ["content_hash"]
 
-# Upload DataFrame into Snowflake table using write_pandas
-success, nchunks, nrows, _ = write_pandas(
-    conn=conn,
-    df=full_df,
-    table_name="RAW_YOUTUBE_DATA",     # Destination table name
-    database= config.get("SNOWFLAKE", "database"), 
-    schema= config.get("SNOWFLAKE", "schema"),
-    quote_identifiers=True,            # Ensure identifiers are quoted
-    overwrite=True                     # Replace table contents (truncate+insert)
-)
+# Parquet columns that need an explicit cast from the staged VARIANT (timestamps, lists)
+COLUMN_CASTS = {
+    "published_at": "TIMESTAMP_NTZ",
+    "tags": "ARRAY",
+    "blocked_countries": "ARRAY"
+}
+
+def connect(private_key=None):
+    """
+    Connect to Snowflake using key-based authentication.
+
+    Args:
+        private_key (PrivateKey, optional): Loaded RSA private key (read from `.ssh/` if omitted).
+
+    Returns:
+        SnowflakeConnection: Open connection.
+    """
+    return connect_snowflake(private_key, insecure_mode=True)
+
+def list_region_files(parquet_folder):
+    """
+    Group the Parquet files of a processed day by region.
+
+    Args:
+        parquet_folder (str): Processed folder for one date.
+
+    Returns:
+        dict: Region code → list of Parquet file paths.
+    """
+    regions = {}
+    # Partitioned layout: country=XX/part-*.parquet
+    for path in sorted(glob.glob(os.path.join(parquet_folder, "country=*", "*.parquet"))):
+        region = os.path.basename(os.path.dirname(path)).split("=", 1)[1]
+        regions.setdefault(region, []).append(path)
+    # Legacy layout: XX_trending_YYYY_MM_DD.parquet
+    for path in sorted(glob.glob(os.path.join(parquet_folder, "*_trending_*.parquet"))):
+        regions.setdefault(os.path.basename(path)[:2], []).append(path)
+    return regions
+
+def region_table(layout=LAYOUT):
+    """
+    Table and Parquet columns the per-region files of a layout are loaded into.
+
+    Args:
+        layout (str): 'wide' or 'normalized'.
+
+    Returns:
+        tuple: (table name, list of Parquet columns).
+    """
+    if layout == 'normalized':
+        return FACT_TABLE, FACT_PARQUET_COLUMNS
+    return TABLE_NAME, PARQUET_COLUMNS
+
+def stage_region(conn, run_date, region, files, table=None):
+    """
+    Replace a region's staged files with its current Parquet files (runs in a worker thread).
+
+    Args:
+        conn (SnowflakeConnection): Shared connection (one cursor per call).
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        region (str): Region code.
+        files (list): Local Parquet files of the region.
+        table (str, optional): Table whose stage receives the files (default: the layout's).
+    """
+    table = table or region_table()[0]
+    stage_path = f"@%{table}/{run_date}/country={region}/"
+    with metrics.timer('upload', 'put', region=region, files=len(files),
+                       bytes=sum(os.path.getsize(path) for path in files)), conn.cursor() as cur:
+        cur.execute(f"REMOVE {stage_path}")  # Drop files staged by an earlier run
+        for path in files:
+            cur.execute(
+                f"PUT 'file://{os.path.abspath(path)}' {stage_path} "
+                f"AUTO_COMPRESS=FALSE OVERWRITE=TRUE PARALLEL={PUT_PARALLEL}"
+            )
+
+def column_values(parquet_columns):
+    """
+    Build the column list and the matching staged-file expressions of a COPY.
+
+    Args:
+        parquet_columns (list): Parquet columns to load, in table order.
+
+    Returns:
+        tuple: (quoted column list, `$1:"name"` expressions with their casts).
+    """
+    columns = ", ".join(f'"{name}"' for name in parquet_columns)
+    values = ",\n            ".join(
+        f'$1:"{name}"::{COLUMN_CASTS[name]}' if name in COLUMN_CASTS else f'$1:"{name}"'
+        for name in parquet_columns
+    )
+    return columns, values
+
+def copy_statement(run_date, regions, table=TABLE_NAME, parquet_columns=PARQUET_COLUMNS):
+    """
+    Build the single COPY INTO that loads every staged file of the given regions.
+
+    The country comes from the Parquet column when present (legacy layout) or
+    from the `country=XX` stage path (partitioned layout), and the run date is
+    stored in `load_date` so reruns can replace exactly one partition.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        regions (list): Region codes to load.
+        table (str): Target table (its table stage holds the files).
+        parquet_columns (list): Parquet columns to load, in table order.
+
+    Returns:
+        str: COPY INTO statement.
+    """
+    columns, values = column_values(parquet_columns)
+    pattern = "|".join(sorted(regions))
+    return f"""
+        COPY INTO {table} ({columns}, "load_ts", "country", "load_date")
+        FROM (
+            SELECT
+            {values},
+            DATE_PART(epoch_microsecond, $1:"load_ts"::TIMESTAMP_NTZ),
+            COALESCE($1:"country"::VARCHAR, REGEXP_SUBSTR(METADATA$FILENAME, 'country=([A-Z]{{2}})', 1, 1, 'e', 1)),
+            TO_DATE('{run_date}', 'YYYY_MM_DD')
+            FROM @%{table}/{run_date}/
+        )
+        PATTERN = '.*country=({pattern})/.*[.]parquet'
+        FILE_FORMAT = (TYPE = PARQUET)
+        FORCE = TRUE
+    """
+
+def day_copy_statement(run_date, table=VIDEO_TABLE, parquet_columns=VIDEO_PARQUET_COLUMNS, load_ts=True):
+    """
+    Build the COPY INTO that loads a day's staged files of a per-day table
+    (the video dimension, or the global blocking counts).
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        table (str): Target table (its table stage holds the files).
+        parquet_columns (list): Parquet columns to load, in table order.
+        load_ts (bool): Also load the files' `load_ts` (as epoch microseconds).
+
+    Returns:
+        str: COPY INTO statement.
+    """
+    columns, values = column_values(parquet_columns)
+    if load_ts:
+        columns += ', "load_ts"'
+        values += ',\n            DATE_PART(epoch_microsecond, $1:"load_ts"::TIMESTAMP_NTZ)'
+    return f"""
+        COPY INTO {table} ({columns}, "load_date")
+        FROM (
+            SELECT
+            {values},
+            TO_DATE('{run_date}', 'YYYY_MM_DD')
+            FROM @%{table}/{run_date}/
+        )
+        PATTERN = '.*[.]parquet'
+        FILE_FORMAT = (TYPE = PARQUET)
+        FORCE = TRUE
+    """
+
+def stage_day(conn, run_date, files, table=VIDEO_TABLE, label=VIDEOS_KEY):
+    """
+    Replace the day's staged files of a per-day table with its current Parquet files.
+
+    Args:
+        conn (SnowflakeConnection): Open connection.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        files (list): Local Parquet files of the day.
+        table (str): Table whose stage receives the files (default: the video dimension).
+        label (str): Name recorded in the PUT metrics.
+    """
+    stage_path = f"@%{table}/{run_date}/"
+    with metrics.timer('upload', 'put', region=label, files=len(files),
+                       bytes=sum(os.path.getsize(path) for path in files)), conn.cursor() as cur:
+        cur.execute(f"REMOVE {stage_path}")
+        for path in files:
+            cur.execute(
+                f"PUT 'file://{os.path.abspath(path)}' {stage_path} "
+                f"AUTO_COMPRESS=FALSE OVERWRITE=TRUE PARALLEL={PUT_PARALLEL}"
+            )
+
+def pending_videos(run_date, manifest, force=False, layout=LAYOUT):
+    """
+    Find the day's video dimension files if they were not uploaded yet.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        manifest (Manifest): The day's manifest.
+        force (bool): Treat the dimension as pending.
+        layout (str): 'wide' (no dimension) or 'normalized'.
+
+    Returns:
+        tuple: (Parquet files or None when nothing is pending, content hash).
+    """
+    if layout != 'normalized':
+        return None, None
+    files = sorted(glob.glob(os.path.join(videos_dir(run_date), "*.parquet")))
+    if not files:
+        return None, None
+    videos_hash = files_hash(files)
+    if force or manifest.upload_pending(VIDEOS_KEY, videos_hash):
+        return files, videos_hash
+    return None, videos_hash
+
+def pending_regions(run_date, force=False):
+    """
+    Find the regions of a processed day whose Parquet content was not uploaded yet.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        force (bool): Treat every region of the day as pending.
+
+    Returns:
+        tuple: (pending, hashes, manifest) where `pending` maps region → Parquet
+        files, `hashes` maps every region → content hash, and `manifest` is the
+        day's manifest.
+    """
+    # Locate all Parquet files from the processed folder, grouped by region
+    parquet_folder = os.path.join(output_root(LAYOUT), run_date)
+    region_files = list_region_files(parquet_folder)
+
+    # If no Parquet files found, stop the script
+    if not region_files:
+        raise Exception("No Parquet files found in the directory.")
+
+    manifest = Manifest(run_date)
+    hashes = {region: files_hash(files) for region, files in region_files.items()}
+    pending = {
+        region: files for region, files in region_files.items()
+        if force or manifest.upload_pending(region, hashes[region])
+    }
+    return pending, hashes, manifest
+
+def stage_regions(conn, run_date, pending, table=None):
+    """
+    Stage the Parquet files of several regions concurrently.
+
+    Args:
+        conn (SnowflakeConnection): Shared connection.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        pending (dict): Region → Parquet files.
+        table (str, optional): Table whose stage receives the files (default: the layout's).
+    """
+    with ThreadPoolExecutor(max_workers=PUT_WORKERS) as executor:
+        futures = [
+            executor.submit(stage_region, conn, run_date, region, files, table)
+            for region, files in pending.items()
+        ]
+        for future in futures:
+            future.result()  # Surface any PUT failure
+
+def load_regions(conn, run_date, regions, videos=False, blocking=False):
+    """
+    Replace this date's rows of the given (already staged) regions, atomically,
+    together with the regions' (already staged) aggregates.
+
+    Args:
+        conn (SnowflakeConnection): Open connection.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        regions (list): Region codes whose files are staged.
+        videos (bool): Also replace the day's (already staged) video dimension.
+        blocking (bool): Also replace the day's (already staged) global blocking counts.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    table, parquet_columns = region_table()
+    placeholders = ", ".join(["%s"] * len(regions))
+    nrows = 0
+    with conn.cursor() as cur:
+        cur.execute("BEGIN")
+        try:
+            if regions:
+                cur.execute(
+                    f'DELETE FROM {table} '
+                    f'WHERE "load_date" = TO_DATE(%s, \'YYYY_MM_DD\') AND "country" IN ({placeholders})',
+                    [run_date, *regions]
+                )
+                with metrics.timer('upload', 'copy', regions=len(regions)) as fields:
+                    cur.execute(copy_statement(run_date, regions, table, parquet_columns))
+                    # One result row per file: (file, status, rows_parsed, rows_loaded, ...)
+                    results = cur.fetchall()
+                    nrows = sum(row[3] for row in results)
+                    fields.update(files=len(results), rows=nrows)
+                for name, (aggregate_table, aggregate_columns) in AGGREGATE_TABLES.items():
+                    cur.execute(
+                        f'DELETE FROM {aggregate_table} '
+                        f'WHERE "load_date" = TO_DATE(%s, \'YYYY_MM_DD\') AND "country" IN ({placeholders})',
+                        [run_date, *regions]
+                    )
+                    with metrics.timer('upload', 'copy', region=name) as fields:
+                        cur.execute(copy_statement(run_date, regions, aggregate_table, aggregate_columns))
+                        # Regions without any count stage no file: a single status row comes back
+                        fields['rows'] = sum(row[3] for row in cur.fetchall() if len(row) > 3)
+            if videos:
+                # The dimension is one file per day: replace the day as a whole
+                cur.execute(f'DELETE FROM {VIDEO_TABLE} WHERE "load_date" = TO_DATE(%s, \'YYYY_MM_DD\')',
+                            [run_date])
+                with metrics.timer('upload', 'copy', region=VIDEOS_KEY) as fields:
+                    cur.execute(day_copy_statement(run_date))
+                    fields['rows'] = sum(row[3] for row in cur.fetchall())
+            if blocking:
+                cur.execute(f'DELETE FROM {BLOCKING_TABLE} WHERE "load_date" = TO_DATE(%s, \'YYYY_MM_DD\')',
+                            [run_date])
+                with metrics.timer('upload', 'copy', region=BLOCKING_COUNTS) as fields:
+                    cur.execute(day_copy_statement(run_date, BLOCKING_TABLE, BLOCKING_COUNT_COLUMNS, load_ts=False))
+                    fields['rows'] = sum(row[3] for row in cur.fetchall())
+            cur.execute("COMMIT")
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+    return nrows
+
+def upload_day(run_date, force=False, conn=None, staged=None):
+    """
+    Upload one day of processed data, skipping regions already uploaded unchanged.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        force (bool): Re-upload every region of the day.
+        conn (SnowflakeConnection, optional): Open connection to reuse (a new one is
+            opened and closed if omitted).
+        staged (dict, optional): Region → content hash of files already staged by
+            the caller (e.g. streamed by `run_pipeline.py`); those are not PUT again.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    pending, hashes, manifest = pending_regions(run_date, force)
+    video_files, videos_hash = pending_videos(run_date, manifest, force)
+    if not pending and not video_files:
+        print(f"All {len(hashes)} regions already uploaded, nothing to do.")
+        return 0
+
+    own_conn = conn is None
+    if own_conn:
+        conn = connect()
+    try:
+        # Stage the Parquet files of every pending region not staged yet, concurrently
+        staged = staged or {}
+        stage_regions(conn, run_date, {
+            region: files for region, files in pending.items()
+            if staged.get(region) != hashes[region]
+        })
+        if video_files:
+            stage_day(conn, run_date, video_files)
+
+        # The pending regions' aggregates follow their rows (a region without counts only clears its stage)
+        for name, (aggregate_table, _) in AGGREGATE_TABLES.items():
+            aggregate_files = list_region_files(aggregate_dir(name, run_date))
+            stage_regions(conn, run_date, {region: aggregate_files.get(region, []) for region in pending},
+                          aggregate_table)
+        # The global blocking counts change with any region of the day
+        blocking_files = sorted(glob.glob(os.path.join(aggregate_dir(BLOCKING_COUNTS, run_date), "*.parquet")))
+        blocking_files = blocking_files if pending else []
+        if blocking_files:
+            stage_day(conn, run_date, blocking_files, BLOCKING_TABLE, BLOCKING_COUNTS)
+
+        # Replace only this date's rows for the pending countries, atomically
+        nrows = load_regions(conn, run_date, list(pending), videos=bool(video_files),
+                             blocking=bool(blocking_files))
+    finally:
+        # Close Snowflake connection (only if it was opened here)
+        if own_conn:
+            conn.close()
+
+    for region in pending:
+        manifest.record_upload(region, hashes[region])
+    if video_files:
+        manifest.record_upload(VIDEOS_KEY, videos_hash)
+    manifest.save()
+
+    # Print result summary
+    print(f"Upload complete. {nrows} rows loaded for {len(pending)} regions.")
+    return nrows
+
+def upload_statistics(run_date, conn=None):
+    """
+    Append a day's new statistics snapshots to the time series table.
+
+    Snapshots never change once written, so they are PUT without overwriting
+    and loaded by a COPY that relies on Snowflake's load metadata (no `FORCE`):
+    files already loaded are skipped, new ones are appended.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        conn (SnowflakeConnection, optional): Open connection to reuse.
+
+    Returns:
+        int: Number of rows appended.
+    """
+    files = sorted(glob.glob(os.path.join(STATISTICS_ROOT, run_date, "*.parquet")))
+    if not files:
+        print(f"No statistics snapshots for {run_date}, nothing to do.")
+        return 0
+
+    stage_path = f"@%{STATISTICS_TABLE}/{run_date}/"
+    columns, values = column_values(STATISTICS_COLUMNS)
+    own_conn = conn is None
+    if own_conn:
+        conn = connect()
+    try:
+        with conn.cursor() as cur:
+            with metrics.timer('upload', 'put', region='statistics', files=len(files),
+                               bytes=sum(os.path.getsize(path) for path in files)):
+                for path in files:
+                    cur.execute(
+                        f"PUT 'file://{os.path.abspath(path)}' {stage_path} "
+                        f"AUTO_COMPRESS=FALSE OVERWRITE=FALSE PARALLEL={PUT_PARALLEL}"
+                    )
+            with metrics.timer('upload', 'copy', region='statistics') as fields:
+                cur.execute(f"""
+                    COPY INTO {STATISTICS_TABLE} ({columns}, "polled_at", "load_date")
+                    FROM (
+                        SELECT
+                        {values},
+                        $1:"polled_at"::TIMESTAMP_NTZ,
+                        TO_DATE('{run_date}', 'YYYY_MM_DD')
+                        FROM {stage_path}
+                    )
+                    PATTERN = '.*[.]parquet'
+                    FILE_FORMAT = (TYPE = PARQUET)
+                """)
+                # Files already loaded come back as a single "0 files processed" status row
+                nrows = sum(row[3] for row in cur.fetchall() if len(row) > 3)
+                fields['rows'] = nrows
+    finally:
+        if own_conn:
+            conn.close()
+
+    print(f"Statistics upload complete. {nrows} rows appended for {run_date}.")
+    return nrows
 
-# Print result summary
-print(f"Upload complete. {nrows} rows inserted.")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Upload processed YouTube trending data to Snowflake.")
+    parser.add_argument("--force", action="store_true",
+                        help="re-upload every region, ignoring the content-hash manifest")
+    parser.add_argument("--statistics", action="store_true",
+                        help="append the video statistics snapshots instead of the trending data")
+    add_date_arguments(parser)
+    args = parser.parse_args()
 
-# Close Snowflake connection
-conn.close()
+    # Date folders to upload: today, --date, or the --start/--end backfill range
+    run_dates = selected_dates(args)
+    if args.statistics:
+        for run_date in run_dates:
+            upload_statistics(run_date)
+    elif len(run_dates) == 1:
+        upload_day(run_dates[0], force=args.force)
+    else:
+        # Backfill: one connection for the whole range, days without processed data skipped
+        conn = connect()
+        try:
+            total = 0
+            for run_date in run_dates:
+                if not os.path.isdir(os.path.join(output_root(LAYOUT), run_date)):
+                    print(f"No processed data for {run_date}, skipped.")
+                    continue
+                print(f"{run_date}:")
+                total += upload_day(run_date, force=args.force, conn=conn)
+        finally:
+            conn.close()
+        print(f"Backfill complete. {total} rows loaded for {len(run_dates)} days.")
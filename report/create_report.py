@@ -1,12 +1,14 @@
 """
-YouTube Trending Reports - Snowflake to PDF Generator
+YouTube Trending Reports - Warehouse to PDF Generator
 ------------------------------------------------------
 
-This script connects to Snowflake using RSA key-based authentication, runs multiple
-analytical queries on YouTube trending video data, and generates a structured PDF report.
+This script connects to the warehouse holding the dbt marts (Snowflake, or the
+local DuckDB file built by `dbt run --target local`), runs multiple analytical
+queries on YouTube trending video data, and generates a structured PDF report.
 
 Key Responsibilities:
-1. Authenticate and connect to Snowflake using private RSA key.
+1. Connect to the backend set in `[WAREHOUSE]` of `config.cfg`
+   (Snowflake with the private RSA key, or DuckDB read-only).
 2. Execute predefined queries for different analytical perspectives:
    - Top blocking countries
    - Most-blocked videos
@@ -14,62 +16,59 @@ Key Responsibilities:
    - Highest-viewed videos
    - Engagement metrics (likes/views, comments/views, etc.)
    - Top-performing categories, languages, and channels
-3. Fetch query results into Pandas DataFrames.
-4. Format results into tables with styled headers.
-5. Generate a single consolidated PDF report with sections for each analysis.
+3. Fingerprint every mart in one round trip and reuse the cached data of sections
+   whose mart did not change (`data/report_cache/`, see `report_cache.py`).
+4. Fetch the remaining query results into Pandas DataFrames, concurrently on the
+   shared connection (`[REPORT] query_workers`), with a timing per query.
+5. Format results into tables with styled headers.
+6. Generate a single consolidated PDF report with sections for each analysis
+   (skipped when no section and no styling changed since the last build).
 
 Output:
-- A PDF file named `youtube_trending_report_<YYYY_MM_DD>.pdf` 
-  containing all analysis tables.
+- A PDF file named `youtube_trending_report_<YYYY-MM-DD>.pdf` after the load date
+  the marts cover (dbt model `int_report_date`), containing all analysis tables.
+
+Usage Notes:
+- Pass `--refresh` to ignore the section cache and rebuild everything.
+- Pass `--date YYYY_MM_DD` to check that the marts cover that run date; they hold the
+  latest load date unless dbt ran with `--vars '{report_date: YYYY-MM-DD}'`
+  (`run_pipeline.py --date` does), and the report fails rather than mislabel them.
+- Cache eviction is set by `cache_max_entries` / `cache_max_age_days` in `[REPORT]`.
 
 """
 
 import pandas as pd
-import snowflake.connector
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.pagesizes import A2
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from snowflake.connector.pandas_tools import write_pandas
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from datetime import datetime
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
+import sys
+import time
+import hashlib
+import argparse
 import configparser
 
-config = configparser.ConfigParser()
-config.read("config.cfg")
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# ------------------------------------------------------------------------------
-# Step 1: Setup - Generate today's date for file naming
-# ------------------------------------------------------------------------------
-today = datetime.today().strftime('%Y_%m_%d')
+from common import warehouse, metrics, dates
+from common.manifest import file_hash
+from report_cache import ReportCache
 
-# ------------------------------------------------------------------------------
-# Step 2: Load Snowflake RSA Private Key
-# ------------------------------------------------------------------------------
-with open(".ssh/snowflake_rsa_key.p8", "rb") as key_file:
-    private_key = serialization.load_pem_private_key(
-        key_file.read(),
-        password=None,
-        backend=default_backend()
-    )
+config = configparser.ConfigParser()
+config.read("config.cfg")
 
-# ------------------------------------------------------------------------------
-# Step 3: Connect to Snowflake
-# ------------------------------------------------------------------------------
-conn = snowflake.connector.connect(
-    user= config.get("SNOWFLAKE", "user"),                    # Your Snowflake username
-    account= config.get("SNOWFLAKE", "account"),              # Snowflake account identifier
-    private_key=private_key,                                  # Loaded RSA private key
-    role= config.get("SNOWFLAKE", "role"),                    # Role with access
-    warehouse= config.get("SNOWFLAKE", "warehouse"),          # Compute warehouse
-    database= config.get("SNOWFLAKE", "database"),            # Target database
-    schema= config.get("SNOWFLAKE", "schema")                 # Target schema
-)
+# Number of mart queries in flight at once (each mostly waits on warehouse latency,
+# so by default every section gets its own worker)
+QUERY_WORKERS = config.getint("REPORT", "query_workers", fallback=24)
 
 # ------------------------------------------------------------------------------
-# Step 4: Define Analytical Queries
+# Analytical Queries
 # Each query generates a different view of YouTube trending video performance
 # ------------------------------------------------------------------------------
 queries = {
@@ -147,65 +146,198 @@ queries = {
     """
 }
 
-# ------------------------------------------------------------------------------
-# Step 5: Setup PDF Report
-# ------------------------------------------------------------------------------
-from reportlab.lib.pagesizes import A2
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-import pandas as pd
-import datetime
+# Section cache eviction policy
+CACHE_MAX_ENTRIES = config.getint("REPORT", "cache_max_entries", fallback=64)
+CACHE_MAX_AGE_DAYS = config.getint("REPORT", "cache_max_age_days", fallback=30)
+
+def timed_query(query, conn):
+    """
+    Run one section query on the shared connection and time it (runs in a worker thread).
 
-# Register wide-coverage Unicode CID font (covers multiple scripts)
-pdfmetrics.registerFont(UnicodeCIDFont("STSong-Light"))  
+    Args:
+        query (str): SQL of the report section.
+        conn (Connection): Shared warehouse connection.
 
-today = datetime.date.today().strftime("%Y-%m-%d")
-pdf_file = f"youtube_trending_report_{today}.pdf"
-doc = SimpleDocTemplate(pdf_file, pagesize=A2)
-elements = []
-styles = getSampleStyleSheet()
+    Returns:
+        tuple: (pandas.DataFrame, elapsed seconds)
+    """
+    start = time.perf_counter()
+    df = warehouse.read_sql(query, conn)
+    elapsed = time.perf_counter() - start
+    metrics.record('report', 'query', table=re.search(r"from\s+(\w+)", query, re.I).group(1).lower(),
+                   seconds=round(elapsed, 6), rows=len(df))
+    return df, elapsed
 
-# Create custom styles
-styles.add(ParagraphStyle(name="Heading1_Custom", parent=styles["Heading1"], fontName="Times-Roman"))
-styles.add(ParagraphStyle(name="Heading2_Custom", parent=styles["Heading2"], fontName="Times-Roman"))
-styles.add(ParagraphStyle(name="BodyUnicode", parent=styles["BodyText"], fontName="STSong-Light"))
+def run_queries(queries, conn, max_workers=QUERY_WORKERS):
+    """
+    Submit every section query at once and gather the results in section order.
 
-# Title
-elements.append(Paragraph('YouTube Trending Videos Data Analysis', styles['Heading1_Custom']))
-elements.append(Spacer(1, 12))
+    Args:
+        queries (dict): Section title → SQL.
+        conn (Connection): Shared warehouse connection.
+        max_workers (int): Maximum number of queries in flight.
 
-# ------------------------------------------------------------------------------
-# Step 6: Loop Through Queries, Fetch Data, Add to Report
-# ------------------------------------------------------------------------------
-for title, query in queries.items():
-    df = pd.read_sql(query, conn)
-
-    # Section title (Times font)
-    elements.append(Paragraph(title, styles['Heading2_Custom']))
-    elements.append(Spacer(1, 6))
-
-    # Convert DataFrame to table
-    table_data = [df.columns.tolist()] + df.values.tolist()
-    table = Table(table_data, hAlign="LEFT")
-
-    # Apply styling to table (text with Unicode font)
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0,0), (-1,0), colors.grey),
-        ("TEXTCOLOR", (0,0), (-1,0), colors.whitesmoke),
-        ("ALIGN", (0,0), (-1,-1), "LEFT"),
-        ("GRID", (0,0), (-1,-1), 0.5, colors.black),
-        ("FONTSIZE", (0,0), (-1,-1), 8),
-        ("FONTNAME", (0,0), (-1,-1), "STSong-Light"),  # ensures unicode text shows correctly
-    ]))
-
-    elements.append(table)
+    Returns:
+        list: (title, DataFrame, elapsed seconds) tuples, in the order of `queries`.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {title: executor.submit(timed_query, query, conn) for title, query in queries.items()}
+        return [(title, *future.result()) for title, future in futures.items()]
+
+def marts_report_date(conn):
+    """
+    Read the load date the report marts cover.
+
+    Args:
+        conn (Connection): Shared warehouse connection.
+
+    Returns:
+        str: Run date in YYYY_MM_DD format.
+    """
+    df = warehouse.read_sql("select load_date from int_report_date", conn)
+    return pd.to_datetime(df.iloc[0, 0]).strftime(dates.RUN_DATE_FORMAT)
+
+def build_report(conn=None, refresh=False, run_date=None):
+    """
+    Query the marts (or reuse cached sections) and build the PDF report.
+
+    Args:
+        conn (Connection, optional): Open warehouse connection to reuse (e.g. the
+            one shared by `run_pipeline.py`); a new one is opened if omitted.
+        refresh (bool): Ignore the section cache and rebuild everything.
+        run_date (str, optional): Run date (YYYY_MM_DD) the marts are expected to cover
+            (default: whichever load date they cover).
+
+    Returns:
+        str: Path of the PDF report.
+    """
+    # --------------------------------------------------------------------------
+    # Step 1: Connect to the warehouse holding the dbt marts
+    # `[WAREHOUSE] backend` in config.cfg: snowflake (RSA key auth) or duckdb (local file)
+    # --------------------------------------------------------------------------
+    if conn is None:
+        conn = warehouse.connect()
+
+    # The marts cover a single load date: name the report after it, never after another day
+    covered_date = marts_report_date(conn)
+    if run_date and run_date != covered_date:
+        raise RuntimeError(f"The marts cover {covered_date}, not {run_date}: rebuild them with "
+                           f"dbt run --vars '{{report_date: {dates.iso_date(run_date)}}}' first")
+
+    # --------------------------------------------------------------------------
+    # Step 2: Fingerprint the marts (one round trip) and reuse unchanged cached sections
+    # --------------------------------------------------------------------------
+    section_tables = {title: re.search(r"from\s+(\w+)", query, re.I).group(1).lower()
+                      for title, query in queries.items()}
+    try:
+        with metrics.timer('report', 'fingerprint', tables=len(set(section_tables.values()))):
+            fingerprints = warehouse.table_fingerprints(sorted(set(section_tables.values())), conn)
+    except Exception as e:
+        print(f"Could not fingerprint marts, caching disabled for this run: {e}")
+        fingerprints = {}
+
+    cache = ReportCache(max_entries=CACHE_MAX_ENTRIES, max_age_days=CACHE_MAX_AGE_DAYS)
+    if refresh:
+        cache.clear()
+    cached = {}
+    for title, table in section_tables.items():
+        df = cache.get(title, fingerprints.get(table))
+        if df is not None:
+            cached[title] = df
+
+    # The PDF depends on the data of every section and on this script (layout, styling)
+    report_key = hashlib.sha256("|".join(
+        [file_hash(os.path.abspath(__file__))] +
+        [f"{title}={fingerprints.get(table)}" for title, table in section_tables.items()]
+    ).encode("utf-8")).hexdigest()
+
+    # --------------------------------------------------------------------------
+    # Step 3: Setup PDF Report
+    # --------------------------------------------------------------------------
+    # Register wide-coverage Unicode CID font (covers multiple scripts)
+    pdfmetrics.registerFont(UnicodeCIDFont("STSong-Light"))
+
+    report_date = dates.iso_date(covered_date)
+    pdf_file = f"youtube_trending_report_{report_date}.pdf"
+
+    # Nothing changed since the last build: keep the existing PDF
+    if len(cached) == len(queries) and cache.report_unchanged(report_key, pdf_file):
+        cache.evict(keep=queries)
+        cache.save()
+        print(f"All {len(queries)} sections unchanged, report is up to date: {pdf_file}")
+        return pdf_file
+
+    doc = SimpleDocTemplate(pdf_file, pagesize=A2)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Create custom styles
+    styles.add(ParagraphStyle(name="Heading1_Custom", parent=styles["Heading1"], fontName="Times-Roman"))
+    styles.add(ParagraphStyle(name="Heading2_Custom", parent=styles["Heading2"], fontName="Times-Roman"))
+    styles.add(ParagraphStyle(name="BodyUnicode", parent=styles["BodyText"], fontName="STSong-Light"))
+
+    # Title
+    elements.append(Paragraph('YouTube Trending Videos Data Analysis', styles['Heading1_Custom']))
     elements.append(Spacer(1, 12))
 
-# ------------------------------------------------------------------------------
-# Step 7: Build PDF
-# ------------------------------------------------------------------------------
-doc.build(elements)
-print(f"Report generated: {pdf_file}")
+    # --------------------------------------------------------------------------
+    # Step 4: Fetch the changed sections concurrently, then add all sections in order
+    # --------------------------------------------------------------------------
+    fetch_start = time.perf_counter()
+    fetched = {title: (df, elapsed) for title, df, elapsed in
+               run_queries({t: q for t, q in queries.items() if t not in cached}, conn)}
+    for title, (df, elapsed) in fetched.items():
+        print(f"  {elapsed:7.3f}s  {len(df):>4} rows  {title.split(' : ')[0]}")
+        cache.put(title, section_tables[title], fingerprints.get(section_tables[title]), df)
+    print(f"Fetched {len(fetched)} sections in {time.perf_counter() - fetch_start:.3f}s "
+          f"(sum of query times {sum(e for _, e in fetched.values()):.3f}s, {QUERY_WORKERS} workers), "
+          f"{len(cached)} from cache")
+    metrics.record('report', 'sections', seconds=round(time.perf_counter() - fetch_start, 6),
+                   queried=len(fetched), cache_hits=len(cached))
+
+    results = [(title, cached[title] if title in cached else fetched[title][0]) for title in queries]
+
+    for title, df in results:
+
+        # Section title (Times font)
+        elements.append(Paragraph(title, styles['Heading2_Custom']))
+        elements.append(Spacer(1, 6))
+
+        # Convert DataFrame to table
+        table_data = [df.columns.tolist()] + df.values.tolist()
+        table = Table(table_data, hAlign="LEFT")
+
+        # Apply styling to table (text with Unicode font)
+        table.setStyle(TableStyle([
+            ("BACKGROUND", (0,0), (-1,0), colors.grey),
+            ("TEXTCOLOR", (0,0), (-1,0), colors.whitesmoke),
+            ("ALIGN", (0,0), (-1,-1), "LEFT"),
+            ("GRID", (0,0), (-1,-1), 0.5, colors.black),
+            ("FONTSIZE", (0,0), (-1,-1), 8),
+            ("FONTNAME", (0,0), (-1,-1), "STSong-Light"),  # ensures unicode text shows correctly
+        ]))
+
+        elements.append(table)
+        elements.append(Spacer(1, 12))
+
+    # --------------------------------------------------------------------------
+    # Step 5: Build PDF and update the section cache
+    # --------------------------------------------------------------------------
+    with metrics.timer('report', 'pdf_build', sections=len(results)) as fields:
+        doc.build(elements)
+        fields['size'] = os.path.getsize(pdf_file)  # Size of the report (a gauge, not summed)
+    cache.record_report(report_key, pdf_file)
+    cache.evict(keep=queries)
+    cache.save()
+    print(f"Report generated: {pdf_file}")
+    return pdf_file
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate the YouTube trending PDF report.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignore the section cache: re-query every mart and rebuild the PDF")
+    parser.add_argument("--date", type=dates.run_date,
+                        help="run date (YYYY_MM_DD) the marts must cover (default: the one they cover)")
+    args = parser.parse_args()
+
+    build_report(refresh=args.refresh, run_date=args.date)
@@ -0,0 +1,186 @@
+"""
+Report Section Cache
+--------------------
+Keeps the data of every report section on disk, keyed by the content
+fingerprint of the mart it was read from, so `create_report.py` only queries
+the marts that changed and skips the PDF build entirely when neither the data
+nor the report template changed.
+
+Layout:
+    data/report_cache/index.json
+    {
+      "report_key": "<sha256 of all fingerprints + template>",
+      "report_file": "youtube_trending_report_2025-08-29.pdf",
+      "sections": {
+        "<section title>": {
+          "table": "mart_tt_long_videos",
+          "fingerprint": "<mart fingerprint>",
+          "file": "<sha256 of title>.parquet",
+          "last_used": "2025-08-29T06:10:00"
+        }
+      }
+    }
+
+Eviction Policy:
+- Sections no longer in the report are dropped on save.
+- Sections not used for `max_age_days` are dropped.
+- At most `max_entries` sections are kept (least recently used go first).
+
+Author: Shreyash Singh
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+import pandas as pd
+
+CACHE_ROOT = 'data/report_cache'
+
+class ReportCache:
+    """
+    Section data cache of the PDF report.
+
+    Args:
+        root (str): Folder holding `index.json` and one Parquet file per section.
+        max_entries (int): Maximum number of cached sections.
+        max_age_days (int): Sections unused for longer than this are evicted.
+    """
+
+    def __init__(self, root=CACHE_ROOT, max_entries=64, max_age_days=30):
+        self.root = root
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.path = os.path.join(root, 'index.json')
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        else:
+            self.data = {}
+        self.data.setdefault('sections', {})
+
+    def section_file(self, title):
+        """
+        Path of the Parquet file caching one section.
+
+        Args:
+            title (str): Section title.
+
+        Returns:
+            str: File path inside the cache folder.
+        """
+        name = hashlib.sha256(title.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.root, f'{name}.parquet')
+
+    def get(self, title, fingerprint):
+        """
+        Return the cached data of a section if its mart is unchanged.
+
+        Args:
+            title (str): Section title.
+            fingerprint (str or None): Current fingerprint of the section's mart.
+
+        Returns:
+            pandas.DataFrame or None: Cached data, or None on a miss.
+        """
+        entry = self.data['sections'].get(title)
+        path = self.section_file(title)
+        if fingerprint is None or not entry or entry.get('fingerprint') != fingerprint \
+                or not os.path.exists(path):
+            return None
+        entry['last_used'] = datetime.now().isoformat(timespec='seconds')
+        return pd.read_parquet(path)
+
+    def put(self, title, table, fingerprint, df):
+        """
+        Store the freshly queried data of a section.
+
+        Args:
+            title (str): Section title.
+            table (str): Mart the section reads.
+            fingerprint (str or None): Fingerprint of the mart (nothing is cached if None).
+            df (pandas.DataFrame): Section data.
+        """
+        if fingerprint is None:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        path = self.section_file(title)
+        df.to_parquet(path, index=False)
+        self.data['sections'][title] = {
+            'table': table,
+            'fingerprint': fingerprint,
+            'file': os.path.basename(path),
+            'last_used': datetime.now().isoformat(timespec='seconds')
+        }
+
+    def report_unchanged(self, report_key, report_file):
+        """
+        Check whether the last built PDF already matches this data and template.
+
+        Args:
+            report_key (str): Hash of all section fingerprints and the template.
+            report_file (str): PDF path about to be written.
+
+        Returns:
+            bool: True if the PDF exists and was built from the same inputs.
+        """
+        return (self.data.get('report_key') == report_key
+                and self.data.get('report_file') == report_file
+                and os.path.exists(report_file))
+
+    def record_report(self, report_key, report_file):
+        """
+        Remember which inputs the PDF was built from.
+
+        Args:
+            report_key (str): Hash of all section fingerprints and the template.
+            report_file (str): PDF path that was written.
+        """
+        self.data['report_key'] = report_key
+        self.data['report_file'] = report_file
+
+    def evict(self, keep):
+        """
+        Apply the eviction policy.
+
+        Args:
+            keep (iterable): Section titles of the current report.
+
+        Returns:
+            int: Number of evicted sections.
+        """
+        keep = set(keep)
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat(timespec='seconds')
+        sections = self.data['sections']
+
+        # Least recently used last, so the overflow is cut from the end
+        ranked = sorted(sections, key=lambda t: sections[t].get('last_used', ''), reverse=True)
+        evicted = [
+            title for position, title in enumerate(ranked)
+            if title not in keep
+            or sections[title].get('last_used', '') < cutoff
+            or position >= self.max_entries
+        ]
+        for title in evicted:
+            del sections[title]
+            path = self.section_file(title)
+            if os.path.exists(path):
+                os.remove(path)
+        return len(evicted)
+
+    def clear(self):
+        """
+        Drop every cached section and the recorded report (forced refresh).
+        """
+        self.evict(keep=())
+        self.data = {'sections': {}}
+
+    def save(self):
+        """
+        Write the index atomically (temp file + rename).
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
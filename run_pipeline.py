@@ -0,0 +1,416 @@
+"""
+YouTube Trending Pipeline Runner
+--------------------------------
+
+Runs the whole pipeline (ingest → flatten → upload → dbt → report) as a small
+stage DAG inside one long-lived Python process, replacing the six separate
+`docker run` invocations of `run_pipeline.sh`.
+
+Workflow:
+1. Load the per-date run state (`data/pipeline/YYYY_MM_DD.json`) and skip the
+   stages that already succeeded today, so a rerun resumes where the last run
+   stopped (a failed ingest only refetches the regions that failed).
+2. Ingest: fetch all regions concurrently. As soon as a region's raw file lands
+   it is streamed to the next stages:
+   - flattened into its `country=XX/` partition (arrow engine), and
+   - its Parquet files are PUT to the Snowflake table stage in the background.
+3. Flatten: flatten the whole day; regions already streamed are skipped by the
+   content-hash manifest, so this only catches up on what is left.
+4. Upload: stage the regions not streamed yet and load the day with one COPY INTO
+   (skipped for the local DuckDB warehouse, which reads the Parquet files in place).
+5. dbt: run `path:models/staging+` in-process (`dev` target on Snowflake, `local` on DuckDB).
+6. Report: build the PDF on the same warehouse connection.
+7. Print and record the wall time of every stage.
+
+Shared across stages: one RSA key load, one warehouse connection, one HTTP
+session pool, and (spark engine only) one SparkSession / JVM.
+
+Usage Notes:
+- python3 run_pipeline.py                  # resume today's run
+- python3 run_pipeline.py --from flatten   # rerun flatten and every later stage
+- python3 run_pipeline.py --only report    # run a single stage
+- python3 run_pipeline.py --force          # rerun everything, ignoring the manifests
+- python3 run_pipeline.py --date 2025_08_28   # reprocess a past day (no ingest: the API
+                                           # only serves today's chart)
+- Multi-day backfills: `flatten_youtube_json.py --start ... --end ...`, then
+  `upload_files.py` with the same range, then `--from dbt`.
+- Settings are read from `[PIPELINE]`, `[WAREHOUSE]` and `[FLATTEN]` in `config.cfg`.
+
+Author: Shreyash Singh
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Stage scripts import each other (and `common`) by bare module name
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for folder in ('', 'ingesion', 'spark_job', 'report'):
+    sys.path.insert(0, os.path.join(ROOT, folder))
+
+from common import warehouse, metrics, dates
+from common.aggregates import AGGREGATES_ROOT
+from common.layout import LAYOUT, VIDEOS_ROOT, output_root
+from common.manifest import Manifest, files_hash
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+# Stages in execution order, with the stages each one depends on
+STAGES = ['ingest', 'flatten', 'upload', 'dbt', 'report']
+DEPENDS_ON = {
+    'ingest': [],
+    'flatten': ['ingest'],
+    'upload': ['flatten'],
+    'dbt': ['upload'],
+    'report': ['dbt']
+}
+
+STATE_ROOT = config.get("PIPELINE", "state_root", fallback="data/pipeline")
+DBT_PROJECT_DIR = config.get("PIPELINE", "dbt_project_dir", fallback="yt_dbt")
+DBT_PROFILES_DIR = config.get("PIPELINE", "dbt_profiles_dir", fallback="yt_dbt/.dbt")
+DBT_SELECT = config.get("PIPELINE", "dbt_select", fallback="path:models/staging+")
+ENGINE = config.get("FLATTEN", "engine", fallback="spark")
+
+class RunState:
+    """
+    Per-date record of which pipeline stages succeeded, used to resume a run.
+
+    Args:
+        run_date (str): Date in YYYY_MM_DD format.
+        root (str): Folder holding one JSON state file per date.
+    """
+
+    def __init__(self, run_date, root=STATE_ROOT):
+        self.path = os.path.join(root, f'{run_date}.json')
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        else:
+            self.data = {'run_date': run_date, 'stages': {}}
+
+    def stage(self, name):
+        """
+        Return the (mutable) record of a stage, creating it if needed.
+
+        Args:
+            name (str): Stage name.
+
+        Returns:
+            dict: Stage record (status, started_at, finished_at, seconds, ...).
+        """
+        return self.data['stages'].setdefault(name, {})
+
+    def done(self, name):
+        """
+        Check whether a stage already succeeded for this date.
+
+        Args:
+            name (str): Stage name.
+
+        Returns:
+            bool: True if the stage's last status is 'done'.
+        """
+        return self.data['stages'].get(name, {}).get('status') == 'done'
+
+    def save(self):
+        """
+        Write the state atomically (temp file + rename).
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+class Pipeline:
+    """
+    Runs the stage DAG for one date in this process, sharing keys, connections
+    and sessions between stages and streaming regions from ingest onwards.
+
+    Args:
+        run_date (str): Date in YYYY_MM_DD format.
+        force (bool): Ignore the content-hash manifests in flatten and upload.
+        backend (str): Warehouse backend ('snowflake' or 'duckdb').
+        engine (str): Flatten engine ('arrow' or 'spark').
+    """
+
+    def __init__(self, run_date, force=False, backend=warehouse.BACKEND, engine=ENGINE):
+        self.run_date = run_date
+        self.force = force
+        self.backend = backend
+        self.engine = engine
+        self.state = RunState(run_date)
+        self.conn = None               # Shared warehouse connection (opened on first use)
+        self.spark = None              # Shared SparkSession (spark engine only)
+        self.streaming = set()         # Stages fed region by region during ingest
+        self.staged = {}               # Region → hash of the Parquet files already PUT
+        self.put_executor = None       # Background PUTs of streamed regions
+        self.put_futures = []
+
+    # --------------------------------------------------------------------------
+    # Shared resources
+    # --------------------------------------------------------------------------
+    def connection(self):
+        """
+        Open the warehouse connection once and reuse it for every later stage.
+
+        Returns:
+            Connection: Snowflake or DuckDB connection.
+        """
+        if self.conn is None:
+            if self.backend == 'snowflake':
+                import upload_files
+                self.conn = upload_files.connect()  # Key is loaded once, here
+            else:
+                self.conn = warehouse.connect(self.backend)
+        return self.conn
+
+    def spark_session(self):
+        """
+        Start the SparkSession (and its JVM) once for the whole run.
+
+        Returns:
+            SparkSession: Shared session.
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.builder.appName("YouTubeTrendingETL").getOrCreate()
+        return self.spark
+
+    def close(self):
+        """
+        Release the shared connection, Spark session and PUT workers.
+        """
+        if self.put_executor:
+            self.put_executor.shutdown(wait=True)
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.spark is not None:
+            self.spark.stop()
+            self.spark = None
+
+    # --------------------------------------------------------------------------
+    # Streaming handoff: runs as each region's raw file lands
+    # --------------------------------------------------------------------------
+    def on_region_landed(self, region, path):
+        """
+        Push one freshly fetched region through flatten (and the upload PUT).
+
+        Args:
+            region (str): Region code.
+            path (str): Raw landing file of the region.
+        """
+        if 'flatten' not in self.streaming:
+            return
+        import flatten_youtube_arrow
+        flatten_youtube_arrow.flatten_day(self.run_date, force=self.force, raw_paths=[path])
+
+        if 'upload' not in self.streaming:
+            return
+        import upload_files
+        files = upload_files.list_region_files(os.path.join(output_root(), self.run_date)).get(region)
+        if not files:
+            return  # Region without videos: nothing to stage
+        region_hash = files_hash(files)
+        if not self.force and not Manifest(self.run_date).upload_pending(region, region_hash):
+            return
+        conn = self.connection()
+        if self.put_executor is None:
+            self.put_executor = ThreadPoolExecutor(max_workers=upload_files.PUT_WORKERS)
+        self.put_futures.append(self.put_executor.submit(
+            upload_files.stage_region, conn, self.run_date, region, files))
+        self.staged[region] = region_hash
+
+    # --------------------------------------------------------------------------
+    # Stages
+    # --------------------------------------------------------------------------
+    def stage_ingest(self, record):
+        """
+        Fetch every region (or, unless forced, only those that failed last time)
+        and stream them on.
+        """
+        import download_yt_data
+        retry_failed = not self.force and bool(record.get('failed'))
+        regions = record['failed'] if retry_failed else download_yt_data.REGIONS
+        failed = download_yt_data.fetch_all(regions, on_saved=self.on_region_landed)
+        record['failed'] = sorted(failed)
+        # Retries add to the regions fetched last time; a full fetch starts over
+        previous = record.get('regions', 0) if retry_failed else 0
+        record['regions'] = previous + len(regions) - len(failed)
+        if failed:
+            raise RuntimeError(f"Failed to fetch regions: {', '.join(sorted(failed))}")
+
+    def stage_flatten(self, record):
+        """
+        Flatten whatever the streaming handoff did not already cover.
+        """
+        if self.engine == 'arrow':
+            import flatten_youtube_arrow
+            flatten_youtube_arrow.flatten_day(self.run_date, force=self.force and 'flatten' not in self.streaming)
+        else:
+            import flatten_youtube_json
+            flatten_youtube_json.flatten_day(self.spark_session(), self.run_date, force=self.force)
+
+    def stage_upload(self, record):
+        """
+        Wait for the streamed PUTs, stage the rest and load the day with one COPY.
+        """
+        if self.backend != 'snowflake':
+            record['skipped'] = f'{self.backend} reads {output_root()} directly'
+            return
+        import upload_files
+        for future in self.put_futures:
+            future.result()  # Surface any streamed PUT failure
+        record['rows'] = upload_files.upload_day(self.run_date, force=self.force,
+                                                 conn=self.connection(), staged=self.staged)
+
+    def stage_dbt(self, record):
+        """
+        Run the dbt models in-process against the configured backend.
+        """
+        from dbt.adapters.factory import reset_adapters
+        from dbt.cli.main import dbtRunner
+
+        target = 'local' if self.backend == 'duckdb' else 'dev'
+        # The local target resolves these relative to the dbt project by default
+        os.environ.setdefault('YT_DUCKDB_PATH', os.path.abspath(warehouse.DUCKDB_PATH))
+        os.environ.setdefault('YT_PROCESSED_ROOT', os.path.abspath('data/processed'))
+        # Flatten layout, so staging also reads the normalized facts + video dimension
+        os.environ.setdefault('YT_FLATTEN_LAYOUT', LAYOUT)
+        os.environ.setdefault('YT_TRENDING_ROOT', os.path.abspath(output_root('normalized')))
+        os.environ.setdefault('YT_VIDEOS_ROOT', os.path.abspath(VIDEOS_ROOT))
+        # Tag / blocking-country counts written by the flatten job
+        os.environ.setdefault('YT_AGGREGATES_ROOT', os.path.abspath(AGGREGATES_ROOT))
+        if target == 'local':
+            os.makedirs(os.path.dirname(os.path.abspath(warehouse.DUCKDB_PATH)), exist_ok=True)
+            if self.conn is not None:
+                self.conn.close()  # dbt needs the DuckDB file read-write
+                self.conn = None
+
+        result = dbtRunner().invoke([
+            'run', '--select', DBT_SELECT, '--target', target,
+            '--project-dir', DBT_PROJECT_DIR, '--profiles-dir', DBT_PROFILES_DIR,
+            # The report marts cover this run's date (int_report_date), even for a past --date
+            '--vars', json.dumps({'report_date': dates.iso_date(self.run_date)})
+        ])
+        # Release dbt's warehouse connections (DuckDB keeps its file open otherwise)
+        reset_adapters()
+        if not result.success:
+            raise RuntimeError(f"dbt run failed: {result.exception or 'see dbt log'}")
+
+    def stage_report(self, record):
+        """
+        Build the PDF report on the shared warehouse connection.
+        """
+        import create_report
+        record['file'] = create_report.build_report(conn=self.connection(), refresh=self.force,
+                                                   run_date=self.run_date)
+
+    # --------------------------------------------------------------------------
+    # DAG execution
+    # --------------------------------------------------------------------------
+    def plan(self, start=None, only=None):
+        """
+        Decide which stages run, following the DAG order.
+
+        With `start`, the stages before it are left as they are and every stage
+        from it onwards runs. Otherwise a stage runs if it has not succeeded yet
+        for this date (or `force` is set), or depends on a stage that will run.
+
+        Args:
+            start (str, optional): First stage to rerun.
+            only (str, optional): Run just this stage.
+
+        Returns:
+            list: Stage names to run, in order.
+        """
+        if only:
+            return [only]
+        if start:
+            return STAGES[STAGES.index(start):]
+        selected = []
+        for name in STAGES:
+            upstream = any(dep in selected for dep in DEPENDS_ON[name])
+            if self.force or upstream or not self.state.done(name):
+                selected.append(name)
+        if self.run_date != dates.today() and 'ingest' in selected:
+            # The API only serves today's chart: a past day reprocesses its landed raw files
+            selected.remove('ingest')
+        return selected
+
+    def run(self, start=None, only=None):
+        """
+        Run the planned stages, recording status and wall time of each.
+
+        Args:
+            start (str, optional): First stage to rerun.
+            only (str, optional): Run just this stage.
+
+        Returns:
+            dict: Stage name → seconds for the stages that ran.
+        """
+        selected = self.plan(start, only)
+        # Stages downstream of ingest that can consume regions as they land
+        if 'ingest' in selected:
+            if 'flatten' in selected and self.engine == 'arrow':
+                self.streaming.add('flatten')
+                if 'upload' in selected and self.backend == 'snowflake':
+                    self.streaming.add('upload')
+
+        timings = {}
+        try:
+            for name in STAGES:
+                if name not in selected:
+                    status = self.state.stage(name).get('status', 'not run')
+                    print(f"[{name}] skipped ({status} for {self.run_date})")
+                    continue
+                record = self.state.stage(name)
+                record.update(status='running', started_at=datetime.now().isoformat(timespec='seconds'))
+                record.pop('error', None)
+                self.state.save()
+                print(f"[{name}] starting")
+                start_time = time.perf_counter()
+                try:
+                    getattr(self, f'stage_{name}')(record)
+                except Exception as e:
+                    record.update(status='failed', error=str(e),
+                                  seconds=round(time.perf_counter() - start_time, 3))
+                    self.state.save()
+                    metrics.record('pipeline', 'stage_failed', name=name, error=type(e).__name__)
+                    raise
+                timings[name] = time.perf_counter() - start_time
+                metrics.record('pipeline', 'stage', name=name, seconds=round(timings[name], 6))
+                record.update(status='done', seconds=round(timings[name], 3),
+                              finished_at=datetime.now().isoformat(timespec='seconds'))
+                self.state.save()
+                print(f"[{name}] done in {timings[name]:.2f}s")
+        finally:
+            self.close()
+            for name, seconds in timings.items():
+                print(f"  {name:<8} {seconds:8.2f}s")
+            print(f"  {'total':<8} {sum(timings.values()):8.2f}s")
+        return timings
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the YouTube trending pipeline in one process.")
+    parser.add_argument("--from", dest="start", choices=STAGES,
+                        help="rerun this stage and every stage after it")
+    parser.add_argument("--only", choices=STAGES, help="run a single stage")
+    parser.add_argument("--force", action="store_true",
+                        help="rerun every stage and ignore the content-hash manifests")
+    parser.add_argument("--backend", choices=warehouse.BACKENDS, default=warehouse.BACKEND,
+                        help="warehouse backend (default from [WAREHOUSE] in config.cfg)")
+    parser.add_argument("--engine", choices=["spark", "arrow"], default=ENGINE,
+                        help="flatten engine (default from [FLATTEN] in config.cfg)")
+    parser.add_argument("--date", type=dates.run_date, default=dates.today(),
+                        help="run date (YYYY_MM_DD) to process (default: today)")
+    args = parser.parse_args()
+
+    Pipeline(args.date, force=args.force, backend=args.backend, engine=args.engine).run(args.start, args.only)
@@ -38,9 +38,11 @@ GRANT CREATE TABLE, CREATE VIEW ON SCHEMA YT_DB.YOUTUBE TO ROLE YT_ROLE;
 -- 4. TABLES
 ------------------------------------------------------------
 
+-- Columns arrive natively typed from the flatten job (no re-parsing in dbt):
+-- timestamps, duration in seconds, tag / blocked-country arrays and integer counts.
 create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_DATA (
 	"video_id" VARCHAR(16777216),
-	"published_at" VARCHAR(16777216),
+	"published_at" TIMESTAMP_NTZ(9),
 	"channel_id" VARCHAR(16777216),
 	"title" VARCHAR(16777216),
 	"description" VARCHAR(16777216),
@@ -49,25 +51,106 @@ create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_DATA (
 	"live_broadcast_content" VARCHAR(16777216),
 	"default_language" VARCHAR(16777216),
 	"default_audio_language" VARCHAR(16777216),
-	"tags" VARCHAR(16777216),
-	"duration" VARCHAR(16777216),
+	"tags" ARRAY,
+	"duration_seconds" NUMBER(38,0),
 	"dimension" VARCHAR(16777216),
 	"definition" VARCHAR(16777216),
 	"caption" VARCHAR(16777216),
 	"licensed_content" BOOLEAN,
 	"view_count" NUMBER(38,0),
-	"like_count" FLOAT,
+	"like_count" NUMBER(38,0),
 	"favorite_count" NUMBER(38,0),
-	"comment_count" FLOAT,
-	"blocked_countries" VARCHAR(16777216),
+	"comment_count" NUMBER(38,0),
+	"blocked_countries" ARRAY,
 	"load_ts" NUMBER(38,0),
-	"country" VARCHAR(16777216)
+	"country" VARCHAR(16777216),
+	"load_date" DATE
 );
 
+-- Normalized layout ([FLATTEN] layout = normalized): narrow per-region trending facts ...
+create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_TRENDING (
+	"video_id" VARCHAR(16777216),
+	"view_count" NUMBER(38,0),
+	"like_count" NUMBER(38,0),
+	"favorite_count" NUMBER(38,0),
+	"comment_count" NUMBER(38,0),
+	"trending_rank" NUMBER(38,0),
+	"load_ts" NUMBER(38,0),
+	"country" VARCHAR(16777216),
+	"load_date" DATE
+)
+CLUSTER BY ("load_date", "country");
+
+-- ... and one row per video and load date with its descriptive attributes
+create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_VIDEOS (
+	"video_id" VARCHAR(16777216),
+	"published_at" TIMESTAMP_NTZ(9),
+	"channel_id" VARCHAR(16777216),
+	"title" VARCHAR(16777216),
+	"description" VARCHAR(16777216),
+	"channel_title" VARCHAR(16777216),
+	"category_id" VARCHAR(16777216),
+	"live_broadcast_content" VARCHAR(16777216),
+	"default_language" VARCHAR(16777216),
+	"default_audio_language" VARCHAR(16777216),
+	"tags" ARRAY,
+	"duration_seconds" NUMBER(38,0),
+	"dimension" VARCHAR(16777216),
+	"definition" VARCHAR(16777216),
+	"caption" VARCHAR(16777216),
+	"licensed_content" BOOLEAN,
+	"blocked_countries" ARRAY,
+	"content_hash" VARCHAR(64),
+	"load_ts" NUMBER(38,0),
+	"load_date" DATE
+)
+CLUSTER BY ("load_date");
+
+-- Tag / blocking aggregates counted by the flatten job (common/aggregates.py):
+-- per-region tag occurrences ...
+create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_TAG_COUNTS (
+	"tag" VARCHAR(16777216),
+	"tag_count" NUMBER(38,0),
+	"load_ts" NUMBER(38,0),
+	"country" VARCHAR(16777216),
+	"load_date" DATE
+)
+CLUSTER BY ("load_date", "country");
+
+-- ... per-region distinct blocked videos per blocking country (null "blocked_country" = blocked anywhere) ...
+create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_BLOCKED_COUNTS (
+	"blocked_country" VARCHAR(16777216),
+	"video_count" NUMBER(38,0),
+	"load_ts" NUMBER(38,0),
+	"country" VARCHAR(16777216),
+	"load_date" DATE
+)
+CLUSTER BY ("load_date", "country");
+
+-- ... and distinct blocked videos per blocking country across every region of the day
+create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_BLOCKING_COUNTS (
+	"blocked_country" VARCHAR(16777216),
+	"video_count" NUMBER(38,0),
+	"load_date" DATE
+)
+CLUSTER BY ("load_date");
+
+-- Append-only statistics time series of recently trending videos (ingesion/track_statistics.py)
+create or replace TABLE YT_DB.YOUTUBE.RAW_YOUTUBE_STATISTICS (
+	"video_id" VARCHAR(16777216),
+	"view_count" NUMBER(38,0),
+	"like_count" NUMBER(38,0),
+	"favorite_count" NUMBER(38,0),
+	"comment_count" NUMBER(38,0),
+	"polled_at" TIMESTAMP_NTZ(9),
+	"load_date" DATE
+)
+CLUSTER BY ("load_date");
+
 
 create or replace TABLE YT_DB.YOUTUBE.YOUTUBE_INCREMENTAL_LOAD (
 	VIDEO_ID VARCHAR(16777216),
-	PUBLISHED_AT VARCHAR(16777216),
+	PUBLISHED_AT TIMESTAMP_NTZ(9),
 	CHANNEL_ID VARCHAR(16777216),
 	TITLE VARCHAR(16777216),
 	DESCRIPTION VARCHAR(16777216),
@@ -76,20 +159,22 @@ create or replace TABLE YT_DB.YOUTUBE.YOUTUBE_INCREMENTAL_LOAD (
 	LIVE_BROADCAST_CONTENT VARCHAR(16777216),
 	DEFAULT_LANGUAGE VARCHAR(16777216),
 	DEFAULT_AUDIO_LANGUAGE VARCHAR(16777216),
-	TAGS VARCHAR(16777216),
+	TAGS ARRAY,
 	DURATION NUMBER(38,0),
 	DIMENSION VARCHAR(16777216),
 	DEFINITION VARCHAR(16777216),
 	CAPTION VARCHAR(16777216),
 	LICENSED_CONTENT BOOLEAN,
 	VIEW_COUNT NUMBER(38,0),
-	LIKE_COUNT FLOAT,
+	LIKE_COUNT NUMBER(38,0),
 	FAVORITE_COUNT NUMBER(38,0),
-	COMMENT_COUNT FLOAT,
-	BLOCKED_COUNTRIES VARCHAR(16777216),
-	LOAD_TS VARCHAR(16777216),
+	COMMENT_COUNT NUMBER(38,0),
+	BLOCKED_COUNTRIES ARRAY,
+	LOAD_TS TIMESTAMP_NTZ(9),
+	LOAD_DATE DATE,
 	COUNTRY VARCHAR(16777216)
-);
+)
+CLUSTER BY (LOAD_DATE, COUNTRY);
 
 ------------------------------------------------------------
 -- 5. SECURITY (RSA key-based authentication)
@@ -0,0 +1,136 @@
+"""
+Flatten Engine Parity Check
+---------------------------
+Runs both flatten engines (Spark and PyArrow) on the same raw day and verifies
+that they produce the same Parquet output: same columns, same types and the
+same rows (`load_ts` is compared by type only, since each run stamps its own
+time), for the rows and for the tag / blocking aggregates.
+
+Usage:
+    python3 spark_job/check_engine_parity.py                 # sample day 2025_08_28
+    python3 spark_job/check_engine_parity.py --date 2025_08_28
+    python3 spark_job/check_engine_parity.py --layout normalized   # facts + video dimension
+
+The outputs are written to a temporary directory; `data/processed/` is not touched.
+Exits with a non-zero status if the engines disagree.
+
+Author: Shreyash Singh
+"""
+
+import pyarrow.dataset as ds
+import pandas as pd
+from pyspark.sql import SparkSession
+import flatten_youtube_json
+import flatten_youtube_arrow
+import argparse
+import tempfile
+import os
+
+from common.layout import LAYOUTS
+from common.aggregates import TAG_COUNTS, BLOCKED_COUNTS, BLOCKING_COUNTS
+
+# Sort key that makes row order deterministic for both engines
+SORT_KEY = ["country", "video_id"]
+
+# Sort keys of the aggregate datasets
+AGGREGATE_SORT_KEYS = {
+    TAG_COUNTS: ["country", "tag"],
+    BLOCKED_COUNTS: ["country", "blocked_country"],
+    BLOCKING_COUNTS: ["blocked_country"]
+}
+
+def read_output(path, sort_key=SORT_KEY):
+    """
+    Load a processed dataset (country partitions included) into Pandas.
+
+    Args:
+        path (str): Dataset directory written by a flatten engine.
+        sort_key (list): Columns that order the rows deterministically.
+
+    Returns:
+        tuple: (pyarrow.Schema, pandas.DataFrame sorted by `sort_key`)
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    table = dataset.to_table()
+    df = table.to_pandas()
+    if "country" in df:
+        df["country"] = df["country"].astype(str)
+    return table.schema, df.sort_values(sort_key).reset_index(drop=True)
+
+def compare(spark_path, arrow_path, sort_key=SORT_KEY):
+    """
+    Compare the outputs of the two engines.
+
+    Args:
+        spark_path (str): Dataset written by the Spark engine.
+        arrow_path (str): Dataset written by the PyArrow engine.
+        sort_key (list): Columns that order the rows deterministically.
+
+    Returns:
+        list: Human-readable differences (empty when the outputs match).
+    """
+    spark_schema, spark_df = read_output(spark_path, sort_key)
+    arrow_schema, arrow_df = read_output(arrow_path, sort_key)
+    problems = []
+
+    if spark_schema.names != arrow_schema.names:
+        problems.append(f"Column mismatch:\n  spark: {spark_schema.names}\n  arrow: {arrow_schema.names}")
+        return problems
+
+    for name in spark_schema.names:
+        if spark_schema.field(name).type != arrow_schema.field(name).type:
+            problems.append(f"Type mismatch for {name}: spark={spark_schema.field(name).type} "
+                            f"arrow={arrow_schema.field(name).type}")
+
+    if len(spark_df) != len(arrow_df):
+        problems.append(f"Row count mismatch: spark={len(spark_df)} arrow={len(arrow_df)}")
+        return problems
+
+    columns = [c for c in spark_schema.names if c != "load_ts"]
+    try:
+        pd.testing.assert_frame_equal(spark_df[columns], arrow_df[columns], check_dtype=False)
+    except AssertionError as e:
+        problems.append(f"Row values differ:\n{e}")
+    return problems
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the Spark and PyArrow flatten engines.")
+    parser.add_argument("--date", default="2025_08_28", help="Raw date folder (YYYY_MM_DD) to compare on")
+    parser.add_argument("--raw-root", default="data/raw", help="Root folder of the raw landing files")
+    parser.add_argument("--layout", choices=LAYOUTS, default="wide", help="Output layout to compare")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spark_root = os.path.join(tmp, "spark")
+        arrow_root = os.path.join(tmp, "arrow")
+        spark_videos = os.path.join(tmp, "spark_videos")
+        arrow_videos = os.path.join(tmp, "arrow_videos")
+        spark_aggregates = os.path.join(tmp, "spark_aggregates")
+        arrow_aggregates = os.path.join(tmp, "arrow_aggregates")
+
+        spark = SparkSession.builder.appName("YouTubeFlattenParity").getOrCreate()
+        flatten_youtube_json.flatten_day(spark, args.date, raw_root=args.raw_root,
+                                         processed_root=spark_root, manifest_root=None,
+                                         layout=args.layout, videos_root=spark_videos,
+                                         aggregates_root=spark_aggregates)
+        spark.stop()
+
+        flatten_youtube_arrow.flatten_day(args.date, raw_root=args.raw_root,
+                                          processed_root=arrow_root, manifest_root=None,
+                                          layout=args.layout, videos_root=arrow_videos,
+                                          aggregates_root=arrow_aggregates)
+
+        problems = compare(os.path.join(spark_root, args.date), os.path.join(arrow_root, args.date))
+        if args.layout == "normalized":
+            # The video dimension, content hashes included
+            problems += compare(os.path.join(spark_videos, args.date),
+                                os.path.join(arrow_videos, args.date), sort_key=["video_id"])
+        for name, sort_key in AGGREGATE_SORT_KEYS.items():
+            problems += compare(os.path.join(spark_aggregates, name, args.date),
+                                os.path.join(arrow_aggregates, name, args.date), sort_key=sort_key)
+
+    if problems:
+        for problem in problems:
+            print(problem)
+        raise SystemExit(f"Engines disagree on {args.date}")
+    print(f"Engines produce identical output for {args.date}")
@@ -0,0 +1,130 @@
+"""
+Video Statistics Snapshot Flattener
+-----------------------------------
+Turns the statistics snapshots written by `ingesion/track_statistics.py` into
+Parquet, one file per snapshot, for `upload_files.py --statistics`.
+
+Steps Performed:
+1. List the snapshots in `data/raw_statistics/YYYY_MM_DD/statistics_HHMMSS.jsonl.gz`.
+2. Skip the snapshots already flattened: the time series is append-only, so a
+   snapshot's Parquet file never changes once written.
+3. Flatten the others to `video_id`, `polled_at` (timestamp, UTC) and the four
+   counts as integers (missing counts stay null, e.g. hidden likes), and write
+   them to `data/statistics/YYYY_MM_DD/statistics_HHMMSS.parquet` through a
+   temporary file renamed into place.
+
+Usage Notes:
+- python3 spark_job/flatten_statistics.py                        # today's snapshots
+- python3 spark_job/flatten_statistics.py --start 2025_08_01     # a range
+- Plain PyArrow, no Spark: a snapshot is one small row per tracked video.
+
+Author: Shreyash Singh
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+import configparser
+import argparse
+import gzip
+import glob
+import json
+import sys
+import os
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.dates import add_date_arguments, selected_dates
+from common import metrics
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+RAW_STATISTICS_ROOT = config.get("TRACK", "raw_root", fallback="data/raw_statistics")
+STATISTICS_ROOT = config.get("TRACK", "statistics_root", fallback="data/statistics")
+
+# Output schema of one snapshot row
+STATISTICS_SCHEMA = pa.schema([
+    ("video_id", pa.string()),
+    ("polled_at", pa.timestamp("us")),
+    ("view_count", pa.int64()),
+    ("like_count", pa.int64()),
+    ("favorite_count", pa.int64()),
+    ("comment_count", pa.int64())
+])
+
+# API statistics field → output column
+COUNT_FIELDS = {
+    "viewCount": "view_count",
+    "likeCount": "like_count",
+    "favoriteCount": "favorite_count",
+    "commentCount": "comment_count"
+}
+
+def flatten_snapshot(raw_path, output_path):
+    """
+    Flatten one statistics snapshot into a Parquet file.
+
+    Args:
+        raw_path (str): Snapshot written by the tracker (gzip NDJSON).
+        output_path (str): Parquet file to create.
+
+    Returns:
+        int: Number of rows written.
+    """
+    rows = []
+    with gzip.open(raw_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            statistics = record['item'].get('statistics') or {}
+            row = {
+                'video_id': record['item'].get('id'),
+                'polled_at': datetime.strptime(record['polled_at'], '%Y-%m-%dT%H:%M:%SZ')
+            }
+            for field, column in COUNT_FIELDS.items():
+                value = statistics.get(field)
+                row[column] = int(value) if value is not None else None
+            rows.append(row)
+
+    table = pa.Table.from_pylist(rows, schema=STATISTICS_SCHEMA)
+    # Temporary name starting with an underscore: ignored by readers until renamed
+    tmp_path = os.path.join(os.path.dirname(output_path), f"_{os.path.basename(output_path)}.tmp")
+    pq.write_table(table, tmp_path, compression='snappy', use_deprecated_int96_timestamps=True)
+    os.rename(tmp_path, output_path)
+    return table.num_rows
+
+def flatten_statistics_day(run_date, raw_root=RAW_STATISTICS_ROOT, statistics_root=STATISTICS_ROOT):
+    """
+    Flatten the day's snapshots that have no Parquet file yet.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        raw_root (str): Snapshot landing folder.
+        statistics_root (str): Root of the flattened snapshots.
+
+    Returns:
+        list: Parquet files written by this run.
+    """
+    raw_paths = sorted(glob.glob(os.path.join(raw_root, run_date, "statistics_*.jsonl.gz")))
+    output_dir = os.path.join(statistics_root, run_date)
+    written = []
+    for raw_path in raw_paths:
+        name = os.path.basename(raw_path)[:-len(".jsonl.gz")] + ".parquet"
+        output_path = os.path.join(output_dir, name)
+        if os.path.exists(output_path):
+            continue  # Append-only: already flattened
+        os.makedirs(output_dir, exist_ok=True)
+        with metrics.timer('flatten', 'statistics', snapshot=name) as fields:
+            fields['rows'] = flatten_snapshot(raw_path, output_path)
+        written.append(output_path)
+    print(f"Flattened {len(written)} of {len(raw_paths)} statistics snapshots to {output_dir}")
+    return written
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Flatten video statistics snapshots into Parquet.")
+    add_date_arguments(parser)
+    args = parser.parse_args()
+
+    for run_date in selected_dates(args):
+        flatten_statistics_day(run_date)
@@ -0,0 +1,703 @@
+"""
+YouTube Trending Data ETL with PyArrow (lightweight engine)
+-----------------------------------------------------------
+In-process alternative to the Spark job in `flatten_youtube_json.py`. A daily
+trending pull is only a few thousand rows, so starting a JVM and SparkSession
+costs far more than the transformation itself; this engine does the same work
+in plain Python + PyArrow.
+
+Steps Performed:
+1. List the raw files in `data/raw/{today}/` (`.json` or `.jsonl[.gz|.zst]`).
+2. Stream the files one region at a time (NDJSON line by line), flattening each
+   video into the same columns as the Spark job (`video_id` ... `blocked_countries`,
+   `load_ts`, `country`) with the same types and null semantics: `published_at`
+   as a timestamp, `duration_seconds` parsed from ISO 8601, and `tags` /
+   `blocked_countries` as lists of strings.
+3. Write each region in bounded row batches to `country=XX/` Parquet files in a
+   private staging directory, then publish it atomically to `data/processed/{today}/`.
+4. Like the Spark job, consult the per-date manifest and only flatten regions
+   whose raw file changed (`--force` rebuilds the whole day).
+5. A backfill range (`--start`/`--end`) flattens its days in parallel worker
+   processes, one day per task, bounded by the cores (`backfill_workers`).
+6. With `layout = normalized` (`common/layout.py`), write narrow fact rows
+   (counts + trending rank) per region instead, and merge each video's
+   descriptive attributes once into the day's video dimension (streamed
+   single-region runs only stage their videos; the day's whole-day run merges
+   them, so the dimension is rewritten once per day, not once per region).
+7. Count each region's tags and blocked countries while its rows stream by, and
+   write the small tag / blocked-country count tables next to the rows
+   (`common/aggregates.py`); whole-day runs also rebuild the day's global
+   blocking counts.
+
+Usage Notes:
+- Select it with `engine = arrow` in the `[FLATTEN]` section of `config.cfg`,
+  `--engine arrow` on `flatten_youtube_json.py`, or run this script directly.
+- Keep the Spark engine for large multi-day backfills on a cluster.
+- `check_engine_parity.py` compares both engines on a sample day.
+- `--aggregates-only` rebuilds the aggregates of days flattened before they
+  existed, from the published Parquet (the raw files are not read).
+
+Author: Shreyash Singh
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone
+from landing import (
+    DURATION_PATTERN, DURATION_UNITS, list_raw_files, region_from_path, new_staging_dir,
+    commit_output, publish_day, plan_regions, record_regions
+)
+from common.manifest import Manifest, MANIFEST_ROOT
+from common.aggregates import (
+    AGGREGATES_ROOT, TAG_COUNTS, BLOCKED_COUNTS, BLOCKING_COUNTS, REGION_AGGREGATES,
+    RegionCounters, aggregate_dir, blocking_rows
+)
+from common.layout import (
+    LAYOUT, LAYOUTS, VIDEOS_ROOT, FACT_COLUMNS, VIDEO_COLUMNS, HASH_SEPARATOR, LIST_SEPARATOR,
+    output_root, videos_dir
+)
+from common.dates import add_date_arguments, selected_dates
+from common import metrics
+from concurrent.futures import ProcessPoolExecutor
+import os
+import glob
+import json
+import gzip
+import shutil
+import re
+import uuid
+import time
+import hashlib
+import calendar
+import argparse
+import configparser
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+# Rows buffered per region before they are flushed to the Parquet file
+BATCH_SIZE = 1000
+
+# Days of a backfill flattened concurrently (0 = one worker process per CPU core)
+BACKFILL_WORKERS = config.getint("FLATTEN", "backfill_workers", fallback=0)
+
+# Output schema, matching the Spark job's `flat_df` select (country is the partition column)
+FLAT_SCHEMA = pa.schema([
+    ("video_id", pa.string()),
+    ("published_at", pa.timestamp("us")),
+    ("channel_id", pa.string()),
+    ("title", pa.string()),
+    ("description", pa.string()),
+    ("channel_title", pa.string()),
+    ("category_id", pa.string()),
+    ("live_broadcast_content", pa.string()),
+    ("default_language", pa.string()),
+    ("default_audio_language", pa.string()),
+    ("tags", pa.list_(pa.string())),
+    ("duration_seconds", pa.int64()),
+    ("dimension", pa.string()),
+    ("definition", pa.string()),
+    ("caption", pa.string()),
+    ("licensed_content", pa.bool_()),
+    ("view_count", pa.int64()),
+    ("like_count", pa.int64()),
+    ("favorite_count", pa.int64()),
+    ("comment_count", pa.int64()),
+    ("blocked_countries", pa.list_(pa.string())),
+    ("load_ts", pa.timestamp("us"))
+])
+
+# Normalized layout: narrow per-region fact (rank is Spark's row_number(), an int32) ...
+FACT_SCHEMA = pa.schema([
+    pa.field(name, pa.int32()) if name == "trending_rank" else FLAT_SCHEMA.field(name)
+    for name in FACT_COLUMNS
+])
+
+# ... and per-day video dimension
+VIDEO_SCHEMA = pa.schema(
+    [FLAT_SCHEMA.field(name) for name in VIDEO_COLUMNS]
+    + [("content_hash", pa.string()), ("load_ts", pa.timestamp("us"))]
+)
+
+# Aggregates (`common/aggregates.py`): per-region tag / blocked-country counts (Spark's
+# count() is a long) and the day's global blocking counts
+TAG_COUNT_SCHEMA = pa.schema([
+    ("tag", pa.string()),
+    ("tag_count", pa.int64()),
+    ("load_ts", pa.timestamp("us"))
+])
+BLOCKED_COUNT_SCHEMA = pa.schema([
+    ("blocked_country", pa.string()),
+    ("video_count", pa.int64()),
+    ("load_ts", pa.timestamp("us"))
+])
+BLOCKING_COUNT_SCHEMA = pa.schema([
+    ("blocked_country", pa.string()),
+    ("video_count", pa.int64())
+])
+AGGREGATE_SCHEMAS = {TAG_COUNTS: TAG_COUNT_SCHEMA, BLOCKED_COUNTS: BLOCKED_COUNT_SCHEMA}
+
+def open_raw_file(path):
+    """
+    Open a raw landing file for text reading, decompressing by suffix.
+
+    Args:
+        path (str): Raw file path.
+
+    Returns:
+        file object: Readable text stream.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.zst'):
+        import zstandard  # Optional dependency, only needed for zstd input
+        return zstandard.open(path, 'r', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def iter_items(path):
+    """
+    Yield the video resources stored in one raw landing file.
+
+    Args:
+        path (str): Raw file path (`.json` response or `.jsonl` one video per line).
+
+    Yields:
+        dict: One `youtube#video` resource.
+    """
+    with open_raw_file(path) as f:
+        if path.endswith('.json'):
+            # Whole API response in one document (a single region, so it stays small)
+            yield from (json.load(f).get('items') or [])
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line).get('item') or {}
+
+def to_long(value):
+    """
+    Cast an API count (sent as a string) to int, mirroring Spark's `cast("long")`.
+
+    Args:
+        value: Raw value from the `statistics` object.
+
+    Returns:
+        int or None: Parsed count, or None if missing/unparseable.
+    """
+    try:
+        return int(str(value).strip()) if value is not None else None
+    except ValueError:
+        return None
+
+def to_timestamp(value):
+    """
+    Parse an API timestamp ('2025-08-28T16:00:07Z') into a naive UTC datetime,
+    mirroring Spark's `to_timestamp(..., "yyyy-MM-dd'T'HH:mm:ssX")`.
+
+    Args:
+        value (str or None): Raw `publishedAt` value.
+
+    Returns:
+        datetime or None: Parsed timestamp, or None if missing/unparseable.
+    """
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ') if value is not None else None
+    except ValueError:
+        return None
+
+def duration_seconds(value):
+    """
+    Convert an ISO 8601 duration ('PT1H2M30S', 'P1DT2H') into seconds, mirroring
+    the Spark job's `regexp_extract` on `DURATION_PATTERN` (missing parts count as 0).
+
+    Args:
+        value (str or None): Raw `contentDetails.duration` value.
+
+    Returns:
+        int or None: Total seconds, or None if the duration is missing.
+    """
+    if value is None:
+        return None
+    match = re.search(DURATION_PATTERN, value)
+    parts = match.groups() if match else (None,) * 4
+    return sum(int(part or 0) * unit for part, unit in zip(parts, DURATION_UNITS))
+
+def flatten_item(item, load_ts):
+    """
+    Flatten one video resource into an output row.
+
+    Args:
+        item (dict): `youtube#video` resource.
+        load_ts (datetime): Run timestamp shared by all rows (like Spark's current_timestamp()).
+
+    Returns:
+        dict: Row keyed by output column name.
+    """
+    snippet = item.get('snippet') or {}
+    details = item.get('contentDetails') or {}
+    stats = item.get('statistics') or {}
+    blocked = (details.get('regionRestriction') or {}).get('blocked')
+
+    return {
+        # Video-level metadata
+        "video_id": item.get('id'),
+
+        # Snippet fields
+        "published_at": to_timestamp(snippet.get('publishedAt')),
+        "channel_id": snippet.get('channelId'),
+        "title": snippet.get('title'),
+        "description": snippet.get('description'),
+        "channel_title": snippet.get('channelTitle'),
+        "category_id": snippet.get('categoryId'),
+        "live_broadcast_content": snippet.get('liveBroadcastContent'),
+        "default_language": snippet.get('defaultLanguage'),
+        "default_audio_language": snippet.get('defaultAudioLanguage'),
+        "tags": snippet.get('tags'),
+
+        # Content details
+        "duration_seconds": duration_seconds(details.get('duration')),
+        "dimension": details.get('dimension'),
+        "definition": details.get('definition'),
+        "caption": details.get('caption'),
+        "licensed_content": details.get('licensedContent'),
+
+        # Statistics (casted to long for numeric consistency)
+        "view_count": to_long(stats.get('viewCount')),
+        "like_count": to_long(stats.get('likeCount')),
+        "favorite_count": to_long(stats.get('favoriteCount')),
+        "comment_count": to_long(stats.get('commentCount')),
+
+        # Region restriction (blocked countries)
+        "blocked_countries": blocked,
+
+        # Metadata: load timestamp (country is written as the partition directory)
+        "load_ts": load_ts
+    }
+
+def hash_text(value):
+    """
+    Render one dimension value as text for the content hash (see `common/layout.py`).
+
+    Args:
+        value: Flattened value (str, int, bool, datetime, list or None).
+
+    Returns:
+        str: Canonical text, matching the Spark job's `content_hash` column.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, datetime):
+        return str(calendar.timegm(value.timetuple()))  # Epoch seconds, like unix_timestamp()
+    if isinstance(value, list):
+        return LIST_SEPARATOR.join(v for v in value if v is not None)
+    return str(value)
+
+def video_row(row):
+    """
+    Build the video dimension row of a flattened row, with its content hash.
+
+    Args:
+        row (dict): Output of `flatten_item`.
+
+    Returns:
+        dict: Row keyed by `VIDEO_SCHEMA` column name.
+    """
+    text = HASH_SEPARATOR.join(hash_text(row[name]) for name in VIDEO_COLUMNS[1:])
+    video = {name: row[name] for name in VIDEO_COLUMNS}
+    video['content_hash'] = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    video['load_ts'] = row['load_ts']
+    return video
+
+def write_aggregate(rows, schema, dataset_dir, region=None):
+    """
+    Write one aggregate table as a single Parquet file.
+
+    Args:
+        rows (list): Rows keyed by the schema's column names.
+        schema (pyarrow.Schema): Aggregate schema.
+        dataset_dir (str): Staging dataset directory.
+        region (str, optional): Write into the region's `country=XX/` partition.
+    """
+    if region is not None:
+        dataset_dir = os.path.join(dataset_dir, f'country={region}')
+    os.makedirs(dataset_dir, exist_ok=True)
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema),
+                   os.path.join(dataset_dir, f'part-00000-{uuid.uuid4()}.c000.snappy.parquet'),
+                   compression='snappy', use_deprecated_int96_timestamps=True)
+
+def write_region_aggregates(counters, aggregate_dirs, region):
+    """
+    Write a region's tag and blocked-country counts into their staging datasets.
+
+    Args:
+        counters (RegionCounters): Counters fed with the region's rows.
+        aggregate_dirs (dict): Aggregate name → staging dataset directory.
+        region (str): Region code.
+    """
+    for name, rows in ((TAG_COUNTS, counters.tag_rows()), (BLOCKED_COUNTS, counters.blocked_rows())):
+        if rows:  # Like Spark's groupBy, a region with nothing to count gets no partition
+            write_aggregate(rows, AGGREGATE_SCHEMAS[name], aggregate_dirs[name], region)
+
+def flatten_region(path, staging_dir, load_ts, videos=None, aggregate_dirs=None):
+    """
+    Stream one region's raw file into its `country=XX/` Parquet partition.
+
+    Args:
+        path (str): Raw landing file for the region.
+        staging_dir (str): Dataset directory being written by this run.
+        load_ts (datetime): Run timestamp shared by all rows.
+        videos (dict, optional): Normalized layout only: video_id → (region, dimension row)
+            collected across the run's regions; the partition then holds fact rows.
+        aggregate_dirs (dict, optional): Aggregate name → staging dataset directory;
+            the region's tags and blocked countries are counted as its rows stream by.
+
+    Returns:
+        int: Number of rows written.
+    """
+    schema = FLAT_SCHEMA if videos is None else FACT_SCHEMA
+    region = region_from_path(path)
+    partition_dir = os.path.join(staging_dir, f'country={region}')
+    os.makedirs(partition_dir, exist_ok=True)
+    part_file = os.path.join(partition_dir, f'part-00000-{uuid.uuid4()}.c000.snappy.parquet')
+
+    rows = 0
+    batch = []
+    counters = RegionCounters()
+    start = time.perf_counter()
+    write_seconds = 0.0  # Time spent encoding/writing Parquet (the rest is read + flatten)
+    # INT96 timestamps match what Spark writes, so both engines load identically downstream
+    with pq.ParquetWriter(part_file, schema, compression='snappy',
+                          use_deprecated_int96_timestamps=True) as writer:
+        for rank, item in enumerate(iter_items(path), start=1):
+            row = flatten_item(item, load_ts)
+            if videos is not None:
+                row['trending_rank'] = rank  # Position in the region's trending list
+                current = videos.get(row['video_id'])
+                if current is None or region < current[0]:
+                    videos[row['video_id']] = (region, video_row(row))  # First region wins, like Spark
+            counters.add(row)
+            batch.append(row)  # Only the schema's columns are written
+            if len(batch) >= BATCH_SIZE:
+                write_start = time.perf_counter()
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                write_seconds += time.perf_counter() - write_start
+                rows += len(batch)
+                batch = []
+        write_start = time.perf_counter()
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            rows += len(batch)
+    write_seconds += time.perf_counter() - write_start  # Includes the footer written on close
+    if aggregate_dirs is not None:
+        write_region_aggregates(counters, aggregate_dirs, region)
+
+    metrics.record('flatten', 'arrow_region', region=region,
+                   seconds=round(time.perf_counter() - start, 6), write_seconds=round(write_seconds, 6),
+                   rows=rows, read_bytes=os.path.getsize(path), bytes=os.path.getsize(part_file))
+    if rows == 0:
+        shutil.rmtree(partition_dir)  # Spark writes no partition for a region without videos
+    return rows
+
+def pending_videos_dir(run_date, videos_root=VIDEOS_ROOT):
+    """
+    Folder of the video parts staged by streamed single-region runs, waiting to
+    be merged into the day's dimension (the underscore hides it from readers).
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        videos_root (str): Root of the video dimension datasets.
+
+    Returns:
+        str: e.g. `data/videos/_pending_2025_08_28`.
+    """
+    return os.path.join(videos_root, f'_pending_{run_date}')
+
+def write_videos(table, dataset_dir, name):
+    """
+    Write video dimension rows as one Parquet file (INT96 timestamps, like Spark).
+
+    Args:
+        table (pyarrow.Table): Rows in `VIDEO_SCHEMA`.
+        dataset_dir (str): Folder to write into (created if missing).
+        name (str): File name.
+    """
+    os.makedirs(dataset_dir, exist_ok=True)
+    pq.write_table(table, os.path.join(dataset_dir, name),
+                   compression='snappy', use_deprecated_int96_timestamps=True)
+
+def stage_videos(videos, run_date, load_ts, videos_root=VIDEOS_ROOT):
+    """
+    Park a streamed region's video rows until the day's whole-day run merges them.
+
+    Parts are named by load time, so merging them in name order keeps the latest fetch.
+
+    Args:
+        videos (dict): video_id → (region, dimension row) collected by `flatten_region`.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        load_ts (datetime): Load time of this run.
+        videos_root (str): Root of the video dimension datasets.
+    """
+    rows = [row for _, (_, row) in sorted(videos.items())]
+    table = pa.Table.from_pylist(rows, schema=VIDEO_SCHEMA)
+    write_videos(table, pending_videos_dir(run_date, videos_root),
+                 f"{load_ts.strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet")
+
+def commit_videos(videos, run_date, videos_root=VIDEOS_ROOT):
+    """
+    Merge this run's video rows into the day's video dimension and publish it atomically.
+
+    Videos fetched by this run replace their existing row (latest fetch wins), after
+    the parts staged by streamed regions (`stage_videos`), which are then dropped;
+    videos of regions not re-flattened are kept.
+
+    Args:
+        videos (dict): video_id → (region, dimension row) collected by `flatten_region`.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        videos_root (str): Root of the video dimension datasets.
+
+    Returns:
+        int: Number of videos in the dimension.
+    """
+    output_dir = videos_dir(run_date, videos_root)
+    pending_dir = pending_videos_dir(run_date, videos_root)
+    rows = {}
+    sources = [output_dir] if os.path.exists(output_dir) else []
+    sources += sorted(glob.glob(os.path.join(pending_dir, '*.parquet')))
+    for source in sources:  # Oldest first: later rows replace earlier ones
+        existing = pq.read_table(source, schema=VIDEO_SCHEMA, coerce_int96_timestamp_unit='us')
+        rows.update((row['video_id'], row) for row in existing.to_pylist())
+    rows.update((video_id, row) for video_id, (_, row) in videos.items())
+
+    table = pa.Table.from_pylist([rows[key] for key in sorted(rows)], schema=VIDEO_SCHEMA)
+    staging_dir = new_staging_dir(videos_root, run_date)
+    try:
+        write_videos(table, staging_dir, f'part-00000-{uuid.uuid4()}.c000.snappy.parquet')
+        open(os.path.join(staging_dir, '_SUCCESS'), 'w').close()
+        commit_output(staging_dir, output_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    shutil.rmtree(pending_dir, ignore_errors=True)
+    return table.num_rows
+
+def commit_blocking_counts(run_date, source_dir, aggregates_root=AGGREGATES_ROOT):
+    """
+    Rebuild the day's global blocking counts from its published videos and publish them atomically.
+
+    Only `video_id` and `blocked_countries` are read (column projection), so this
+    stays cheap however many regions the day has.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        source_dir (str): Published day holding every video of the day: the wide
+            rows, or the video dimension in the normalized layout.
+        aggregates_root (str): Root of the aggregate datasets.
+
+    Returns:
+        int: Number of blocking countries.
+    """
+    videos = []
+    if os.path.exists(source_dir):
+        table = pq.read_table(source_dir, columns=['video_id', 'blocked_countries'])
+        videos = zip(table.column('video_id').to_pylist(), table.column('blocked_countries').to_pylist())
+    rows = blocking_rows(videos)
+
+    staging_dir = new_staging_dir(os.path.join(aggregates_root, BLOCKING_COUNTS), run_date)
+    try:
+        write_aggregate(rows, BLOCKING_COUNT_SCHEMA, staging_dir)
+        publish_day(staging_dir, aggregate_dir(BLOCKING_COUNTS, run_date, aggregates_root), [], full=True)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return len(rows)
+
+def flatten_day(run_date, raw_root='data/raw', processed_root=None,
+                force=False, manifest_root=MANIFEST_ROOT, raw_paths=None,
+                layout=LAYOUT, videos_root=VIDEOS_ROOT, aggregates_root=AGGREGATES_ROOT):
+    """
+    Flatten all (changed) regions for one date in-process, one region at a time.
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        raw_root (str): Root folder of the raw landing files.
+        processed_root (str, optional): Root folder of the per-region datasets
+            (default: `data/processed`, or the trending fact root when normalized).
+        force (bool): Rebuild every region even if the manifest says it is unchanged.
+        manifest_root (str or None): Folder of the per-date manifests (None disables it).
+        raw_paths (list, optional): Only consider these raw files (e.g. a region that
+            just landed); their partitions are merged into the day's dataset.
+        layout (str): 'wide' rows, or 'normalized' facts + video dimension.
+        videos_root (str): Root of the video dimension datasets (normalized layout).
+        aggregates_root (str): Root of the tag / blocking aggregate datasets.
+
+    Returns:
+        str or None: Output dataset path, or None if there was nothing to process.
+    """
+    processed_root = processed_root or output_root(layout)
+    normalized = layout == 'normalized'
+    raw_dir = os.path.join(raw_root, run_date)
+    output_dir = os.path.join(processed_root, run_date)
+    manifest = Manifest(run_date, manifest_root) if manifest_root else None
+    pending_dir = pending_videos_dir(run_date, videos_root)
+    if normalized and not os.path.exists(videos_dir(run_date, videos_root)) and not os.path.exists(pending_dir):
+        force = True  # The dimension is built from every region of the day
+    if not os.path.exists(aggregate_dir(TAG_COUNTS, run_date, aggregates_root)):
+        force = True  # Day flattened before the aggregates existed: count every region
+    # Every video of the day, read back for the global blocking counts
+    day_videos_dir = videos_dir(run_date, videos_root) if normalized else output_dir
+    blocking_dir = aggregate_dir(BLOCKING_COUNTS, run_date, aggregates_root)
+
+    jsonl_paths, json_paths = list_raw_files(raw_dir)
+    if raw_paths is not None:
+        jsonl_paths, json_paths = [], list(raw_paths)  # Flattened the same way, one file per region
+    if not jsonl_paths and not json_paths:
+        print(f'No raw data found in {raw_dir}, nothing to do')
+        return None
+
+    # Only regions whose raw file changed since the last flatten are processed
+    changed, full = plan_regions(jsonl_paths + json_paths, output_dir, manifest, force)
+    if raw_paths is not None and os.path.exists(output_dir):
+        full = False  # A subset of regions never replaces the whole day
+    if not changed:
+        if raw_paths is None and normalized and os.path.exists(pending_dir):
+            count = commit_videos({}, run_date, videos_root)  # Merge the streamed regions once
+            print(f"Video dimension {videos_dir(run_date, videos_root)}: {count} videos")
+        if raw_paths is None and not os.path.exists(blocking_dir):
+            commit_blocking_counts(run_date, day_videos_dir, aggregates_root)  # After streamed regions
+        print(f'All regions in {raw_dir} unchanged since last flatten, nothing to do')
+        return output_dir
+    print(f'Reading {len(changed)} raw files from {raw_dir} (arrow engine)')
+
+    # One timestamp for the whole run, stored as naive UTC like Spark's current_timestamp()
+    load_ts = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    videos = {} if normalized else None
+    regions = [region for _, region, _ in changed]
+    staging_dir = new_staging_dir(processed_root, run_date)
+    aggregate_dirs = {name: new_staging_dir(os.path.join(aggregates_root, name), run_date)
+                      for name in REGION_AGGREGATES}
+    os.makedirs(staging_dir)
+    try:
+        total = sum(flatten_region(path, staging_dir, load_ts, videos, aggregate_dirs)
+                    for path, _, _ in changed)
+        # Same completion marker as Spark on a full day; the aggregates follow their rows
+        publish_day(staging_dir, output_dir, regions, full)
+        for name, aggregate_staging in aggregate_dirs.items():
+            publish_day(aggregate_staging, aggregate_dir(name, run_date, aggregates_root), regions, full)
+    finally:
+        for directory in [staging_dir, *aggregate_dirs.values()]:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if normalized and raw_paths is not None:
+        # Streamed region: staged for the whole-day run instead of rewriting the dimension
+        stage_videos(videos, run_date, load_ts, videos_root)
+    elif normalized:
+        count = commit_videos(videos, run_date, videos_root)
+        print(f"Video dimension {videos_dir(run_date, videos_root)}: {count} videos "
+              f"({len(videos)} from this run)")
+    if raw_paths is None:
+        count = commit_blocking_counts(run_date, day_videos_dir, aggregates_root)
+        print(f"Blocking counts {blocking_dir}: {count} blocking countries")
+    else:
+        shutil.rmtree(blocking_dir, ignore_errors=True)  # Stale until the day's whole-day flatten
+    record_regions(manifest, changed, output_dir)
+    print(f"Flattened {total} rows from {len(changed)} regions saved to {output_dir}")
+    return output_dir
+
+def aggregate_day(run_date, processed_root=None, layout=LAYOUT, videos_root=VIDEOS_ROOT,
+                  aggregates_root=AGGREGATES_ROOT):
+    """
+    Rebuild a day's aggregates from its published Parquet, for days flattened
+    before the aggregates existed (the raw files are not read again).
+
+    Args:
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        processed_root (str, optional): Root folder of the per-region datasets.
+        layout (str): 'wide' rows, or 'normalized' facts + video dimension.
+        videos_root (str): Root of the video dimension datasets (normalized layout).
+        aggregates_root (str): Root of the tag / blocking aggregate datasets.
+
+    Returns:
+        str or None: The day's tag counts path, or None if the day was not flattened.
+    """
+    processed_root = processed_root or output_root(layout)
+    output_dir = os.path.join(processed_root, run_date)
+    if not os.path.exists(output_dir):
+        print(f'No processed data in {output_dir}, nothing to do')
+        return None
+
+    # Normalized facts only hold the video id: tags and blocked countries come from the dimension
+    dimension = None
+    columns = ['video_id', 'tags', 'blocked_countries', 'load_ts']
+    if layout == 'normalized':
+        table = pq.read_table(videos_dir(run_date, videos_root), columns=columns[:3])
+        dimension = {row['video_id']: row for row in table.to_pylist()}
+        columns = ['video_id', 'load_ts']
+
+    regions = []
+    aggregate_dirs = {name: new_staging_dir(os.path.join(aggregates_root, name), run_date)
+                      for name in REGION_AGGREGATES}
+    try:
+        for partition_dir in sorted(glob.glob(os.path.join(output_dir, 'country=*'))):
+            region = os.path.basename(partition_dir).split('=', 1)[1]
+            counters = RegionCounters()
+            table = pq.read_table(partition_dir, columns=columns, coerce_int96_timestamp_unit='us')
+            for batch in table.to_batches(max_chunksize=BATCH_SIZE):
+                for row in batch.to_pylist():
+                    if dimension is not None:
+                        video = dimension.get(row['video_id'], {})
+                        row['tags'], row['blocked_countries'] = video.get('tags'), video.get('blocked_countries')
+                    counters.add(row)
+            write_region_aggregates(counters, aggregate_dirs, region)
+            regions.append(region)
+        for name, aggregate_staging in aggregate_dirs.items():
+            publish_day(aggregate_staging, aggregate_dir(name, run_date, aggregates_root), regions, full=True)
+    finally:
+        for directory in aggregate_dirs.values():
+            shutil.rmtree(directory, ignore_errors=True)
+
+    day_videos_dir = videos_dir(run_date, videos_root) if layout == 'normalized' else output_dir
+    count = commit_blocking_counts(run_date, day_videos_dir, aggregates_root)
+    print(f"Rebuilt the aggregates of {len(regions)} regions and {count} blocking countries "
+          f"for {run_date} from {output_dir}")
+    return aggregate_dir(TAG_COUNTS, run_date, aggregates_root)
+
+def flatten_days(run_dates, workers=BACKFILL_WORKERS, **kwargs):
+    """
+    Flatten several dates, each day in its own worker process.
+
+    Days are independent (own raw folder, output folder and manifest), so a
+    backfill runs as many days at once as there are cores instead of one after
+    the other.
+
+    Args:
+        run_dates (list): Date folder names in YYYY_MM_DD format.
+        workers (int): Maximum concurrent days (0 = CPU core count).
+        **kwargs: Options passed to `flatten_day` (force, layout, ...).
+
+    Returns:
+        dict: Run date → output dataset path (None when there was nothing to process).
+    """
+    if len(run_dates) == 1:
+        return {run_dates[0]: flatten_day(run_dates[0], **kwargs)}
+    workers = min(len(run_dates), workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {run_date: executor.submit(flatten_day, run_date, **kwargs) for run_date in run_dates}
+        return {run_date: future.result() for run_date, future in futures.items()}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Flatten raw YouTube trending data with PyArrow.")
+    parser.add_argument("--force", action="store_true",
+                        help="reprocess every region, ignoring the content-hash manifest")
+    parser.add_argument("--layout", choices=LAYOUTS, default=LAYOUT,
+                        help="wide rows, or normalized facts + video dimension")
+    parser.add_argument("--aggregates-only", action="store_true",
+                        help="only rebuild the tag / blocking aggregates from the published Parquet")
+    add_date_arguments(parser)
+    args = parser.parse_args()
+
+    # Date folders to process: today, --date, or the --start/--end backfill range
+    if args.aggregates_only:
+        for run_date in selected_dates(args):
+            aggregate_day(run_date, layout=args.layout)
+    else:
+        flatten_days(selected_dates(args), force=args.force, layout=args.layout)
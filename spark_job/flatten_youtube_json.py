@@ -6,81 +6,195 @@ and transforms it into a flattened, structured format (Parquet files).
 
 Steps Performed:
 1. Initialize Spark session for distributed processing.
-2. Define a list of regions (ISO country codes) for which trending data is available.
-3. Loop through each region and:
-   - Read raw JSON data from `data/raw/{today}/`.
-   - Explode and flatten nested JSON fields such as snippet, statistics, and contentDetails.
-   - Extract key attributes: video metadata, channel info, tags, statistics, 
-     blocked countries (region restrictions), and additional metadata like load timestamp and country.
-4. Save the transformed dataset as a Parquet file in `data/processed/{today}/`
-   with one file per region (e.g., `US_trending_YYYY_MM_DD.parquet`).
-5. Ensure single-file output per region by writing to a temp directory, renaming, 
-   and moving the part file to the target path.
+2. Read every raw file in `data/raw/{today}/` (or in every day of a backfill
+   range, `--start`/`--end`) in a single pass, either the
+   pretty-printed API responses (`.json`, read in multiline mode) or
+   newline-delimited JSON (`.jsonl`, optionally `.gz`/`.zst` compressed,
+   one video per line). The country code is taken from each file's name.
+   Files are read with the declared, versioned schema in `youtube_schema.py`
+   (no schema-inference pass); unknown fields are handled by the
+   `schema_policy` set in the `[FLATTEN]` section of `config.cfg`.
+3. Explode and flatten nested JSON fields such as snippet, statistics, and contentDetails.
+   Extract key attributes: video metadata, channel info, tags, statistics,
+   blocked countries (region restrictions), and additional metadata like load timestamp and country.
+   Values are written natively typed, so the warehouse never re-parses them:
+   `published_at` as a timestamp, `duration_seconds` parsed from ISO 8601,
+   `tags` / `blocked_countries` as lists of strings and integer counts.
+4. Save the transformed dataset as one Parquet dataset in `data/processed/{today}/`,
+   partitioned by country (e.g., `country=US/part-*.parquet`), written by all
+   regions in parallel within one Spark job.
+5. Commit atomically: the job writes to a private staging directory unique to
+   this run, which is then renamed into place, so concurrent runs never share
+   a scratch path and readers never see a half-written day.
+6. Skip unchanged regions: the per-date manifest (`data/manifest/YYYY_MM_DD.json`)
+   stores the hash of each raw file and of the partition produced from it; only
+   regions whose raw file (or partition) changed are flattened and swapped in.
+   Pass `--force` to rebuild the whole day.
+   A backfill range is still one Spark job: the changed regions of all days are
+   read, flattened and written together (one task per day and country, bounded
+   by the executor cores), then each day is committed to its own folder.
+7. With `layout = normalized` (`common/layout.py`), write narrow fact rows
+   (counts + trending rank) per country instead, and merge each video's
+   descriptive attributes once into the day's video dimension.
+8. In the same job, count the tags and blocked countries of every country and
+   write the small tag / blocked-country count tables next to the rows
+   (`common/aggregates.py`), then rebuild each day's global blocking counts.
 
 Outcome:
-- Produces clean, analytics-ready parquet datasets for each region, 
+- Produces clean, analytics-ready parquet datasets for each region,
   which can later be loaded into Snowflake or another warehouse.
 
 Author: Shreyash Singh
 """
 
-from pyspark.sql import SparkSession
+from pyspark.sql import SparkSession, Window
 from pyspark.sql.functions import (
-    col, explode, concat_ws, current_timestamp, lit, when,
-    from_json, to_json
+    col, explode, posexplode, current_timestamp, lit, when, coalesce,
+    input_file_name, regexp_extract, to_timestamp, monotonically_increasing_id,
+    row_number, array_join, unix_timestamp, concat_ws, sha2, trim, count,
+    countDistinct, max as max_
 )
-from datetime import datetime
-from pyspark.sql.types import StructType, ArrayType, StringType
+from pyspark.sql.types import ArrayType, TimestampType
+from youtube_schema import (
+    SCHEMA_VERSION, SCHEMA_POLICIES, RESPONSE_SCHEMA, NDJSON_SCHEMA, unknown_fields
+)
+from landing import (
+    REGION_FROM_PATH, RUN_DATE_FROM_PATH, DURATION_PATTERN, DURATION_UNITS, list_raw_files, new_staging_dir,
+    commit_output, publish_day, plan_regions, record_regions
+)
+from common.manifest import Manifest, MANIFEST_ROOT
+from common.aggregates import (
+    AGGREGATES_ROOT, TAG_COUNTS, BLOCKED_COUNTS, BLOCKING_COUNTS, TAG_COUNT_COLUMNS,
+    BLOCKED_COUNT_COLUMNS, BLOCKING_COUNT_COLUMNS, aggregate_dir
+)
+from common.layout import (
+    LAYOUT, LAYOUTS, VIDEOS_ROOT, FACT_COLUMNS, VIDEO_COLUMNS, HASH_SEPARATOR, LIST_SEPARATOR,
+    output_root, videos_dir
+)
+from common.dates import add_date_arguments, selected_dates
+from common import metrics
 import os
 import shutil
-import glob
-
-# Initialize Spark session
-spark = SparkSession.builder \
-    .appName("YouTubeTrendingETL") \
-    .getOrCreate()
-
-# Current date string for folder and filenames
-today = datetime.today().strftime('%Y_%m_%d')
-
-# List of regions (ISO codes) for trending videos
-REGIONS = [
-    'AR', 'AU', 'AT', 'AZ', 'BH', 'BD', 'BY', 'BE', 'BO', 'BA', 'BR', 'BG', 'CA',
-    'CL', 'CO', 'CR', 'HR', 'CY', 'CZ', 'DK', 'DO', 'EC', 'EG', 'SV', 'EE', 'FI',
-    'FR', 'GE', 'DE', 'GH', 'GR', 'GT', 'HN', 'HK', 'HU', 'IS', 'IN', 'ID', 'IQ',
-    'IE', 'IL', 'IT', 'JM', 'JP', 'JO', 'KZ', 'KE', 'KW', 'LV', 'LB', 'LT', 'LU',
-    'MK', 'MY', 'MX', 'ME', 'MA', 'NP', 'NL', 'NZ', 'NI', 'NG', 'NO', 'OM', 'PK',
-    'PA', 'PY', 'PE', 'PH', 'PL', 'PT', 'PR', 'QA', 'RO', 'RU', 'SA', 'RS', 'SG',
-    'SK', 'SI', 'ZA', 'KR', 'ES', 'LK', 'SE', 'CH', 'TW', 'TZ', 'TH', 'TN', 'TR',
-    'UG', 'UA', 'AE', 'GB', 'US', 'UY', 'VE', 'VN', 'YE', 'ZW'
-]
-
-# Schema for extracting region restrictions (blocked countries)
-region_schema = StructType().add(
-    "regionRestriction", StructType().add("blocked", ArrayType(StringType()))
-)
+import argparse
+import configparser
+
+config = configparser.ConfigParser()
+config.read("config.cfg")
+
+# Flatten engine used when none is given on the command line: spark | arrow
+ENGINE = config.get("FLATTEN", "engine", fallback="spark")
+
+# How to treat API fields missing from the declared schema: ignore | warn | fail
+SCHEMA_POLICY = config.get("FLATTEN", "schema_policy", fallback="ignore")
+
+# Fraction of raw records parsed when checking for schema drift (warn/fail policies)
+SCHEMA_SAMPLING_RATIO = config.getfloat("FLATTEN", "schema_sampling_ratio", fallback=0.1)
+
+# Materialize (cache + count) after read and after explode so each gets its own timing.
+# Off by default: Spark is lazy, so otherwise read and explode are timed inside the write.
+SPARK_STAGE_TIMINGS = config.getboolean("METRICS", "spark_stage_timings", fallback=False)
+
+# API timestamps are UTC ('2025-08-28T16:00:07Z'); X reads the Z as the UTC offset
+PUBLISHED_AT_FORMAT = "yyyy-MM-dd'T'HH:mm:ssX"
+
+def check_schema_drift(spark, jsonl_paths, json_paths, policy=SCHEMA_POLICY):
+    """
+    Apply the schema evolution policy: report (or reject) API fields that the
+    declared schema does not know about. The `ignore` policy skips the check,
+    so no inference pass is paid in normal runs.
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        jsonl_paths (list): Newline-delimited JSON files.
+        json_paths (list): Pretty-printed API response files.
+        policy (str): One of 'ignore', 'warn' or 'fail'.
+
+    Returns:
+        list: Undeclared field paths found (empty when the check is skipped).
+    """
+    if policy not in SCHEMA_POLICIES:
+        raise ValueError(f"Unknown schema_policy '{policy}', expected one of {SCHEMA_POLICIES}")
+    if policy == 'ignore':
+        return []
+
+    unknown = set()
+    if jsonl_paths:
+        inferred = spark.read.option("samplingRatio", SCHEMA_SAMPLING_RATIO).json(jsonl_paths).schema
+        unknown |= set(unknown_fields(inferred, NDJSON_SCHEMA))
+    if json_paths:
+        inferred = spark.read.option("multiline", "true").json(json_paths).schema
+        unknown |= set(unknown_fields(inferred, RESPONSE_SCHEMA))
+
+    if unknown:
+        message = f"Raw data has fields not in schema v{SCHEMA_VERSION}: {', '.join(sorted(unknown))}"
+        if policy == 'fail':
+            raise ValueError(message)
+        print(f"WARNING: {message} (ignored)")
+    return sorted(unknown)
 
-# Process each region's raw data
-for region in REGIONS:
-    input_path = f'data/raw/{today}/{region}_trending_{today}.json'
-    output_dir = f'data/processed/{today}/'
-    file_name = f'{region}_trending_{today}.parquet'
-    output_path = os.path.join(output_dir, file_name)
-
-    # Read raw JSON file
-    print(f'Reading {input_path}')
-    raw_df = spark.read.option("multiline", "true").json(input_path)
-    
-    # Explode items array into separate rows
-    items_df = raw_df.select(explode(col("items")).alias("item"))
-
-    # Flatten nested fields into tabular structure
-    flat_df = items_df.select(
+def read_items(spark, jsonl_paths, json_paths):
+    """
+    Read raw files of both formats in one pass each into a DataFrame of
+    `item` structs (one row per video) tagged with the source file path and
+    an ordering `position` (the order of the videos within each file).
+    The declared schema is applied, so Spark does not infer it and silently
+    drops fields it does not declare.
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        jsonl_paths (list): Newline-delimited JSON files (one video per line).
+        json_paths (list): Pretty-printed API response files.
+
+    Returns:
+        list: DataFrames with `item`, `source_file` and `position` columns (one per format present).
+    """
+    frames = []
+    if jsonl_paths:
+        # Newline-delimited: already one video per line (compression is detected from the suffix);
+        # ids increase with the line order within a file
+        raw_df = spark.read.schema(NDJSON_SCHEMA).json(jsonl_paths)
+        frames.append(raw_df.select(col("item"), input_file_name().alias("source_file"),
+                                    monotonically_increasing_id().alias("position")))
+    if json_paths:
+        # Whole API response per file: explode items array into rows, keeping their index
+        raw_df = spark.read.schema(RESPONSE_SCHEMA).option("multiline", "true").json(json_paths)
+        frames.append(raw_df.select(posexplode(col("items")).alias("position", "item"),
+                                    input_file_name().alias("source_file")))
+    return frames
+
+def duration_seconds(duration_col):
+    """
+    Convert an ISO 8601 duration column ('PT1H2M30S') into total seconds.
+
+    Args:
+        duration_col (Column): Raw `contentDetails.duration` strings.
+
+    Returns:
+        Column: Long seconds (missing parts count as 0; null when the duration is null).
+    """
+    total = lit(0)
+    for group, unit in enumerate(DURATION_UNITS, start=1):
+        part = regexp_extract(duration_col, DURATION_PATTERN, group)
+        total = total + coalesce(part.cast("long"), lit(0)) * unit  # '' (no match) casts to null
+    return when(duration_col.isNotNull(), total)
+
+def flatten_items(items_df, rank=False):
+    """
+    Flatten nested video `item` structs into the tabular output schema.
+
+    Args:
+        items_df (DataFrame): Rows with an `item` struct, its `source_file` and `position`.
+        rank (bool): Add `trending_rank`, the video's position in its region's list (1 = top).
+
+    Returns:
+        DataFrame: One row per video with the flattened columns.
+    """
+    columns = [
         # Video-level metadata
         col("item.id").alias("video_id"),
 
         # Snippet fields
-        col("item.snippet.publishedAt").alias("published_at"),
+        to_timestamp(col("item.snippet.publishedAt"), PUBLISHED_AT_FORMAT).alias("published_at"),
         col("item.snippet.channelId").alias("channel_id"),
         col("item.snippet.title").alias("title"),
         col("item.snippet.description").alias("description"),
@@ -89,10 +203,10 @@ for region in REGIONS:
         col("item.snippet.liveBroadcastContent").alias("live_broadcast_content"),
         col("item.snippet.defaultLanguage").alias("default_language"),
         col("item.snippet.defaultAudioLanguage").alias("default_audio_language"),
-        concat_ws(", ", col("item.snippet.tags")).alias("tags"),  # Join tags array into string
+        col("item.snippet.tags").alias("tags"),  # Kept as an array (Parquet LIST)
 
         # Content details
-        col("item.contentDetails.duration").alias("duration"),
+        duration_seconds(col("item.contentDetails.duration")).alias("duration_seconds"),
         col("item.contentDetails.dimension").alias("dimension"),
         col("item.contentDetails.definition").alias("definition"),
         col("item.contentDetails.caption").alias("caption"),
@@ -104,30 +218,328 @@ for region in REGIONS:
         col("item.statistics.favoriteCount").cast("long").alias("favorite_count"),
         col("item.statistics.commentCount").cast("long").alias("comment_count"),
 
-        # Region restriction (blocked countries)
-        when(
-            from_json(to_json(col("item.contentDetails")), region_schema)["regionRestriction"]["blocked"].isNotNull(),
-            concat_ws(",", from_json(to_json(col("item.contentDetails")), region_schema)["regionRestriction"]["blocked"])
-        ).otherwise(lit(None)).alias("blocked_countries"),
+        # Region restriction (blocked countries), read straight from the typed struct as an array
+        col("item.contentDetails.regionRestriction.blocked").alias("blocked_countries"),
 
-        # Metadata: load timestamp and country code
+        # Metadata: load timestamp and country code (taken from the raw file name)
         current_timestamp().alias("load_ts"),
-        lit(region).alias("country")
-    )
-
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Write flattened data to a temporary parquet folder
-    flat_df.coalesce(1).write.mode("overwrite").parquet("/tmp/temp_parquet")
-    
-    # Locate the actual parquet part file
-    part_file = glob.glob("/tmp/temp_parquet/part-*.parquet")[0]
-
-    # Move parquet file to the final destination with proper name
-    shutil.move(part_file, output_path)
-    
-    # Clean up temporary folder
-    shutil.rmtree("/tmp/temp_parquet")
-    
-    print(f"Flattened data saved to {output_path}")
+        regexp_extract(col("source_file"), REGION_FROM_PATH, 1).alias("country"),
+
+        # Run date of the raw folder (partition column of the output, not stored in the files)
+        regexp_extract(col("source_file"), RUN_DATE_FROM_PATH, 1).alias("run_date")
+    ]
+    if rank:
+        in_file_order = Window.partitionBy("source_file").orderBy("position")
+        columns.append(row_number().over(in_file_order).alias("trending_rank"))
+    return items_df.select(*columns)
+
+def content_hash(flat_df):
+    """
+    Hash of a video's descriptive attributes, computed like the arrow engine's
+    (see `common/layout.py`): lists joined, timestamps as epoch seconds, nulls as ''.
+
+    Args:
+        flat_df (DataFrame): Flattened rows.
+
+    Returns:
+        Column: Hex SHA-256 string.
+    """
+    parts = []
+    for name in VIDEO_COLUMNS[1:]:
+        data_type = flat_df.schema[name].dataType
+        if isinstance(data_type, ArrayType):
+            value = array_join(col(name), LIST_SEPARATOR)
+        elif isinstance(data_type, TimestampType):
+            value = unix_timestamp(col(name))
+        else:
+            value = col(name)
+        parts.append(coalesce(value.cast("string"), lit("")))
+    return sha2(concat_ws(HASH_SEPARATOR, *parts), 256)
+
+def commit_videos(spark, flat_df, run_date, videos_root=VIDEOS_ROOT):
+    """
+    Merge the run's videos into the day's video dimension and publish it atomically.
+
+    Each video keeps the row of its first region (by country code); videos
+    fetched by this run replace their existing row, others are kept.
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        flat_df (DataFrame): Flattened rows of this run.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        videos_root (str): Root of the video dimension datasets.
+
+    Returns:
+        str: Video dimension path.
+    """
+    output_dir = videos_dir(run_date, videos_root)
+    first_region = Window.partitionBy("video_id").orderBy("country")
+    videos_df = flat_df.withColumn("_region_rank", row_number().over(first_region)) \
+        .filter(col("_region_rank") == 1) \
+        .select(*VIDEO_COLUMNS, content_hash(flat_df).alias("content_hash"), "load_ts") \
+        .withColumn("_latest", lit(1))
+    if os.path.exists(output_dir):
+        existing_df = spark.read.parquet(output_dir).withColumn("_latest", lit(0))
+        latest_first = Window.partitionBy("video_id").orderBy(col("_latest").desc())
+        videos_df = videos_df.unionByName(existing_df) \
+            .withColumn("_version", row_number().over(latest_first)) \
+            .filter(col("_version") == 1) \
+            .drop("_version")
+
+    staging_dir = new_staging_dir(videos_root, run_date)
+    os.makedirs(videos_root, exist_ok=True)
+    try:
+        # One small file per day, sorted by video_id
+        with metrics.timer('flatten', 'spark_videos') as fields:
+            videos_df.drop("_latest").repartition(1).sortWithinPartitions("video_id") \
+                .write.mode("overwrite").parquet(staging_dir)
+            fields['bytes'] = metrics.dir_bytes(staging_dir)
+        commit_output(staging_dir, output_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return output_dir
+
+def trimmed_values(df, array_name, alias, *columns):
+    """
+    Explode an array column into trimmed, non-empty values (see `common/aggregates.py`).
+
+    Args:
+        df (DataFrame): Flattened rows.
+        array_name (str): `tags` or `blocked_countries`.
+        alias (str): Name of the exploded value column.
+        *columns (str): Columns kept next to each value.
+
+    Returns:
+        DataFrame: One row per non-blank value.
+    """
+    values_df = df.select(*columns, explode(col(array_name)).alias(alias)) \
+        .withColumn(alias, trim(col(alias)))
+    return values_df.filter(col(alias).isNotNull() & (col(alias) != ""))
+
+def region_aggregates(flat_df):
+    """
+    Count the tags and blocked countries of every (day, country) of the run.
+
+    Args:
+        flat_df (DataFrame): Flattened rows with `run_date` and `country`.
+
+    Returns:
+        dict: Aggregate name → DataFrame with its columns plus `run_date` and `country`.
+    """
+    keys = ["run_date", "country"]
+    tags_df = trimmed_values(flat_df, "tags", "tag", *keys, "load_ts") \
+        .groupBy(*keys, "tag") \
+        .agg(count(lit(1)).alias("tag_count"), max_("load_ts").alias("load_ts"))
+
+    # Distinct videos per blocking country, plus the total row (null blocked_country)
+    pairs_df = trimmed_values(flat_df, "blocked_countries", "blocked_country", *keys, "video_id", "load_ts")
+    per_country_df = pairs_df.groupBy(*keys, "blocked_country") \
+        .agg(countDistinct("video_id").alias("video_count"), max_("load_ts").alias("load_ts"))
+    totals_df = pairs_df.groupBy(*keys) \
+        .agg(countDistinct("video_id").alias("video_count"), max_("load_ts").alias("load_ts")) \
+        .withColumn("blocked_country", lit(None).cast("string"))
+
+    return {
+        TAG_COUNTS: tags_df.select(*TAG_COUNT_COLUMNS, *keys),
+        BLOCKED_COUNTS: per_country_df.unionByName(totals_df).select(*BLOCKED_COUNT_COLUMNS, *keys)
+    }
+
+def commit_blocking_counts(spark, run_date, source_dir, aggregates_root=AGGREGATES_ROOT):
+    """
+    Rebuild the day's global blocking counts from its published videos and publish them atomically.
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        source_dir (str): Published day holding every video of the day: the wide
+            rows, or the video dimension in the normalized layout.
+        aggregates_root (str): Root of the aggregate datasets.
+
+    Returns:
+        str: Blocking counts path.
+    """
+    output_dir = aggregate_dir(BLOCKING_COUNTS, run_date, aggregates_root)
+    root = os.path.dirname(output_dir)
+    staging_dir = new_staging_dir(root, run_date)
+    os.makedirs(root, exist_ok=True)
+    try:
+        # Only video_id and blocked_countries are read; a video trending in several countries counts once
+        videos_df = spark.read.parquet(source_dir).select("video_id", "blocked_countries")
+        blocking_df = trimmed_values(videos_df, "blocked_countries", "blocked_country", "video_id") \
+            .groupBy("blocked_country") \
+            .agg(countDistinct("video_id").alias("video_count")) \
+            .select(*BLOCKING_COUNT_COLUMNS)
+        blocking_df.repartition(1).sortWithinPartitions("blocked_country") \
+            .write.mode("overwrite").parquet(staging_dir)
+        commit_output(staging_dir, output_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    return output_dir
+
+def flatten_day(spark, run_date, **kwargs):
+    """
+    Flatten all (changed) regions for one date in a single Spark job.
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        run_date (str): Date folder name in YYYY_MM_DD format.
+        **kwargs: Options of `flatten_days` (raw_root, processed_root, force, ...).
+
+    Returns:
+        str or None: Output dataset path, or None if there was nothing to process.
+    """
+    return flatten_days(spark, [run_date], **kwargs).get(run_date)
+
+def flatten_days(spark, run_dates, raw_root='data/raw', processed_root=None,
+                 force=False, manifest_root=MANIFEST_ROOT, layout=LAYOUT, videos_root=VIDEOS_ROOT,
+                 aggregates_root=AGGREGATES_ROOT):
+    """
+    Flatten all (changed) regions of one or more dates in a single Spark job.
+
+    Args:
+        spark (SparkSession): Active Spark session.
+        run_dates (list): Date folder names in YYYY_MM_DD format.
+        raw_root (str): Root folder of the raw landing files.
+        processed_root (str, optional): Root folder of the per-region datasets
+            (default: `data/processed`, or the trending fact root when normalized).
+        force (bool): Rebuild every region even if the manifest says it is unchanged.
+        manifest_root (str or None): Folder of the per-date manifests (None disables it).
+        layout (str): 'wide' rows, or 'normalized' facts + video dimension.
+        videos_root (str): Root of the video dimension datasets (normalized layout).
+        aggregates_root (str): Root of the tag / blocking aggregate datasets.
+
+    Returns:
+        dict: Run date → output dataset path (dates without raw data are left out).
+    """
+    processed_root = processed_root or output_root(layout)
+    normalized = layout == 'normalized'
+
+    # Plan every day on its own manifest; only regions whose raw file changed are processed
+    outputs, plans = {}, []
+    jsonl_paths, json_paths = [], []
+    for run_date in run_dates:
+        raw_dir = os.path.join(raw_root, run_date)
+        output_dir = os.path.join(processed_root, run_date)
+        manifest = Manifest(run_date, manifest_root) if manifest_root else None
+        # The dimension and the aggregates are built from every region of the day
+        day_force = force or (normalized and not os.path.exists(videos_dir(run_date, videos_root))) \
+            or not os.path.exists(aggregate_dir(TAG_COUNTS, run_date, aggregates_root))
+        day_videos_dir = videos_dir(run_date, videos_root) if normalized else output_dir
+
+        day_jsonl, day_json = list_raw_files(raw_dir)
+        if not day_jsonl and not day_json:
+            print(f'No raw data found in {raw_dir}, nothing to do')
+            continue
+        outputs[run_date] = output_dir
+        changed, full = plan_regions(day_jsonl + day_json, output_dir, manifest, day_force)
+        if not changed:
+            if not os.path.exists(aggregate_dir(BLOCKING_COUNTS, run_date, aggregates_root)):
+                commit_blocking_counts(spark, run_date, day_videos_dir, aggregates_root)  # After streamed regions
+            print(f'All regions in {raw_dir} unchanged since last flatten, nothing to do')
+            continue
+        changed_paths = {path for path, _, _ in changed}
+        jsonl_paths += [path for path in day_jsonl if path in changed_paths]
+        json_paths += [path for path in day_json if path in changed_paths]
+        plans.append((run_date, output_dir, manifest, changed, full, day_videos_dir))
+    if not plans:
+        return outputs
+    changed_files = [entry for plan in plans for entry in plan[3]]
+
+    print(f'Reading {len(changed_files)} raw files from {len(plans)} day(s) in {raw_root} '
+          f'(schema v{SCHEMA_VERSION})')
+    with metrics.timer('flatten', 'schema_check', policy=SCHEMA_POLICY):
+        check_schema_drift(spark, jsonl_paths, json_paths)
+
+    with metrics.timer('flatten', 'spark_read', files=len(changed_files),
+                       bytes=sum(os.path.getsize(path) for path, _, _ in changed_files)) as fields:
+        items_frames = read_items(spark, jsonl_paths, json_paths)
+        if SPARK_STAGE_TIMINGS:
+            items_frames = [items_df.cache() for items_df in items_frames]
+            fields['rows'] = sum(items_df.count() for items_df in items_frames)
+
+    with metrics.timer('flatten', 'spark_explode') as fields:
+        frames = [flatten_items(items_df, rank=normalized) for items_df in items_frames]
+        flat_df = frames[0]
+        for frame in frames[1:]:
+            flat_df = flat_df.unionByName(frame)
+        # Read once, written as rows and as aggregates (and as videos when normalized);
+        # caching also gives every output the same current_timestamp() load_ts
+        flat_df = flat_df.cache()
+        if SPARK_STAGE_TIMINGS:
+            fields['rows'] = flat_df.count()
+    out_df = flat_df.select(*FACT_COLUMNS, "country", "run_date") if normalized else flat_df
+
+    # Private scratch locations for this run only (leading underscore hides them from Parquet readers)
+    label = plans[0][0] if len(plans) == 1 else f'{plans[0][0]}_to_{plans[-1][0]}'
+    staging_dir = new_staging_dir(processed_root, label)
+    aggregate_dfs = region_aggregates(flat_df)
+    aggregate_staging = {name: new_staging_dir(os.path.join(aggregates_root, name), label)
+                         for name in aggregate_dfs}
+    os.makedirs(processed_root, exist_ok=True)
+
+    try:
+        # One task per day and country, all written in parallel, one file per partition
+        with metrics.timer('flatten', 'spark_write', days=len(plans), regions=len(changed_files)) as fields:
+            out_df.repartition(col("run_date"), col("country")) \
+                .write.mode("overwrite") \
+                .partitionBy("run_date", "country") \
+                .parquet(staging_dir)
+            fields['bytes'] = metrics.dir_bytes(staging_dir)
+
+        # The per-country aggregates, partitioned the same way (one small file per partition)
+        with metrics.timer('flatten', 'spark_aggregates', days=len(plans)) as fields:
+            for name, aggregate_df in aggregate_dfs.items():
+                aggregate_df.repartition(col("run_date"), col("country")) \
+                    .write.mode("overwrite") \
+                    .partitionBy("run_date", "country") \
+                    .parquet(aggregate_staging[name])
+            fields['bytes'] = sum(metrics.dir_bytes(path) for path in aggregate_staging.values())
+
+        # Publish each day to its own folders (run_date=YYYY_MM_DD/ → YYYY_MM_DD/)
+        for run_date, output_dir, manifest, changed, full, day_videos_dir in plans:
+            regions = [region for _, region, _ in changed]
+            publish_day(os.path.join(staging_dir, f'run_date={run_date}'), output_dir, regions, full)
+            for name, path in aggregate_staging.items():
+                publish_day(os.path.join(path, f'run_date={run_date}'),
+                            aggregate_dir(name, run_date, aggregates_root), regions, full)
+            if normalized:
+                day_df = flat_df.filter(col("run_date") == run_date)
+                print(f"Video dimension saved to {commit_videos(spark, day_df, run_date, videos_root)}")
+            print(f"Blocking counts saved to "
+                  f"{commit_blocking_counts(spark, run_date, day_videos_dir, aggregates_root)}")
+            record_regions(manifest, changed, output_dir)
+            print(f"Flattened {len(changed)} regions saved to {output_dir}")
+    finally:
+        for path in [staging_dir, *aggregate_staging.values()]:
+            shutil.rmtree(path, ignore_errors=True)
+        flat_df.unpersist()
+        if SPARK_STAGE_TIMINGS:
+            for items_df in items_frames:
+                items_df.unpersist()
+    return outputs
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Flatten raw YouTube trending data into Parquet.")
+    parser.add_argument("--engine", choices=["spark", "arrow"], default=ENGINE,
+                        help="spark for large backfills, arrow (no JVM) for small daily runs")
+    parser.add_argument("--force", action="store_true",
+                        help="reprocess every region, ignoring the content-hash manifest")
+    parser.add_argument("--layout", choices=LAYOUTS, default=LAYOUT,
+                        help="wide rows, or normalized trending facts + a per-day video dimension")
+    add_date_arguments(parser)
+    args = parser.parse_args()
+
+    # Date folders to process: today, --date, or the --start/--end backfill range
+    run_dates = selected_dates(args)
+
+    if args.engine == "arrow":
+        # Lightweight in-process engine: no JVM / SparkSession start-up (days run in parallel processes)
+        from flatten_youtube_arrow import flatten_days as flatten_days_arrow
+        flatten_days_arrow(run_dates, force=args.force, layout=args.layout)
+    else:
+        # Initialize Spark session
+        spark = SparkSession.builder \
+            .appName("YouTubeTrendingETL") \
+            .getOrCreate()
+
+        flatten_days(spark, run_dates, force=args.force, layout=args.layout)
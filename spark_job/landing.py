@@ -0,0 +1,209 @@
+"""
+Raw Landing & Processed Output Helpers
+--------------------------------------
+File-layout helpers shared by the flatten engines (`flatten_youtube_json.py`
+on Spark and `flatten_youtube_arrow.py` on PyArrow), kept free of any Spark
+import so the lightweight engine never needs a JVM.
+
+- Raw landing files live in `data/raw/YYYY_MM_DD/` as
+  `<REGION>_trending_<YYYY_MM_DD>.json` or `.jsonl[.gz|.zst]`.
+- Processed output is a Parquet dataset in `data/processed/YYYY_MM_DD/`,
+  partitioned by `country=XX/`, published atomically from a staging directory.
+- A per-date manifest (`common/manifest.py`) decides which regions need to be
+  flattened again; only their partitions are replaced (`publish_day` swaps
+  them in, for the rows and the per-region aggregates alike).
+- Both engines parse ISO 8601 durations with the same `DURATION_PATTERN`.
+
+Author: Shreyash Singh
+"""
+
+import os
+import re
+import sys
+import glob
+import shutil
+import uuid
+
+# Make the shared `common` package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.manifest import file_hash, partition_hash
+
+# Raw landing file suffixes (newline-delimited files first, legacy JSON last)
+JSONL_SUFFIXES = ['.jsonl.gz', '.jsonl.zst', '.jsonl']
+JSON_SUFFIX = '.json'
+
+# Pattern used to recover the region code from a raw file path
+REGION_FROM_PATH = r'([A-Z]{2})_trending_[0-9_]+\.json'
+
+# Pattern used to recover the run date from a raw file path (its YYYY_MM_DD folder)
+RUN_DATE_FROM_PATH = r'([0-9]{4}_[0-9]{2}_[0-9]{2})/[^/]+$'
+
+# ISO 8601 duration ('PT1H2M30S', 'P1DT2H'): days, hours, minutes, seconds groups,
+# and the seconds each group is worth (missing groups count as 0)
+DURATION_PATTERN = r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?'
+DURATION_UNITS = (86400, 3600, 60, 1)
+
+def list_raw_files(raw_dir):
+    """
+    List the raw landing files in a date folder, one per region, split by format.
+
+    A region landed twice in the same day (e.g. `raw_format` or `compression`
+    changed between two ingests) keeps only its newest file, so it is never
+    flattened twice and its manifest entry does not flip between the two hashes.
+
+    Args:
+        raw_dir (str): Folder holding one raw file per region (e.g., `data/raw/2025_08_28`).
+
+    Returns:
+        tuple: (jsonl_paths, json_paths) lists of file paths.
+    """
+    # Newline-delimited files first, so they win an mtime tie against legacy JSON
+    candidates = [
+        path for suffix in JSONL_SUFFIXES + [JSON_SUFFIX]
+        for path in sorted(glob.glob(os.path.join(raw_dir, f'*_trending_*{suffix}')))
+    ]
+    latest = {}
+    for path in candidates:
+        region = region_from_path(path)
+        if region not in latest or os.path.getmtime(path) > os.path.getmtime(latest[region]):
+            latest[region] = path
+    for path in candidates:
+        if path != latest[region_from_path(path)]:
+            print(f'Ignoring {path}: superseded by {latest[region_from_path(path)]}')
+    jsonl_paths = sorted(path for path in latest.values() if not path.endswith(JSON_SUFFIX))
+    json_paths = sorted(path for path in latest.values() if path.endswith(JSON_SUFFIX))
+    return jsonl_paths, json_paths
+
+def region_from_path(path):
+    """
+    Extract the region code from a raw landing file path.
+
+    Args:
+        path (str): Raw file path (e.g., `data/raw/2025_08_28/US_trending_2025_08_28.jsonl.gz`).
+
+    Returns:
+        str: Region code, or an empty string if the name does not match.
+    """
+    match = re.search(REGION_FROM_PATH, os.path.basename(path))
+    return match.group(1) if match else ''
+
+def new_staging_dir(processed_root, run_date):
+    """
+    Build a scratch directory path private to this run.
+
+    It sits inside the processed root (same filesystem, so the final commit is a
+    rename) and starts with an underscore so Parquet readers ignore it.
+
+    Args:
+        processed_root (str): Root of the processed datasets (e.g., `data/processed`).
+        run_date (str): Date folder name in YYYY_MM_DD format.
+
+    Returns:
+        str: Unique staging directory path (not yet created).
+    """
+    return os.path.join(processed_root, f'_staging_{run_date}_{uuid.uuid4().hex}')
+
+def commit_output(staging_dir, output_dir):
+    """
+    Atomically publish a finished staging directory as the output directory.
+
+    The staging directory lives next to the output (same filesystem), so the
+    final step is a rename. A previous output is moved aside first and removed
+    only after the new one is in place.
+
+    Args:
+        staging_dir (str): Fully written dataset unique to this run.
+        output_dir (str): Final dataset location (e.g., `data/processed/2025_08_28`).
+    """
+    previous_dir = None
+    if os.path.exists(output_dir):
+        previous_dir = f"{staging_dir}_previous"
+        os.rename(output_dir, previous_dir)
+    os.rename(staging_dir, output_dir)
+    if previous_dir:
+        shutil.rmtree(previous_dir)
+
+def commit_partitions(staging_dir, output_dir, regions):
+    """
+    Publish the re-flattened `country=XX/` partitions of the given regions,
+    replacing the matching partitions of an existing output and leaving every
+    other partition untouched. Each partition is swapped in with a rename; a
+    region that produced no rows has its old partition removed.
+
+    Args:
+        staging_dir (str): Dataset holding the re-flattened partitions.
+        output_dir (str): Existing dataset location.
+        regions (list): Region codes that were re-flattened.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for region in sorted(set(regions)):
+        name = f'country={region}'
+        source = os.path.join(staging_dir, name)
+        target = os.path.join(output_dir, name)
+        previous = None
+        if os.path.exists(target):
+            previous = f"{staging_dir}_previous_{name}"
+            os.rename(target, previous)
+        if os.path.exists(source):
+            os.rename(source, target)
+        if previous:
+            shutil.rmtree(previous)
+
+def publish_day(staging_dir, output_dir, regions, full):
+    """
+    Publish a staged day: the whole dataset, or only the given regions' partitions.
+
+    Args:
+        staging_dir (str): Dataset written by this run (`country=XX/` partitions).
+        output_dir (str): Final dataset location.
+        regions (list): Region codes that were flattened.
+        full (bool): Replace the whole day (with a `_SUCCESS` marker) instead of
+            swapping in the regions' partitions.
+    """
+    if full:
+        os.makedirs(staging_dir, exist_ok=True)  # A day without any video still gets a folder
+        open(os.path.join(staging_dir, '_SUCCESS'), 'w').close()
+        commit_output(staging_dir, output_dir)
+    else:
+        commit_partitions(staging_dir, output_dir, regions)
+
+def plan_regions(raw_paths, output_dir, manifest=None, force=False):
+    """
+    Hash every raw file and select the regions that need to be flattened.
+
+    Args:
+        raw_paths (list): Raw landing files of the day.
+        output_dir (str): Processed dataset for the day.
+        manifest (Manifest, optional): Manifest of the day (None = process everything).
+        force (bool): Reprocess every region regardless of the manifest.
+
+    Returns:
+        tuple: (changed, full) where `changed` is a list of (path, region, raw_hash)
+        to flatten and `full` tells whether the whole day is rewritten.
+    """
+    full = force or manifest is None or not os.path.exists(output_dir)
+    changed = []
+    for path in raw_paths:
+        region = region_from_path(path)
+        raw_hash = file_hash(path)
+        partition_dir = os.path.join(output_dir, f'country={region}')
+        if full or manifest.raw_changed(region, raw_hash, partition_dir):
+            changed.append((path, region, raw_hash))
+    return changed, full
+
+def record_regions(manifest, changed, output_dir):
+    """
+    Store the raw and processed hashes of freshly flattened regions.
+
+    Args:
+        manifest (Manifest or None): Manifest of the day (nothing is recorded if None).
+        changed (list): (path, region, raw_hash) tuples that were flattened.
+        output_dir (str): Processed dataset the regions were committed to.
+    """
+    if manifest is None:
+        return
+    for path, region, raw_hash in changed:
+        processed = partition_hash(os.path.join(output_dir, f'country={region}'))
+        manifest.record_flatten(region, path, raw_hash, processed)
+    manifest.save()
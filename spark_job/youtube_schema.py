@@ -0,0 +1,155 @@
+"""
+YouTube videos.list Response Schema
+-----------------------------------
+Declared Spark schemas for the raw YouTube Data API `videos.list` responses
+consumed by `flatten_youtube_json.py`.
+
+Reading with a fixed schema avoids Spark's schema-inference pass over every raw
+file and gives stable column types (e.g. `regionRestriction.blocked` is always
+an array, even on days where no trending video is restricted).
+
+Schema Evolution Policy:
+- Fields returned by the API but not declared here are dropped while reading.
+- `ignore` (default): unknown fields are silently dropped.
+- `warn`: a sampled inference pass lists unknown fields, then the run continues.
+- `fail`: same check as `warn`, but the run stops so the schema can be updated.
+- When a new field is needed downstream, add it below and bump `SCHEMA_VERSION`.
+
+Author: Shreyash Singh
+"""
+
+from pyspark.sql.types import (
+    StructType, StructField, ArrayType, StringType, BooleanType, LongType
+)
+
+# Bump whenever a field is added, removed or retyped
+SCHEMA_VERSION = 1
+
+# Valid values for the schema evolution policy
+SCHEMA_POLICIES = ('ignore', 'warn', 'fail')
+
+# Video fields the API returns that the pipeline deliberately does not read
+# (relative to the video resource); these are never reported as schema drift
+UNUSED_VIDEO_FIELDS = (
+    'snippet.thumbnails',
+    'snippet.localized',
+    'contentDetails.contentRating',
+    'contentDetails.projection'
+)
+
+# Response envelope fields that are deliberately not read
+UNUSED_RESPONSE_FIELDS = ('nextPageToken',)
+
+# Countries where a video is explicitly allowed / blocked
+REGION_RESTRICTION_SCHEMA = StructType([
+    StructField("allowed", ArrayType(StringType())),
+    StructField("blocked", ArrayType(StringType()))
+])
+
+# A single `youtube#video` resource (only the parts the pipeline uses)
+VIDEO_SCHEMA = StructType([
+    StructField("kind", StringType()),
+    StructField("etag", StringType()),
+    StructField("id", StringType()),
+    StructField("snippet", StructType([
+        StructField("publishedAt", StringType()),
+        StructField("channelId", StringType()),
+        StructField("title", StringType()),
+        StructField("description", StringType()),
+        StructField("channelTitle", StringType()),
+        StructField("categoryId", StringType()),
+        StructField("liveBroadcastContent", StringType()),
+        StructField("defaultLanguage", StringType()),
+        StructField("defaultAudioLanguage", StringType()),
+        StructField("tags", ArrayType(StringType()))
+    ])),
+    StructField("contentDetails", StructType([
+        StructField("duration", StringType()),
+        StructField("dimension", StringType()),
+        StructField("definition", StringType()),
+        StructField("caption", StringType()),
+        StructField("licensedContent", BooleanType()),
+        StructField("regionRestriction", REGION_RESTRICTION_SCHEMA)
+    ])),
+    # The API returns counts as strings; they are cast to long during flattening
+    StructField("statistics", StructType([
+        StructField("viewCount", StringType()),
+        StructField("likeCount", StringType()),
+        StructField("favoriteCount", StringType()),
+        StructField("commentCount", StringType())
+    ]))
+])
+
+PAGE_INFO_SCHEMA = StructType([
+    StructField("totalResults", LongType()),
+    StructField("resultsPerPage", LongType())
+])
+
+# Pretty-printed `.json` landing file: the whole API response
+RESPONSE_SCHEMA = StructType([
+    StructField("kind", StringType()),
+    StructField("etag", StringType()),
+    StructField("pageInfo", PAGE_INFO_SCHEMA),
+    StructField("items", ArrayType(VIDEO_SCHEMA))
+])
+
+# Newline-delimited `.jsonl` landing file: response envelope + one video per line
+NDJSON_SCHEMA = StructType([
+    StructField("region", StringType()),
+    StructField("kind", StringType()),
+    StructField("etag", StringType()),
+    StructField("pageInfo", PAGE_INFO_SCHEMA),
+    StructField("item", VIDEO_SCHEMA)
+])
+
+def field_paths(schema, prefix=""):
+    """
+    List every (nested) field of a schema as a dotted path.
+
+    Args:
+        schema (StructType): Spark schema to walk.
+        prefix (str): Path of the enclosing struct.
+
+    Returns:
+        set: Dotted field paths, e.g. {'item.snippet.title', ...}.
+    """
+    paths = set()
+    for field in schema.fields:
+        path = f"{prefix}{field.name}"
+        paths.add(path)
+        data_type = field.dataType
+        while isinstance(data_type, ArrayType):
+            data_type = data_type.elementType  # Look through arrays of structs
+        if isinstance(data_type, StructType):
+            paths |= field_paths(data_type, prefix=f"{path}.")
+    return paths
+
+def is_unused(path):
+    """
+    Check whether a dotted field path is one the pipeline deliberately skips.
+
+    Args:
+        path (str): Dotted field path from an inferred schema.
+
+    Returns:
+        bool: True if the path (or one of its parents) is a known unused field.
+    """
+    candidates = [f"{root}.{name}" for root in ('item', 'items') for name in UNUSED_VIDEO_FIELDS]
+    candidates += list(UNUSED_RESPONSE_FIELDS)
+    return any(path == name or path.startswith(f"{name}.") for name in candidates)
+
+def unknown_fields(inferred, declared):
+    """
+    Find fields present in an inferred schema but missing from the declared one.
+
+    Args:
+        inferred (StructType): Schema Spark inferred from the data.
+        declared (StructType): Schema declared in this module.
+
+    Returns:
+        list: Sorted dotted paths of undeclared fields that are not known to be unused.
+    """
+    return sorted(
+        path for path in field_paths(inferred) - field_paths(declared)
+        if not is_unused(path)
+    )
@@ -0,0 +1,17 @@
+{% macro array_size(column_name) %}
+    -- This macro returns the number of elements of an array column.
+    -- Arguments:
+    --   column_name: ARRAY column (e.g., blocked_countries).
+    -- Returns:
+    --   An integer expression (NULL when the array is NULL).
+    -- Dispatched per adapter: Snowflake uses the default implementation, DuckDB (local target) its own.
+    {{ return(adapter.dispatch('array_size')(column_name)) }}
+{% endmacro %}
+
+{% macro default__array_size(column_name) %}
+    ARRAY_SIZE({{ column_name }})
+{% endmacro %}
+
+{% macro duckdb__array_size(column_name) %}
+    LEN({{ column_name }})
+{% endmacro %}
@@ -9,7 +9,11 @@
     --   4. Format as 'YYYY-MM-DD HH24:MI:SS' string.
     -- Returns:
     --   A VARCHAR column representing the formatted datetime.
+    -- Dispatched per adapter: Snowflake uses the default implementation, DuckDB (local target) its own.
+    {{ return(adapter.dispatch('convert_load_ts')(epoch_column)) }}
+{% endmacro %}
 
+{% macro default__convert_load_ts(epoch_column) %}
     TO_CHAR(
         TO_TIMESTAMP_NTZ(
             ROUND("{{ epoch_column }}" / 1e6, 2)  -- Convert µs → s, round
@@ -17,3 +21,11 @@
         'YYYY-MM-DD HH24:MI:SS'  -- Final datetime string format
     )
 {% endmacro %}
+
+{% macro duckdb__convert_load_ts(epoch_column) %}
+    -- MAKE_TIMESTAMP(µs) gives a naive timestamp, matching TIMESTAMP_NTZ.
+    STRFTIME(
+        MAKE_TIMESTAMP(CAST(ROUND("{{ epoch_column }}" / 1e6, 2) * 1e6 AS BIGINT)),
+        '%Y-%m-%d %H:%M:%S'
+    )
+{% endmacro %}
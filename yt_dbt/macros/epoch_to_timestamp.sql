@@ -0,0 +1,20 @@
+{% macro epoch_to_timestamp(epoch_column) %}
+    -- This macro converts epoch timestamps (in microseconds) into a real TIMESTAMP_NTZ.
+    -- Unlike convert_load_ts (a formatted VARCHAR), the result keeps full precision,
+    -- sorts and compares as a timestamp, and lets the warehouse prune on it.
+    -- Arguments:
+    --   epoch_column: Column containing epoch timestamps in microseconds (e.g., 1692871234567890).
+    -- Returns:
+    --   A TIMESTAMP_NTZ column (naive timestamp, as written by the flatten job).
+    -- Dispatched per adapter: Snowflake uses the default implementation, DuckDB (local target) its own.
+    {{ return(adapter.dispatch('epoch_to_timestamp')(epoch_column)) }}
+{% endmacro %}
+
+{% macro default__epoch_to_timestamp(epoch_column) %}
+    TO_TIMESTAMP_NTZ("{{ epoch_column }}", 6)  -- Scale 6 = microseconds
+{% endmacro %}
+
+{% macro duckdb__epoch_to_timestamp(epoch_column) %}
+    -- MAKE_TIMESTAMP(µs) gives a naive timestamp, matching TIMESTAMP_NTZ.
+    MAKE_TIMESTAMP("{{ epoch_column }}"::BIGINT)
+{% endmacro %}
@@ -0,0 +1,21 @@
+{% macro explode_array(column_name) %}
+    -- This macro expands an array column into multiple rows.
+    -- Arguments:
+    --   column_name: ARRAY column (e.g., tags, blocked_countries; a Parquet LIST from the flatten job).
+    -- Process:
+    --   Uses LATERAL FLATTEN() to expand array elements into individual rows
+    --   (no string splitting: the arrays are written natively by the flatten job).
+    -- Returns:
+    --   A table alias `t` with one row per array element (accessible as t.value).
+    -- Dispatched per adapter: Snowflake uses the default implementation, DuckDB (local target) its own.
+    {{ return(adapter.dispatch('explode_array')(column_name)) }}
+{% endmacro %}
+
+{% macro default__explode_array(column_name) %}
+    LATERAL FLATTEN(input => {{ column_name }}) AS t
+{% endmacro %}
+
+{% macro duckdb__explode_array(column_name) %}
+    -- Table functions in the FROM list are implicitly lateral in DuckDB.
+    UNNEST({{ column_name }}) AS t(value)
+{% endmacro %}
@@ -0,0 +1,48 @@
+{% macro set_load_window(relation, source_fingerprint, target_fingerprint='max(load_ts)', name='load_window_start') %}
+    -- This macro stores the first load date of an incremental window in a session variable.
+    -- Arguments:
+    --   relation: Input of the model (e.g., ref('stg_youtube_data')).
+    --   source_fingerprint / target_fingerprint: Per-date aggregates compared by
+    --     `load_dates_to_build` (e.g., 'max(load_timestamp)' against 'max(load_ts)').
+    --   name: Session variable name.
+    -- Process:
+    --   Run it as a pre-hook (rendered at run time, so ref() and {{ this }} resolve): the window
+    --   starts at the oldest load date missing from {{ this }} or changed since it was built,
+    --   so a backfill of any age is merged; it starts after every date when nothing changed
+    --   and before every date on the first build. `load_window_start` reads the variable back
+    --   in SQL that is fixed at parse time, such as incremental_predicates.
+    -- Returns:
+    --   A SET statement.
+    -- Dispatched per adapter: Snowflake uses the default implementation, DuckDB (local target) its own.
+    {%- set window_start = '1900-01-01' -%}
+    {%- if is_incremental() -%}
+        {%- set load_dates = load_dates_to_build(relation, source_fingerprint, target_fingerprint) -%}
+        {%- set window_start = load_dates[0] if load_dates else '9999-12-31' -%}
+    {%- endif -%}
+    {{ return(adapter.dispatch('set_load_window')(window_start, name)) }}
+{% endmacro %}
+
+{% macro default__set_load_window(window_start, name) %}
+    set {{ name }} = '{{ window_start }}'::date
+{% endmacro %}
+
+{% macro duckdb__set_load_window(window_start, name) %}
+    set variable {{ name }} = date '{{ window_start }}'
+{% endmacro %}
+
+{% macro load_window_start(name='load_window_start') %}
+    -- This macro reads back the date stored by `set_load_window`.
+    -- Arguments:
+    --   name: Session variable name.
+    -- Returns:
+    --   A DATE expression.
+    {{ return(adapter.dispatch('load_window_start')(name)) }}
+{% endmacro %}
+
+{% macro default__load_window_start(name) -%}
+    ${{ name }}
+{%- endmacro %}
+
+{% macro duckdb__load_window_start(name) -%}
+    getvariable('{{ name }}')
+{%- endmacro %}
@@ -0,0 +1,64 @@
+{% macro new_load_dates(source_relation, source_fingerprint, target_fingerprint='max(load_ts)',
+                        column_name='load_date', source_date=none, source_filter=none) %}
+    -- This macro filters an incremental model's input down to the load dates it has to (re)build.
+    -- Arguments:
+    --   source_relation: Input the model reads (e.g., source('youtube_data', 'raw_youtube_data')).
+    --   source_fingerprint: Per-date aggregate of the input that changes whenever a day is
+    --     re-uploaded (e.g., 'max(' ~ convert_load_ts("load_ts") ~ ')').
+    --   target_fingerprint: The same aggregate over the model's own rows ({{ this }}).
+    --   column_name: Load date column the filter applies to (e.g., '"load_date"' on the raw table).
+    --   source_date: Load date column of source_relation (defaults to column_name).
+    --   source_filter: Optional condition on source_relation (rows the model does not read).
+    -- Process:
+    --   1. At run time, groups the input and {{ this }} by load date (two columns each).
+    --   2. Keeps the dates missing from {{ this }} or whose fingerprint differs, so a day
+    --      backfilled after later days were built, or a re-uploaded older day, is rebuilt
+    --      too, without a high-water mark or a lookback window.
+    -- Returns:
+    --   A boolean filter expression (use it only when is_incremental() is true).
+    {%- set load_dates = load_dates_to_build(source_relation, source_fingerprint, target_fingerprint,
+                                             source_date or column_name, source_filter) -%}
+    {%- if load_dates %}
+    {{ column_name }} in ({% for load_date in load_dates %}cast('{{ load_date }}' as date){{ ", " if not loop.last }}{% endfor %})
+    {%- else %}
+    1 = 0  -- Every load date is up to date
+    {%- endif %}
+{% endmacro %}
+
+{% macro load_dates_to_build(source_relation, source_fingerprint, target_fingerprint='max(load_ts)',
+                             source_date='load_date', source_filter=none) %}
+    -- This macro lists the load dates an incremental model has to (re)build.
+    -- Arguments:
+    --   Same as `new_load_dates` (source_date is the input's load date column).
+    -- Process:
+    --   At run time, groups the input and {{ this }} by load date and keeps the dates
+    --   missing from {{ this }} or whose fingerprint differs (logged per model).
+    -- Returns:
+    --   A list of 'YYYY-MM-DD' strings, oldest first (empty at parse time).
+    {%- set load_dates = [] -%}
+    {%- if execute -%}
+        {%- set query -%}
+            with source_days as (
+                select {{ source_date }} as load_date, {{ source_fingerprint }} as fingerprint
+                from {{ source_relation }}
+                {% if source_filter %}where {{ source_filter }}{% endif %}
+                group by 1
+            ),
+            target_days as (
+                select load_date, {{ target_fingerprint }} as fingerprint
+                from {{ this }}
+                group by 1
+            )
+            select cast(source_days.load_date as varchar) as load_date
+            from source_days
+            left join target_days
+              on target_days.load_date = source_days.load_date
+            where target_days.load_date is null
+               or target_days.fingerprint is distinct from source_days.fingerprint
+            order by 1
+        {%- endset -%}
+        {%- set load_dates = run_query(query).columns[0].values() | list -%}
+        {{ log(this.identifier ~ ': load dates to build ' ~ (load_dates | join(', ') or 'none')) }}
+    {%- endif -%}
+    {{ return(load_dates) }}
+{% endmacro %}
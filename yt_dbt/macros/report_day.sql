@@ -0,0 +1,17 @@
+{% macro report_day(relation) %}
+    -- This macro scopes a model that keeps every load date down to the report day.
+    -- Arguments:
+    --   relation: Model with a load_date column (e.g., ref('int_unique_video')).
+    -- Process:
+    --   Keeps the rows of the load date held by `int_report_date`: the latest load date,
+    --   or the `report_date` var (run_pipeline.py passes its --date). Every report mart
+    --   reads through it, so all sections of one PDF cover the same single day however
+    --   much history staging keeps.
+    -- Returns:
+    --   A subquery usable in a FROM clause (add an alias after it if needed).
+    (
+        select *
+        from {{ relation }}
+        where load_date = (select load_date from {{ ref('int_report_date') }})
+    )
+{% endmacro %}
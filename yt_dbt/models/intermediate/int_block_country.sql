@@ -1,28 +1,33 @@
 -- models/staging/int_block_country.sql
 {{ config(
-    materialized='view'
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
 ) }}
 
 -- Model: int_block_country
 -- Description:
---   This model takes the `blocked_countries` column (a comma-separated list of country codes)
---   from the raw `blocked_videos` table and normalizes it into one row per country per video.
+--   This model takes the `blocked_countries` column (an array of country codes)
+--   from the `int_block_video` table and normalizes it into one row per country per video.
 --   This makes it easier to filter and analyze blocked content by specific countries.
 --
 --   Key steps:
---   - Reads raw blocked video data from the `yt_db.raw.blocked_videos` table.
---   - Uses `SPLIT_TO_TABLE` to break apart the comma-separated list into rows.
+--   - Reads blocked video data from the `int_block_video` model.
+--   - Uses the `explode_array` macro to expand the array into rows.
 --   - Cleans up the values (trimming whitespace, filtering out null/empty strings).
 --   - Outputs a clean dataset with `video_id` and individual `country` rows.
+--   - Incremental table keyed on load_date: only new or re-uploaded load dates are exploded.
 
 with exploded_countries as (
     select
         *,
-        trim(value) as block_by_country
+        trim(t.value::string) as block_by_country
     from {{ref('int_block_video')}},
-         lateral split_to_table(blocked_countries, ',')
-    where blocked_countries is not null
-      and blocked_countries <> ''
+         {{ explode_array('blocked_countries') }}
+    where {{ array_size('blocked_countries') }} > 0
+      {% if is_incremental() %}
+      and {{ new_load_dates(ref('int_block_video'), 'max(load_ts)') }}
+      {% endif %}
 )
 
 select *
@@ -1,6 +1,8 @@
 -- models/intermediate/int_blocked_videos.sql
 {{ config(
-    materialized='view'
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
 ) }}
 
 -- Model: int_blocked_videos
@@ -13,6 +15,7 @@
 --   - Filters only rows where blocked_countries is present.
 --   - Deduplicates using DISTINCT.
 --   - Orders results by published_at descending.
+--   - Incremental table keyed on load_date: only new or re-uploaded load dates are read from staging.
 
 with blocked_videos as (
     select
@@ -27,10 +30,14 @@ with blocked_videos as (
         tags,
         blocked_countries,
         category_id,
-        load_ts
+        load_ts,
+        load_date
     from {{ ref('stg_youtube_data') }}
-    where blocked_countries is not null
-      and blocked_countries <> ''
+    where {{ array_size('blocked_countries') }} > 0  -- NULL (no restriction) is excluded too
+      {% if is_incremental() %}
+      and {{ new_load_dates(ref('stg_youtube_data'), 'max(load_ts)',
+                            source_filter=array_size('blocked_countries') ~ ' > 0') }}
+      {% endif %}
 ),
 
 deduped as (
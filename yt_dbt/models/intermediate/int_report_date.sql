@@ -0,0 +1,19 @@
+-- models/intermediate/int_report_date.sql
+{{ config(materialized='table') }}
+-- depends_on: {{ ref('stg_youtube_data') }}  (keeps it in `--select path:models/staging+` when report_date is set)
+
+{#- Optional day to report on, as YYYY-MM-DD (e.g. --vars '{report_date: 2025-08-28}') -#}
+{%- set report_date = var('report_date', none) -%}
+
+-- Model: int_report_date
+-- Description:
+--   One row holding the load date the report marts cover (see macros/report_day.sql):
+--   the `report_date` var when set, else the latest load date in staging.
+--   create_report.py names the PDF after it and refuses a --date it does not match.
+
+{% if report_date -%}
+select cast('{{ report_date }}' as date) as load_date
+{%- else -%}
+select max(load_date) as load_date
+from {{ ref('stg_youtube_data') }}
+{%- endif %}
@@ -1,28 +1,37 @@
 -- models/intermediate/int_unique_video.sql
 {{ config(
-    materialized='view'
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
 ) }}
 
 -- Model: int_unique_video
 -- Description:
---   This intermediate model ranks YouTube videos by `like_count` within each `video_id`.
---   The goal is to remove duplicates or conflicting records by keeping the "best" row
---   (i.e., the one with the highest like count).
+--   This intermediate model ranks YouTube videos by `like_count` within each `video_id`
+--   of a load date. The goal is to remove duplicates or conflicting records by keeping
+--   the "best" row (i.e., the one with the highest like count) of each video per day.
 --
 --   Key steps:
 --   - Reads from the staging model `stg_youtube_data`.
---   - Applies ROW_NUMBER() window function partitioned by `video_id`.
+--   - Applies ROW_NUMBER() window function partitioned by `load_date` and `video_id`.
 --   - Orders by `like_count` descending, so the top-liked record per video_id is ranked as 1.
---   - Filters only `rn1 = 1` so that only the top record per video_id is kept.
+--   - Filters only `rn1 = 1` so that only the top record per video_id and day is kept.
+--
+--   Incremental table keyed on load_date: each run ranks only the new or re-uploaded load dates,
+--   the window never scans the full history. The report marts read its report day
+--   through the `report_day` macro.
 
 with ranked_videos as (
     select
         yt.*,
         row_number() over (
-            partition by video_id
+            partition by load_date, video_id
             order by like_count desc
         ) as rn1
     from {{ ref('stg_youtube_data') }} yt
+    {% if is_incremental() %}
+    where {{ new_load_dates(ref('stg_youtube_data'), 'max(load_ts)') }}
+    {% endif %}
 )
 
 select *
@@ -11,9 +11,9 @@ with ranked_videos as (
     published_at,       -- Publish timestamp
     channel_title,      -- Channel display name
     category_id,        -- Video category
-    duration          -- Video duration (ISO 8601 format, e.g. PT15M33S)
-from {{ref('int_unique_video')}}  
+    duration          -- Video duration in seconds
+from {{ report_day(ref('int_unique_video')) }}  
 )
 
-select top 10 * from ranked_videos order by duration desc         -- Ordering videos by length (longest first)
+select * from ranked_videos order by duration desc nulls last limit 10  -- Ordering videos by length (longest first, unknown last)
 
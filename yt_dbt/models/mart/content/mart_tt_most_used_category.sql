@@ -10,8 +10,8 @@ select
     category_id,                      -- Category of the video
     count(distinct video_id) as videos_count,   -- Number of unique videos in this category
     count(distinct country) as country_count    -- Number of unique countries where videos appeared
-from {{ref('int_unique_video')}}
+from {{ report_day(ref('int_unique_video')) }}
 group by category_id
 )
 
-select top 10 * from ranked_videos order by videos_count desc      -- Categories with most videos at top
\ No newline at end of file
+select * from ranked_videos order by videos_count desc limit 10      -- Categories with most videos at top
\ No newline at end of file
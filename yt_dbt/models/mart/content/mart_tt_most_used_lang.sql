@@ -11,9 +11,9 @@ select
     default_audio_language,                -- Language of the video audio track
     count(distinct video_id) as videos_count,   -- Number of unique videos in this language
     count(distinct country) as country_count    -- Number of unique countries where those videos trended
-from {{ref('int_unique_video')}}
+from {{ report_day(ref('int_unique_video')) }}
  where default_audio_language is not null -- Consider only videos with an audio language
 group by default_audio_language
 )
 
-select top 10 * from ranked_videos order by  videos_count desc, country_count desc
\ No newline at end of file
+select * from ranked_videos order by  videos_count desc, country_count desc limit 10
\ No newline at end of file
@@ -12,8 +12,8 @@ with ranked_videos as (
     channel_title,      -- Channel display name
     category_id,        -- Video category
     duration          -- Video duration 
-from {{ref('int_unique_video')}}  
+from {{ report_day(ref('int_unique_video')) }}  
 )
 
-select top 10 * from ranked_videos order by duration asc         -- Ordering videos by length (Shortest first)
+select * from ranked_videos order by duration asc nulls last limit 10   -- Ordering videos by length (Shortest first, unknown last)
 
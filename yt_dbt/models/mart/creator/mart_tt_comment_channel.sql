@@ -17,10 +17,10 @@ with channel_comments as (
         channel_title,
         count(distinct video_id) as videos_count,
         sum(comment_count) as comments_count
-    from {{ ref('int_unique_video')}}
+    from {{ report_day(ref('int_unique_video')) }}
     where comment_count is not null
     group by channel_id, channel_title
 )
 
 -- Step 3: Select top 10 channels by comments_count
-select top 10 * from channel_comments order by comments_count desc
+select * from channel_comments order by comments_count desc limit 10
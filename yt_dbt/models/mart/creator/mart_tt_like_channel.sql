@@ -17,10 +17,10 @@ with channel_likes as (
         channel_title,
         count(distinct video_id) as videos_count,
         sum(like_count) as likes_count
-    from {{ ref('int_unique_video')}}
+    from {{ report_day(ref('int_unique_video')) }}
     where like_count is not null
     group by channel_id, channel_title
 )
 
 -- Step 3: Select top 10 channels by likes_count
-select top 10 * from channel_likes order by likes_count desc
+select * from channel_likes order by likes_count desc limit 10
@@ -11,8 +11,8 @@ with trending_videos as (
     channel_title,                                -- Channel name
     count(distinct video_id) as trending_videos_count, -- Number of unique trending videos for the channel
     count(*) as countries_count                   -- Number of records (country occurrences) → shows how many times videos trended across countries
-from {{ ref('stg_youtube_data') }}
+from {{ report_day(ref('stg_youtube_data')) }}
 group by channel_id, channel_title
 )
 
-select top 10 * from trending_videos order by countries_count desc, trending_videos_count desc
\ No newline at end of file
+select * from trending_videos order by countries_count desc, trending_videos_count desc limit 10
\ No newline at end of file
@@ -17,10 +17,10 @@ with channel_views as (
         channel_title,
         count(distinct video_id) as videos_count,
         sum(view_count) as views_count
-    from {{ ref('int_unique_video')}}
+    from {{ report_day(ref('int_unique_video')) }}
     where view_count is not null
     group by channel_id, channel_title
 )
 
 -- Step 3: Select top 10 channels by views_count
-select top 10 * from channel_views order by views_count desc
+select * from channel_views order by views_count desc limit 10
@@ -15,8 +15,8 @@ with comment_like as (
     like_count,
     comment_count,
     round((nullif(comment_count,0) / like_count) * 100, 2) as comment_like_percentage
-from {{ ref('int_unique_video')}}
+from {{ report_day(ref('int_unique_video')) }}
 where comment_count is not null and comment_count <> 0 and like_count is not null and like_count <> 0
 order by comment_like_percentage desc)
 
-select top 10 * from comment_like order by comment_like_percentage desc
+select * from comment_like order by comment_like_percentage desc limit 10
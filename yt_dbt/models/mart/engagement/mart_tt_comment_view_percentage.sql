@@ -15,8 +15,8 @@ with comment_view as (
     view_count,
     comment_count,
     round((nullif(comment_count,0) / view_count) * 100, 2) as comment_view_percentage
-from {{ ref('int_unique_video')}}
+from {{ report_day(ref('int_unique_video')) }}
 where comment_count is not null and comment_count <> 0
 order by comment_view_percentage desc)
 
-select top 10 * from comment_view order by comment_view_percentage desc
+select * from comment_view order by comment_view_percentage desc limit 10
@@ -15,8 +15,8 @@ with like_view as (
     view_count,
     like_count,
     round((nullif(like_count,0) / view_count) * 100, 2) as like_view_percentage
-from {{ ref('int_unique_video')}}
+from {{ report_day(ref('int_unique_video')) }}
 where like_count is not null and like_count <> 0
 order by like_view_percentage desc)
 
-select top 10 * from like_view order by like_view_percentage desc
+select * from like_view order by like_view_percentage desc limit 10
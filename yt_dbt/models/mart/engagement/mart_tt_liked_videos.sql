@@ -17,7 +17,7 @@ WITH rank_by_country AS (
             PARTITION BY country
             ORDER BY like_count DESC   -- rank videos within each country by likes
         ) AS rn2 
-    FROM {{ ref('int_unique_video')}} rv
+    FROM {{ report_day(ref('int_unique_video')) }} rv
     WHERE like_count IS NOT NULL  -- exclude videos without likes
 ),
 top_videos AS (
@@ -36,4 +36,4 @@ final_block as (
 
 )
 
-select top 10 * from final_block order by like_count desc
+select * from final_block order by like_count desc limit 10
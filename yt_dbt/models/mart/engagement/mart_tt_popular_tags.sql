@@ -4,22 +4,22 @@
 -- Description:
 -- Popular Tags : Which tags appear most often in trending videos (Top 10)
 --   This model identifies the **top 100 most frequently used tags per country** 
---   for each load snapshot. It breaks apart comma-separated tags, counts their 
---   frequency, and ranks them per country to show trending keywords.
+--   on the report day (latest load date by default). It reads the tag frequencies
+--   counted by the flatten job and ranks them per country to show trending keywords.
 -- Use case:
 --   Useful for analyzing trending topics, cultural differences in tags, and 
 --   monitoring how tag popularity shifts over time.
 
 
 with tag_counts AS (
-    -- Step 2: Count how many times each tag appears per country + load_ts
+    -- Step 2: Tag frequencies per country + load_ts, counted by the flatten job
+    -- (tags are already trimmed and blanks dropped in stg_youtube_tag_counts)
     SELECT
         country,
         tag,
         load_ts,
-        COUNT(*) AS tag_count
-    FROM {{ ref('int_youtube_tag') }},
-    WHERE tag IS NOT NULL AND tag <> ''             -- filter out blanks
+        SUM(tag_count) AS tag_count
+    FROM {{ report_day(ref('stg_youtube_tag_counts')) }}
     GROUP BY country, tag, load_ts
 ),
 
@@ -64,4 +64,4 @@ FROM ranked_tags
 WHERE rn <= 100
 )
 
-select top 10 * from top_100_tags order  by tag_count desc
+select * from top_100_tags order  by tag_count desc limit 10
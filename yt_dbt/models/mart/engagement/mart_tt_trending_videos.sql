@@ -2,8 +2,9 @@
 
 -- Model: mart_tt_trending_videos
 -- Most Globally Trending Videos : Which trending videos appear in the highest number of countries (Top 10)
--- Identifies the top 10 videos that trended in the most countries.
--- Then enriches them with detailed metadata (one row per video, highest view_count).
+-- Identifies the top 10 videos that trended in the most countries on the report day (latest load date by default).
+-- Then enriches them with detailed metadata from the deduplicated int_unique_video
+-- (one row per video of the report day, like the country counts above).
 
 with most_trending_video as (
 
@@ -11,27 +12,15 @@ with most_trending_video as (
     select 
         video_id,
         count(distinct country) as country_count
-    from {{ ref('stg_youtube_data') }}
+    from {{ report_day(ref('stg_youtube_data')) }}
     group by video_id
     order by country_count desc
     limit 500   -- Keep top 500 videos across most countries
 ),
 
-ranked_videos as (
-
-    -- Step 2: Rank rows by view_count for each video
-    select
-        yt.*,
-        row_number() over (
-            partition by video_id
-            order by view_count desc
-        ) as rn
-    from {{ ref('stg_youtube_data') }} yt
-),
-
 video_details as (
 
-    -- Step 3: Select video metadata + join with top 500 list
+    -- Step 2: Select video metadata (already one row per video) + join with top 500 list
     select
         title,
         published_at,
@@ -39,11 +28,10 @@ video_details as (
         category_id,
         view_count,
         tv.country_count
-    from ranked_videos rv
+    from {{ report_day(ref('int_unique_video')) }} uv
     join most_trending_video tv 
-        on rv.video_id = tv.video_id
-    where rn = 1   -- Only the highest view_count row per video
+        on uv.video_id = tv.video_id
 )
 
--- Step 4: Final output ordered by reach (country_count)
-select top 10 * from video_details order by country_count desc
+-- Step 3: Final output ordered by reach (country_count)
+select * from video_details order by country_count desc limit 10
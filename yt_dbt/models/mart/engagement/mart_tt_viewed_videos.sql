@@ -17,7 +17,7 @@ WITH rank_by_country AS (
             PARTITION BY country
             ORDER BY view_count DESC   -- rank videos within each country by views
         ) AS rn2 
-    FROM {{ ref('int_unique_video')}} rv
+    FROM {{ report_day(ref('int_unique_video')) }} rv
     WHERE view_count IS NOT NULL  -- exclude videos without views
 ),
 top_videos AS (
@@ -36,4 +36,4 @@ final_block as (
 
 )
 
-select top 10 * from final_block order by view_count desc
+select * from final_block order by view_count desc limit 10
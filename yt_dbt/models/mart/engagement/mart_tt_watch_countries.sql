@@ -22,10 +22,10 @@ with top_watch_country as (
     -- rank countries based on unique trending videos (1 = most unique videos trended)
     RANK() OVER (ORDER BY COUNT(DISTINCT video_id) DESC) AS video_rank
 
-FROM {{ ref('stg_youtube_data') }}
+FROM {{ report_day(ref('stg_youtube_data')) }}
 GROUP BY country
 ORDER BY view_rank  -- show countries ranked by total views
 )
 
-select top 10 * from top_watch_country order by view_rank desc, video_rank desc
+select * from top_watch_country order by view_rank desc, video_rank desc limit 10
 
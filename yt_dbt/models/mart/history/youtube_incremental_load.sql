@@ -1,20 +1,41 @@
+{#-
+    Only the load dates missing from this table or re-uploaded since it was built are
+    merged on an incremental run (`new_load_dates`, as in staging), however old they are,
+    so a backfill loaded with `--start` / `--end` reaches history too. The pre-hook stores
+    the oldest of them in a session variable, used as an incremental predicate on the
+    target side of the MERGE, so the ever-growing history table is not scanned in full:
+    it prunes on load_date.
+-#}
+{%- set load_window = 'load_date >= ' ~ load_window_start('history_window_start') -%}
+{#- Alias of the existing table in the MERGE (Snowflake) / DELETE ... USING (DuckDB) -#}
+{%- set target_alias = 'DBT_INTERNAL_DEST' if target.type == 'snowflake' else 'DBT_INCREMENTAL_TARGET' -%}
+
 {{
     config(
-        materialized = 'incremental',           
-        unique_key = ['video_id', 'load_ts'],
-        transient = false    
+        materialized = 'incremental',
+        incremental_strategy = 'merge' if target.type == 'snowflake' else 'delete+insert',
+        unique_key = ['video_id', 'country', 'load_ts'],
+        incremental_predicates = [target_alias ~ '.' ~ load_window],
+        pre_hook = "{{ set_load_window(ref('stg_youtube_data'), 'max(load_timestamp)', name='history_window_start') }}",
+        cluster_by = ['load_date', 'country'],
+        transient = false
     )
 }}
 
 -- Model: youtube_incremental_load
 -- Description:
 --   This model incrementally loads YouTube trending data from the staging table.
---   Each row is uniquely identified by (video_id, load_ts), ensuring that:
+--   Each row is uniquely identified by (video_id, country, load_ts), ensuring that:
 --     - Historical snapshots of the same video across different load timestamps are preserved.
---     - Duplicate loads for the same video_id + load_ts are avoided.
+--     - Duplicate loads for the same video_id + country + load_ts are avoided.
 -- Logic:
 --   On initial run → loads all rows.
---   On subsequent runs → only loads rows that don’t already exist in the target table.
+--   On subsequent runs → MERGE (Snowflake) / delete+insert (DuckDB) of the rows of the
+--   load dates missing from this table or whose max(load_ts) changed (backfilled or
+--   re-uploaded days); unchanged dates are never read or rewritten.
+-- Physical layout:
+--   Clustered on (load_date, country) and load_ts stored as TIMESTAMP_NTZ, so date and
+--   country filters prune micro-partitions.
 
 SELECT
     video_id,                -- unique identifier of the video
@@ -27,8 +48,8 @@ SELECT
     live_broadcast_content,  -- whether the video is live, none, or upcoming
     default_language,        -- default metadata language
     default_audio_language,  -- spoken audio language of the video
-    tags,                    -- list of tags for the video
-    duration,                -- length of the video
+    tags,                    -- array of tags for the video
+    duration,                -- length of the video in seconds
     dimension,               -- video dimension (2D/3D)
     definition,              -- HD/SD definition
     caption,                 -- whether captions are available
@@ -37,16 +58,13 @@ SELECT
     like_count,              -- number of likes
     favorite_count,          -- legacy field (always 0 in API v3)
     comment_count,           -- number of comments
-    blocked_countries,       -- list of countries where video is blocked
-    load_ts,                 -- timestamp of when data was ingested
+    blocked_countries,       -- array of countries where video is blocked
+    load_timestamp AS load_ts, -- timestamp of when data was ingested (TIMESTAMP_NTZ)
+    load_date,               -- run date of the upload (clustering / pruning key)
     country                  -- country where video appeared in trending
 FROM {{ ref('stg_youtube_data') }}
 
 {% if is_incremental() %}
-    -- Only insert new rows that don’t already exist in the target table.
-    -- This prevents duplicates while keeping history across load_ts snapshots.
-    WHERE (video_id, load_ts) NOT IN (
-        SELECT video_id, load_ts
-        FROM {{ this }}
-    )
+    -- Only the new or re-uploaded load dates of the staging table.
+    WHERE {{ new_load_dates(ref('stg_youtube_data'), 'max(load_timestamp)') }}
 {% endif %}
@@ -3,35 +3,24 @@
 -- Model: mart_tt_blocked_countries
 -- Description:
 -- Most Affected Countries : Which countries trending videos are most frequently blocked (Top 10)
--- For each source country, this model calculates:
+-- For each source country, this model reports for the report day (latest load date by default):
 -- 1) the number of distinct trending videos from that country that are blocked elsewhere
 -- 2) the number of distinct blocking countries involved.
--- It explodes the comma-separated blocked_countries, then aggregates by country.
+-- Both come from the per-region counts of the flatten job (stg_youtube_blocked_counts),
+-- where the row with a NULL blocked_country holds the region's blocked-video total.
 
-with country_block AS (
-    SELECT
-        country,
-        COUNT(DISTINCT block_by_country) AS blocked_country_count
-    FROM {{ ref ('int_block_country')}}
-    GROUP BY country
-),
-
-video_block AS (
-    SELECT
-        country,
-        COUNT(DISTINCT video_id) AS blocked_video_count
-    FROM {{ ref ('int_block_country')}}
-    GROUP BY country
+with latest_counts AS (
+    SELECT *
+    FROM {{ report_day(ref('stg_youtube_blocked_counts')) }}
 ),
 
 final_block as (
     SELECT
-    cb.country,
-    vb.blocked_video_count,
-    cb.blocked_country_count
-FROM country_block cb
-JOIN video_block vb
-  ON cb.country = vb.country
+    country,
+    MAX(CASE WHEN blocked_country IS NULL THEN video_count END) AS blocked_video_count,
+    COUNT(blocked_country) AS blocked_country_count
+FROM latest_counts
+GROUP BY country
 )
 
-select top 10 * from final_block ORDER BY blocked_video_count DESC, blocked_country_count DESC
+select * from final_block ORDER BY blocked_video_count DESC, blocked_country_count DESC limit 10
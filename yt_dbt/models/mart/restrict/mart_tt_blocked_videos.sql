@@ -6,7 +6,7 @@
 -- This mart identifies the trending videos that are blocked across multiple countries.  
 -- It calculates how many distinct countries have blocked each video and ranks them, keeping 
 -- only the highest blocking count per video. This helps in understanding restriction patterns 
--- on trending videos across regions.
+-- on trending videos across regions. Both intermediates are read for the report day only.
 
 with blocked_count as (
 
@@ -14,7 +14,7 @@ with blocked_count as (
     select
         video_id,
         count(distinct block_by_country) as blocked_country_count
-    from {{ ref('int_block_country') }}
+    from {{ report_day(ref('int_block_country')) }}
     group by video_id
 
 ),
@@ -30,7 +30,7 @@ ranked as (
         mv.like_count,
         mv.comment_count,
         bc.blocked_country_count
-    from {{ ref('int_block_video') }} mv
+    from {{ report_day(ref('int_block_video')) }} mv
     join blocked_count bc
         on mv.video_id = bc.video_id
     qualify row_number() over (
@@ -42,4 +42,4 @@ ranked as (
 )
 
 -- Final output: list of videos ranked by number of countries blocking them
-select top 10 * from ranked order by blocked_country_count desc
+select * from ranked order by blocked_country_count desc limit 10
@@ -3,16 +3,16 @@
 -- Model: mart_tt_blocking_countries
 -- Description:
 -- Top Blocking Countries : Which countries have blocked the highest number of trending videos (Top 10)
--- This mart identifies the number of trending videos blocked in each country.
--- The result ranks countries by the number of blocked trending videos by that country.
+-- This mart identifies the number of trending videos blocked in each country on the report day
+-- (latest load date by default).
+-- The result ranks countries by the number of blocked trending videos by that country,
+-- read from the day-level counts of the flatten job (stg_youtube_blocking_counts).
 
 with count_videos as (
     select
-    block_by_country,
-    count(distinct video_id) as blocked_video_count
-    from {{ ref ('int_block_country')}}
-    group by block_by_country
-    order by blocked_video_count desc
+    blocked_country as block_by_country,
+    video_count as blocked_video_count
+    from {{ report_day(ref('stg_youtube_blocking_counts')) }}
 )
 
-select top 10 * from count_videos order by blocked_video_count desc
+select * from count_videos order by blocked_video_count desc limit 10
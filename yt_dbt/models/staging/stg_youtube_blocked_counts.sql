@@ -0,0 +1,33 @@
+-- models/staging/stg_youtube_blocked_counts.sql
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
+) }}
+
+-- Model: stg_youtube_blocked_counts
+-- Description:
+--   Blocked-country counts of each region, computed by the flatten job
+--   (see common/aggregates.py): one row per (load_date, country, blocked_country)
+--   with the number of distinct videos of the region that country blocks, plus
+--   one total row per region with a NULL blocked_country (videos blocked anywhere).
+-- Materialization:
+--   Incremental table keyed on load_date, like stg_youtube_data.
+
+with renamed as (
+    select
+        "blocked_country" as blocked_country,               -- NULL on the region's total row
+        "video_count" as video_count,
+        {{ convert_load_ts("load_ts") }} as load_ts,
+        "load_date" as load_date,
+        "country" as country
+    from {{ source('youtube_data', 'raw_youtube_blocked_counts') }}
+    {% if is_incremental() %}
+    -- Only load dates not built yet or re-uploaded since
+    where {{ new_load_dates(source('youtube_data', 'raw_youtube_blocked_counts'),
+                            'max(' ~ convert_load_ts("load_ts") ~ ')', column_name='"load_date"') }}
+    {% endif %}
+)
+
+select *
+from renamed
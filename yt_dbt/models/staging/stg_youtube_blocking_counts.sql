@@ -0,0 +1,32 @@
+-- models/staging/stg_youtube_blocking_counts.sql
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
+) }}
+
+-- Model: stg_youtube_blocking_counts
+-- Description:
+--   Number of distinct trending videos each country blocks across every region
+--   of a load date, computed by the flatten job (see common/aggregates.py).
+--   A video trending in several regions counts once, so these counts cannot be
+--   summed from the per-region stg_youtube_blocked_counts.
+-- Materialization:
+--   Incremental table keyed on load_date, like stg_youtube_data.
+
+with renamed as (
+    select
+        "blocked_country" as blocked_country,
+        "video_count" as video_count,
+        "load_date" as load_date
+    from {{ source('youtube_data', 'raw_youtube_blocking_counts') }}
+    {% if is_incremental() %}
+    -- Only load dates not built yet or re-uploaded since (this dataset has no load_ts)
+    where {{ new_load_dates(source('youtube_data', 'raw_youtube_blocking_counts'),
+                            'concat(count(*), \'/\', sum("video_count"))',
+                            'concat(count(*), \'/\', sum(video_count))', column_name='"load_date"') }}
+    {% endif %}
+)
+
+select *
+from renamed
@@ -1,32 +1,102 @@
 -- models/staging/stg_youtube_data.sql
 {{ config(
-    materialized='view'
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
 ) }}
 
+{#- Flatten layout: with `normalized` the per-region facts are joined back to the video dimension -#}
+{%- set normalized = env_var('YT_FLATTEN_LAYOUT', 'wide') == 'normalized' -%}
+{%- set video_columns = [
+    'video_id', 'published_at', 'channel_id', 'title', 'description', 'channel_title',
+    'category_id', 'live_broadcast_content', 'default_language', 'default_audio_language',
+    'tags', 'duration_seconds', 'dimension', 'definition', 'caption', 'licensed_content',
+    'blocked_countries'
+] -%}
+{%- set fact_columns = [
+    'view_count', 'like_count', 'favorite_count', 'comment_count', 'load_ts', 'country', 'load_date'
+] -%}
+{#- Per-date fingerprint of the raw rows (max load_ts, same format as this model's load_ts) -#}
+{%- set raw_fingerprint = 'max(' ~ convert_load_ts("load_ts") ~ ')' -%}
+{%- set normalized_dates = '"load_date" not in (select distinct "load_date" from '
+                           ~ source('youtube_data', 'raw_youtube_trending') ~ ')' -%}
+
 -- Model: stg_youtube_data
 -- Description:
 --   This staging model standardizes and cleans data from the raw YouTube source table.
 --   It ensures column names are normalized, applies transformations through macros
---   (e.g., published_at, duration, and load_ts conversions), and prepares the dataset
---   for downstream intermediate and mart models.
+--   (load_ts conversions), and prepares the dataset for downstream intermediate and mart models.
+--   published_at (TIMESTAMP), duration_seconds and the tags / blocked_countries arrays
+--   arrive natively typed from the flatten job, so they are not parsed again here.
+--
+--   With YT_FLATTEN_LAYOUT=normalized, load dates written in the normalized layout are read
+--   from `raw_youtube_trending` joined to `raw_youtube_videos` on (video_id, load_date),
+--   which yields the same wide rows; older wide load dates keep coming from `raw_youtube_data`.
 --
 --   Key steps:
 --   - Pulls all raw columns from `youtube_data.raw_youtube_data`.
 --   - Renames columns using consistent formatting and casing.
---   - Applies type/format conversions using dbt macros for timestamps and durations.
---   - Outputs a clean, analysis-ready view of YouTube trending video data.
+--   - Applies format conversions using dbt macros for the load timestamp.
+--   - Exposes `load_date`, the key every incremental model downstream builds on.
+--   - Outputs a clean, analysis-ready table of YouTube trending video data.
+-- Materialization:
+--   Incremental table keyed on load_date: each run converts only the load dates that are
+--   new or were re-uploaded (see macros/new_load_dates.sql), so the conversions run once
+--   per row instead of once per downstream model.
 
-with source_table as (
+with wide_rows as (
     -- Load all data from the raw YouTube source table
-    select * 
+    select
+        {%- for column in video_columns + fact_columns %}
+        "{{ column }}"{{ "," if not loop.last }}
+        {%- endfor %}
     from {{ source('youtube_data', 'raw_youtube_data') }}
+    where 1 = 1
+    {% if is_incremental() %}
+      -- Only load dates not built yet or re-uploaded since
+      and {{ new_load_dates(source('youtube_data', 'raw_youtube_data'), raw_fingerprint, column_name='"load_date"',
+                            source_filter=normalized_dates if normalized else none) }}
+    {% endif %}
+    {% if normalized %}
+      -- Days flattened in the normalized layout are read from the fact + dimension below
+      and {{ normalized_dates }}
+    {% endif %}
+),
+
+{% if normalized %}
+normalized_rows as (
+    -- Narrow per-region facts joined to the day's video dimension
+    select
+        {%- for column in video_columns %}
+        videos."{{ column }}",
+        {%- endfor %}
+        {%- for column in fact_columns %}
+        facts."{{ column }}"{{ "," if not loop.last }}
+        {%- endfor %}
+    from {{ source('youtube_data', 'raw_youtube_trending') }} as facts
+    join {{ source('youtube_data', 'raw_youtube_videos') }} as videos
+      on videos."video_id" = facts."video_id"
+     and videos."load_date" = facts."load_date"
+    {% if is_incremental() %}
+    where {{ new_load_dates(source('youtube_data', 'raw_youtube_trending'), raw_fingerprint,
+                            column_name='facts."load_date"', source_date='"load_date"') }}
+    {% endif %}
+),
+{% endif %}
+
+source_table as (
+    select * from wide_rows
+    {% if normalized %}
+    union all
+    select * from normalized_rows
+    {% endif %}
 ),
 
 renamed as (
     -- Apply transformations and standardize column naming
     select
         "video_id" as video_id,
-        {{ convert_published_at("published_at") }} as published_at,  -- convert string timestamp to proper datetime
+        "published_at" as published_at,                              -- TIMESTAMP_NTZ (UTC)
         "channel_id" as channel_id,
         "title" as title,
         "description" as description,
@@ -35,8 +105,8 @@ renamed as (
         "live_broadcast_content" as live_broadcast_content,
         "default_language" as default_language,
         "default_audio_language" as default_audio_language,
-        "tags" as tags,
-        {{ convert_duration("duration") }} as duration,              -- convert ISO 8601 duration to seconds
+        "tags" as tags,                                              -- array of tags
+        "duration_seconds" as duration,                              -- seconds, parsed from ISO 8601 at flatten time
         "dimension" as dimension,
         "definition" as definition,
         "caption" as caption,
@@ -45,8 +115,10 @@ renamed as (
         "like_count" as like_count,
         "favorite_count" as favorite_count,
         "comment_count" as comment_count,
-        "blocked_countries" as blocked_countries,
+        "blocked_countries" as blocked_countries,                    -- array of country codes
         {{ convert_load_ts("load_ts") }} as load_ts,                 -- convert ingestion timestamp to proper type
+        {{ epoch_to_timestamp("load_ts") }} as load_timestamp,       -- same instant as a real TIMESTAMP_NTZ
+        "load_date" as load_date,                                    -- run date of the upload (pruning key)
         "country" as country
     from source_table
 )
@@ -0,0 +1,34 @@
+-- models/staging/stg_youtube_tag_counts.sql
+{{ config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='load_date'
+) }}
+
+-- Model: stg_youtube_tag_counts
+-- Description:
+--   Tag frequencies counted by the flatten job while it streams each region
+--   (see common/aggregates.py): one row per (load_date, country, tag), with tags
+--   already trimmed and empty tags dropped.
+--   The tag marts read these few thousand counts instead of exploding the `tags`
+--   array of every staged row.
+-- Materialization:
+--   Incremental table keyed on load_date, like stg_youtube_data.
+
+with renamed as (
+    select
+        "tag" as tag,
+        "tag_count" as tag_count,                           -- occurrences in the region's trending list
+        {{ convert_load_ts("load_ts") }} as load_ts,        -- same format as stg_youtube_data.load_ts
+        "load_date" as load_date,
+        "country" as country
+    from {{ source('youtube_data', 'raw_youtube_tag_counts') }}
+    {% if is_incremental() %}
+    -- Only load dates not built yet or re-uploaded since
+    where {{ new_load_dates(source('youtube_data', 'raw_youtube_tag_counts'),
+                            'max(' ~ convert_load_ts("load_ts") ~ ')', column_name='"load_date"') }}
+    {% endif %}
+)
+
+select *
+from renamed